@@ -12,7 +12,9 @@ from sqlalchemy import engine_from_config, pool
 config = context.config
 
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    # Keep app loggers (e.g. rentpro.sql slow-query log) alive when migrations
+    # run in-process at startup.
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # Ensure "backend/" is on sys.path so "import app.*" works.
 BACKEND_DIR = Path(__file__).resolve().parent.parent
@@ -26,6 +28,19 @@ from app.db.session import Base  # noqa: E402
 target_metadata = Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    # Full-text search index (migration e6f7a8b9c0d1) is not in the models:
+    # the SQLite FTS5 table (+ shadow tables) and the PostgreSQL tsvector column.
+    if type_ == "table" and name and name.startswith("pdf_documents_fts"):
+        return False
+    if type_ in {"column", "index"} and name in {
+        "search_vector",
+        "ix_pdf_documents_search_vector",
+    }:
+        return False
+    return True
+
+
 def _get_database_url() -> str:
     url = os.getenv("RENTPRO_DATABASE_URL")
     if url and url.strip():
@@ -42,6 +57,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -63,6 +79,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
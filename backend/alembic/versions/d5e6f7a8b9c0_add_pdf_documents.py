@@ -0,0 +1,49 @@
+"""add pdf_documents
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d5e6f7a8b9c0"
+down_revision = "c4d5e6f7a8b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Page count, thumbnail and text per stored PDF (filled by ingestion).
+    op.create_table(
+        "pdf_documents",
+        sa.Column("pdf_file", sa.String(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "READY",
+                "FAILED",
+                name="pdf_document_status",
+                native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("page_count", sa.Integer(), nullable=True),
+        sa.Column("thumbnail", sa.String(), nullable=True),
+        sa.Column("text", sa.Text(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column(
+            "ingested_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("pdf_file"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pdf_documents")
@@ -0,0 +1,68 @@
+"""add full-text index over pdf_documents.text
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e6f7a8b9c0d1"
+down_revision = "d5e6f7a8b9c0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Contract search (GET /contracts/search) reads only this index; rows are
+    # added as ingestion fills pdf_documents.
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "ALTER TABLE pdf_documents ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(text, ''))) STORED"
+        )
+        op.execute(
+            "CREATE INDEX ix_pdf_documents_search_vector "
+            "ON pdf_documents USING gin (search_vector)"
+        )
+    elif dialect == "sqlite":
+        # Own copy of the text keyed by pdf_file (pdf_documents has no stable
+        # integer rowid to use as external content), kept in sync by triggers.
+        op.execute(
+            "CREATE VIRTUAL TABLE pdf_documents_fts USING fts5("
+            "pdf_file UNINDEXED, text, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "CREATE TRIGGER pdf_documents_fts_ai AFTER INSERT ON pdf_documents BEGIN "
+            "INSERT INTO pdf_documents_fts (pdf_file, text) "
+            "VALUES (new.pdf_file, new.text); END"
+        )
+        op.execute(
+            "CREATE TRIGGER pdf_documents_fts_ad AFTER DELETE ON pdf_documents BEGIN "
+            "DELETE FROM pdf_documents_fts WHERE pdf_file = old.pdf_file; END"
+        )
+        op.execute(
+            "CREATE TRIGGER pdf_documents_fts_au AFTER UPDATE OF pdf_file, text "
+            "ON pdf_documents BEGIN "
+            "DELETE FROM pdf_documents_fts WHERE pdf_file = old.pdf_file; "
+            "INSERT INTO pdf_documents_fts (pdf_file, text) "
+            "VALUES (new.pdf_file, new.text); END"
+        )
+        op.execute(
+            "INSERT INTO pdf_documents_fts (pdf_file, text) "
+            "SELECT pdf_file, text FROM pdf_documents"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_pdf_documents_search_vector")
+        op.execute("ALTER TABLE pdf_documents DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS pdf_documents_fts_{trigger}")
+        op.execute("DROP TABLE IF EXISTS pdf_documents_fts")
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator
+
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import env_int
+from app.schemas.bulk import BulkImportResult, BulkRowError
+
+# Rows validated and inserted per transaction.
+BULK_CHUNK_ROWS = env_int("RENTPRO_BULK_CHUNK_ROWS", 1000, minimum=1)
+# Upper bound per request; later rows are reported and ignored.
+BULK_MAX_ROWS = env_int("RENTPRO_BULK_MAX_ROWS", 100_000, minimum=1)
+MAX_REPORTED_ERRORS = 1000
+
+CSV_MEDIA_TYPES = {"text/csv", "application/csv"}
+NDJSON_MEDIA_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+}
+
+# openapi_extra for bulk endpoints: the body is read as a stream, not a model
+BULK_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "text/csv": {"schema": {"type": "string"}},
+            "application/x-ndjson": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+# (row number, parsed fields or None, parse error or None)
+Record = tuple[int, dict[str, Any] | None, str | None]
+
+
+def bulk_format(request: Request) -> str:
+    media_type = (request.headers.get("content-type") or "").split(";")[0]
+    media_type = media_type.strip().lower()
+    if media_type in CSV_MEDIA_TYPES:
+        return "csv"
+    if media_type in NDJSON_MEDIA_TYPES:
+        return "ndjson"
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Send text/csv or application/x-ndjson",
+    )
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _iter_csv(request: Request) -> AsyncIterator[Record]:
+    header: list[str] | None = None
+    row = 0
+    record = ""
+    async for line in _iter_lines(request):
+        # a quoted field may span lines: wait until quotes are balanced
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        fields = next(csv.reader([text]))
+        if header is None:
+            header = [h.strip().lower() for h in fields]
+            continue
+        row += 1
+        if len(fields) > len(header):
+            yield row, None, f"expected {len(header)} columns, got {len(fields)}"
+            continue
+        yield row, {k: v for k, v in zip(header, fields) if v.strip() != ""}, None
+    if record:
+        row += 1
+        yield row, None, "unterminated quoted field"
+
+
+async def _iter_ndjson(request: Request) -> AsyncIterator[Record]:
+    row = 0
+    async for line in _iter_lines(request):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield row, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(data, dict):
+            yield row, None, "each line must be a JSON object"
+            continue
+        yield row, data, None
+
+
+async def iter_record_chunks(
+    request: Request, size: int | None = None
+) -> AsyncIterator[list[Record]]:
+    """
+    Stream the request body (CSV with a header row, or NDJSON) as chunks of
+    records, without buffering the whole upload.
+    """
+    size = size or BULK_CHUNK_ROWS
+    records = (
+        _iter_csv(request) if bulk_format(request) == "csv" else _iter_ndjson(request)
+    )
+    chunk: list[Record] = []
+    async for rec in records:
+        if rec[0] > BULK_MAX_ROWS:
+            chunk.append(
+                (rec[0], None, f"row limit ({BULK_MAX_ROWS}) exceeded; rest ignored")
+            )
+            break
+        chunk.append(rec)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validation_messages(exc: ValidationError) -> list[str]:
+    out = []
+    for err in exc.errors():
+        loc = ".".join(str(p) for p in err.get("loc", ()))
+        out.append(f"{loc}: {err.get('msg')}" if loc else str(err.get("msg")))
+    return out
+
+
+class BulkReport:
+    """Accumulates the per-row outcome of a bulk import."""
+
+    def __init__(self) -> None:
+        self.received = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: list[BulkRowError] = []
+
+    def fail(self, row: int, errors: list[str] | str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            if isinstance(errors, str):
+                errors = [errors]
+            self.errors.append(BulkRowError(row=row, errors=errors))
+
+    def result(self) -> BulkImportResult:
+        return BulkImportResult(
+            received=self.received,
+            inserted=self.inserted,
+            failed=self.failed,
+            # checks run in passes per chunk; report in input order
+            errors=sorted(self.errors, key=lambda e: e.row),
+            errors_truncated=self.failed > len(self.errors),
+        )
+
+
+async def _insert_rows(
+    db: AsyncSession,
+    model: Any,
+    candidates: list[tuple[int, dict[str, Any]]],
+    report: BulkReport,
+) -> list[tuple[int, dict[str, Any]]]:
+    # A rejected batch is split in half under savepoints until the rows the
+    # database refuses are isolated; the rest of the chunk is kept.
+    try:
+        async with db.begin_nested():
+            await db.execute(insert(model), [values for _, values in candidates])
+        return candidates
+    except DBAPIError as e:
+        if len(candidates) == 1:
+            report.fail(
+                candidates[0][0], f"database rejected row: {e.orig.__class__.__name__}"
+            )
+            return []
+    mid = len(candidates) // 2
+    inserted = await _insert_rows(db, model, candidates[:mid], report)
+    return inserted + await _insert_rows(db, model, candidates[mid:], report)
+
+
+async def insert_chunk(
+    db: AsyncSession,
+    model: Any,
+    candidates: list[tuple[int, dict[str, Any]]],
+    report: BulkReport,
+) -> list[tuple[int, dict[str, Any]]]:
+    """
+    Insert validated (row, values) pairs with one executemany INSERT and
+    commit, returning the pairs that were inserted. If the database rejects
+    the batch, it is retried in halves so only the offending rows are
+    reported.
+    """
+    if not candidates:
+        return []
+    inserted = await _insert_rows(db, model, candidates, report)
+    await db.commit()
+    report.inserted += len(inserted)
+    return inserted
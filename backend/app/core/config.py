@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+
+# Typed RENTPRO_* settings. Unset or blank means the default; anything that
+# does not parse, or is below `minimum`, fails at startup with RuntimeError
+# instead of being clamped or silently read as something else.
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+
+
+def _raw(name: str) -> str | None:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return None
+    return raw.strip()
+
+
+def env_int(name: str, default: int, *, minimum: int | None = None) -> int:
+    raw = _raw(name)
+    if raw is None:
+        return default
+    try:
+        v = int(raw)
+    except ValueError as e:
+        raise RuntimeError(f"{name} must be an integer (got {raw!r})") from e
+    if minimum is not None and v < minimum:
+        raise RuntimeError(f"{name} must be >= {minimum} (got {v})")
+    return v
+
+
+def env_float(name: str, default: float, *, minimum: float | None = None) -> float:
+    raw = _raw(name)
+    if raw is None:
+        return default
+    try:
+        v = float(raw)
+    except ValueError as e:
+        raise RuntimeError(f"{name} must be a number (got {raw!r})") from e
+    if minimum is not None and v < minimum:
+        raise RuntimeError(f"{name} must be >= {minimum:g} (got {v:g})")
+    return v
+
+
+def env_bool(name: str, default: bool) -> bool:
+    raw = _raw(name)
+    if raw is None:
+        return default
+    v = raw.lower()
+    if v in _TRUE:
+        return True
+    if v in _FALSE:
+        return False
+    raise RuntimeError(f"{name} must be 0/1 (got {raw!r})")
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import quote
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+from app.core.uploads import blob_digest
+
+# Opt-in: let the reverse proxy send the bytes once the API has authorized the
+# request. "x-accel" (nginx, internal location at FILE_OFFLOAD_PREFIX) or
+# "x-sendfile" (Apache mod_xsendfile, lighttpd; absolute path).
+FILE_OFFLOAD = (os.getenv("RENTPRO_FILE_OFFLOAD") or "").strip().lower()
+if FILE_OFFLOAD not in {"", "x-accel", "x-sendfile"}:
+    raise RuntimeError(
+        f"RENTPRO_FILE_OFFLOAD must be x-accel or x-sendfile (got {FILE_OFFLOAD!r})"
+    )
+FILE_OFFLOAD_PREFIX = (
+    "/"
+    + (os.getenv("RENTPRO_FILE_OFFLOAD_PREFIX") or "/_protected_uploads/").strip("/")
+    + "/"
+)
+
+# Private: only the authorized user may cache it. no-cache: the browser keeps
+# its copy but revalidates each open (answered by a 304 without the body).
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def strong_etag(stored_name: str) -> str:
+    """
+    ETag for an immutable stored file: the content hash of a blob, or for
+    legacy uploads a hash of the name (those names were never reused).
+    """
+    digest = blob_digest(stored_name)
+    if digest is None:
+        digest = hashlib.sha256(stored_name.encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def _not_modified_since(if_modified_since: str, mtime: float) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return int(mtime) <= since.timestamp()
+
+
+def _content_disposition(filename: str | None, inline: bool) -> dict[str, str]:
+    if filename is None:
+        return {}
+    kind = "inline" if inline else "attachment"
+    quoted = quote(filename)
+    if quoted != filename:
+        return {"Content-Disposition": f"{kind}; filename*=utf-8''{quoted}"}
+    return {"Content-Disposition": f'{kind}; filename="{filename}"'}
+
+
+def _offload_response(
+    path: Path, rel_path: str, headers: dict[str, str], media_type: str
+) -> Response:
+    if FILE_OFFLOAD == "x-accel":
+        headers["X-Accel-Redirect"] = FILE_OFFLOAD_PREFIX + quote(rel_path.lstrip("/"))
+    else:
+        headers["X-Sendfile"] = str(path)
+    # the proxy fills in the body, length and ranges
+    return Response(status_code=200, headers=headers, media_type=media_type)
+
+
+def file_download(
+    request: Request,
+    path: Path,
+    *,
+    rel_path: str,
+    etag: str,
+    media_type: str,
+    filename: str | None = None,
+    inline: bool = True,
+) -> Response:
+    """
+    Serve a stored file with validators and range support.
+
+    - 304 when If-None-Match (or, without it, If-Modified-Since) still matches
+    - Range / If-Range -> 206 (FileResponse); HEAD sends headers only
+    - zero-copy through the ASGI pathsend extension where the server has it
+    - with RENTPRO_FILE_OFFLOAD, an empty response telling the proxy which
+      file to send (`rel_path` under the upload root); no bytes pass through
+      Python
+    """
+    st = os.stat(path)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": PRIVATE_CACHE_CONTROL,
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if (if_none_match is not None and _etag_matches(if_none_match, etag)) or (
+        if_none_match is None
+        and if_modified_since is not None
+        and _not_modified_since(if_modified_since, st.st_mtime)
+    ):
+        return Response(status_code=304, headers=headers)
+
+    if FILE_OFFLOAD:
+        headers.update(_content_disposition(filename, inline))
+        return _offload_response(path, rel_path, headers, media_type)
+
+    return FileResponse(
+        path=str(path),
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type="inline" if inline else "attachment",
+        headers=headers,
+        stat_result=st,
+    )
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# backend/app/core/importtime.py -> backend/
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Loaded on first use (migrations, password hashing, tokens, PDF parsing);
+# importing the app must not pull them in.
+DEFERRED_MODULES = ("alembic", "passlib", "jose", "pypdf")
+
+# `import time: self [us] | cumulative | imported package`
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    timings: list[ImportTiming] = field(default_factory=list)
+
+    @property
+    def total_us(self) -> int:
+        return sum(t.cumulative_us for t in self.timings if t.depth == 0)
+
+    def loaded(self, package: str) -> bool:
+        return any(
+            t.module == package or t.module.startswith(package + ".")
+            for t in self.timings
+        )
+
+    def slowest(self, n: int = 20, *, prefix: str = "") -> list[ImportTiming]:
+        """Largest cumulative imports (optionally only `prefix`*)."""
+        rows = [t for t in self.timings if t.module.startswith(prefix)]
+        return sorted(rows, key=lambda t: t.cumulative_us, reverse=True)[:n]
+
+
+def parse_importtime(output: str, module: str) -> ImportProfile:
+    profile = ImportProfile(module)
+    for line in output.splitlines():
+        m = _LINE_RE.match(line)
+        if m is None:
+            continue
+        profile.timings.append(
+            ImportTiming(
+                module=m.group(4),
+                self_us=int(m.group(1)),
+                cumulative_us=int(m.group(2)),
+                depth=(len(m.group(3)) - 1) // 2,
+            )
+        )
+    return profile
+
+
+def measure_import(
+    module: str = "app.main", *, repeat: int = 3, env: dict[str, str] | None = None
+) -> ImportProfile:
+    """
+    `python -X importtime -c "import <module>"` in fresh interpreters; the
+    fastest of `repeat` runs (the others are mostly scheduler noise).
+    """
+    best: ImportProfile | None = None
+    for _ in range(max(1, repeat)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=BACKEND_DIR,
+            env={**os.environ, **(env or {})},
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+        profile = parse_importtime(proc.stderr, module)
+        if best is None or profile.total_us < best.total_us:
+            best = profile
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.core.importtime",
+        description="Import-time audit of the backend (python -X importtime).",
+    )
+    parser.add_argument("module", nargs="?", default="app.main")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--prefix", default="", help="e.g. app. for own modules")
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    profile = measure_import(args.module, repeat=args.repeat)
+    print(f"import {args.module}: {profile.total_us / 1000:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for t in profile.slowest(args.top, prefix=args.prefix):
+        indent = "  " * t.depth
+        print(
+            f"{t.cumulative_us / 1000:>14.1f} {t.self_us / 1000:>9.1f}  "
+            f"{indent}{t.module}"
+        )
+
+    status = 0
+    eager = [m for m in DEFERRED_MODULES if profile.loaded(m)]
+    if eager:
+        print(f"loaded at import (should be deferred): {', '.join(eager)}")
+        status = 1
+    if args.budget_ms is not None and profile.total_us / 1000 > args.budget_ms:
+        print(f"over budget: {args.budget_ms:.0f} ms")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import delete, insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import env_bool, env_int
+from app.core.status_sync import (
+    recompute_property_statuses,
+    sync_overdue_contracts_global,
+)
+from app.db import session as sync_db
+from app.models.job_lock import JobLock
+from app.models.property import Property
+
+logger = logging.getLogger("rentpro.jobs")
+
+
+JOBS_ENABLED = env_bool("RENTPRO_JOBS_ENABLED", True)
+# "inline": read endpoints sync statuses on access (the A3 behaviour).
+# "background": they don't; the status_sync job keeps statuses fresh instead.
+STATUS_SYNC_MODE = (os.getenv("RENTPRO_STATUS_SYNC_MODE") or "inline").strip().lower()
+if STATUS_SYNC_MODE not in {"inline", "background"}:
+    raise RuntimeError(
+        f"RENTPRO_STATUS_SYNC_MODE must be inline or background (got {STATUS_SYNC_MODE!r})"
+    )
+STATUS_SYNC_INTERVAL_SECONDS = env_int(
+    "RENTPRO_STATUS_SYNC_INTERVAL_SECONDS", 300, minimum=1
+)
+STATUS_RECOMPUTE_CRON = os.getenv("RENTPRO_STATUS_RECOMPUTE_CRON") or "15 3 * * *"
+UPLOAD_GC_CRON = os.getenv("RENTPRO_UPLOAD_GC_CRON") or "45 3 * * *"
+# A lock-table lease outlives a crashed worker by at most this long.
+JOB_LOCK_TTL_SECONDS = env_int("RENTPRO_JOB_LOCK_TTL_SECONDS", 600, minimum=1)
+
+
+def inline_status_sync() -> bool:
+    """Whether read endpoints should sync property/contract statuses themselves."""
+    return STATUS_SYNC_MODE == "inline" or not JOBS_ENABLED
+
+
+# ---------------------------------------------------------------------------
+# Schedules
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Interval:
+    seconds: float
+
+    def next_after(self, now: datetime) -> datetime:
+        return now + timedelta(seconds=self.seconds)
+
+
+_CRON_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _cron_field(spec: str, lo: int, hi: int) -> frozenset[int]:
+    values: set[int] = set()
+    for part in spec.split(","):
+        step = 1
+        if "/" in part:
+            part, raw_step = part.split("/", 1)
+            step = int(raw_step)
+        if part == "*":
+            start, end = lo, hi
+        elif "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+        else:
+            start = int(part)
+            end = hi if step > 1 else start
+        if step < 1 or start < lo or end > hi or start > end:
+            raise ValueError(f"cron field {spec!r} out of range {lo}-{hi}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class Cron:
+    """
+    Five-field cron expression (minute hour day-of-month month day-of-week),
+    evaluated in UTC. Supports `*`, lists, ranges and steps; day-of-week 0 or 7
+    is Sunday. Like cron, a restricted day-of-month OR day-of-week matches.
+    """
+
+    def __init__(self, expr: str):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields (got {expr!r})")
+        self.expr = expr
+        self._minutes, self._hours, self._days, self._months, weekdays = (
+            _cron_field(spec, lo, hi) for spec, (lo, hi) in zip(fields, _CRON_RANGES)
+        )
+        self._weekdays = frozenset(d % 7 for d in weekdays)
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, t: datetime) -> bool:
+        day = t.day in self._days
+        weekday = (t.isoweekday() % 7) in self._weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, now: datetime) -> datetime:
+        t = now.astimezone(timezone.utc).replace(second=0, microsecond=0)
+        t += timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self._months:
+                t = (t.replace(day=1) + timedelta(days=32)).replace(
+                    day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self._hours:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self._minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"cron expression {self.expr!r} never matches")
+
+    def __repr__(self) -> str:
+        return f"Cron({self.expr!r})"
+
+
+# ---------------------------------------------------------------------------
+# Cross-worker locks
+# ---------------------------------------------------------------------------
+
+
+def _advisory_key(name: str) -> int:
+    # stable across processes (unlike hash()); fits a signed bigint
+    return zlib.crc32(f"rentpro.job.{name}".encode())
+
+
+@contextmanager
+def job_lock(
+    name: str, *, owner: str, ttl_seconds: float | None = None
+) -> Iterator[bool]:
+    """
+    Try to take the cross-worker lock for job `name`; yields whether it did.
+
+    PostgreSQL: a session-level pg_try_advisory_lock, held on a dedicated
+    connection until the block ends. Elsewhere (SQLite): a lease row in
+    job_locks, taken over once `locked_until` has passed.
+    """
+    bind = sync_db.writer_engine or sync_db.engine
+    if bind.dialect.name == "postgresql":
+        key = _advisory_key(name)
+        with bind.connect() as conn:
+            acquired = bool(
+                conn.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": key}
+                ).scalar()
+            )
+            conn.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                    conn.commit()
+        return
+
+    ttl = JOB_LOCK_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    now = datetime.now(timezone.utc)
+    values = {"owner": owner, "locked_until": now + timedelta(seconds=ttl)}
+    with bind.begin() as conn:
+        acquired = (
+            conn.execute(
+                update(JobLock)
+                .where(JobLock.name == name, JobLock.locked_until < now)
+                .values(**values)
+            ).rowcount
+            == 1
+        )
+        if not acquired:
+            try:
+                with conn.begin_nested():
+                    conn.execute(insert(JobLock).values(name=name, **values))
+                acquired = True
+            except IntegrityError:
+                acquired = False
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with bind.begin() as conn:
+                conn.execute(
+                    delete(JobLock).where(JobLock.name == name, JobLock.owner == owner)
+                )
+
+
+# ---------------------------------------------------------------------------
+# Jobs and runner
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Job:
+    """A named maintenance task; `func(db)` runs in the threadpool."""
+
+    name: str
+    func: Callable[[Session], Any]
+    schedule: Interval | Cron
+
+
+_observer: Callable[..., None] | None = None
+
+
+def set_job_observer(fn: Callable[..., None] | None) -> None:
+    """Receive (job, outcome=..., duration_ms=...) per run (see observe_job)."""
+    global _observer
+    _observer = fn
+
+
+class JobRunner:
+    """
+    Runs jobs on asyncio tasks in this worker. Each run is single-flight: it
+    is skipped while the same job is still running here ("running") or holds
+    its lock in another worker ("locked").
+    """
+
+    def __init__(self, jobs: list[Job] | None = None):
+        self.jobs: dict[str, Job] = {j.name: j for j in jobs or []}
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._running: set[str] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def add(self, job: Job) -> None:
+        self.jobs[job.name] = job
+
+    def _run_locked(self, job: Job) -> str:
+        with job_lock(job.name, owner=self.owner) as acquired:
+            if not acquired:
+                return "locked"
+            db = sync_db.SessionLocal()
+            try:
+                job.func(db)
+            finally:
+                db.close()
+        return "ok"
+
+    async def run_once(self, name: str) -> str:
+        """Run job `name` now; returns ok/failed/locked/running."""
+        job = self.jobs[name]
+        if name in self._running:
+            outcome, elapsed_ms = "running", 0.0
+        else:
+            self._running.add(name)
+            t0 = time.perf_counter()
+            try:
+                outcome = await run_in_threadpool(self._run_locked, job)
+            except Exception:
+                logger.exception("job %s failed", name)
+                outcome = "failed"
+            finally:
+                self._running.discard(name)
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        if _observer is not None:
+            _observer(name, outcome=outcome, duration_ms=elapsed_ms)
+        return outcome
+
+    async def _loop(self, job: Job) -> None:
+        while True:
+            now = datetime.now(timezone.utc)
+            delay = (job.schedule.next_after(now) - now).total_seconds()
+            await asyncio.sleep(max(0.0, delay))
+            await self.run_once(job.name)
+
+    def start(self) -> None:
+        """Schedule every job on the running event loop."""
+        if self._tasks:
+            return
+        for job in self.jobs.values():
+            self._tasks.append(
+                asyncio.get_running_loop().create_task(
+                    self._loop(job), name=f"rentpro-job-{job.name}"
+                )
+            )
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def recompute_all_property_statuses(db: Session, *, batch_size: int = 500) -> None:
+    """Full set-based status recompute, one batch of properties at a time."""
+    last_id = 0
+    while True:
+        ids = list(
+            db.execute(
+                select(Property.id)
+                .where(Property.id > last_id)
+                .order_by(Property.id)
+                .limit(batch_size)
+            ).scalars()
+        )
+        if not ids:
+            return
+        recompute_property_statuses(db, ids, batch_size=batch_size)
+        last_id = ids[-1]
+
+
+def collect_upload_orphans(db: Session) -> None:
+    from app.core.upload_gc import collect_orphans
+
+    collect_orphans(db)
+
+
+def ingest_pending_pdfs(db: Session) -> None:
+    from app.core.pdf_ingest import ingest_pending
+
+    ingest_pending(db)
+
+
+def default_jobs() -> list[Job]:
+    from app.core.pdf_ingest import PDF_INGEST_ENABLED, PDF_INGEST_INTERVAL_SECONDS
+
+    jobs = [
+        Job(
+            "status_sync",
+            sync_overdue_contracts_global,
+            Interval(STATUS_SYNC_INTERVAL_SECONDS),
+        ),
+        Job(
+            "property_status_recompute",
+            recompute_all_property_statuses,
+            Cron(STATUS_RECOMPUTE_CRON),
+        ),
+        Job("upload_gc", collect_upload_orphans, Cron(UPLOAD_GC_CRON)),
+    ]
+    if PDF_INGEST_ENABLED:
+        # catch-up for uploads whose post-upload ingestion never ran
+        jobs.append(
+            Job(
+                "pdf_ingest",
+                ingest_pending_pdfs,
+                Interval(PDF_INGEST_INTERVAL_SECONDS),
+            )
+        )
+    return jobs
@@ -4,7 +4,9 @@ from typing import Any, Dict, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+
+# python-jose is imported inside the functions below: it (and its crypto
+# backends) loads with the first token instead of at app import.
 
 
 def _strict_config_enabled() -> bool:
@@ -94,6 +96,8 @@ def create_access_token(
     if extra_claims:
         payload.update(extra_claims)
 
+    from jose import jwt
+
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -116,6 +120,8 @@ def create_refresh_token(
         "type": "refresh",
         "exp": _to_timestamp(expire),
     }
+    from jose import jwt
+
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -125,6 +131,8 @@ def verify_refresh_token(token: str) -> Dict[str, Any]:
     - Raises JWTError on invalid/expired token.
     - Caller must check payload.get("sub").
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
@@ -135,6 +143,8 @@ def verify_refresh_token(token: str) -> Dict[str, Any]:
 
 
 def decode_access_token(token: str):
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
@@ -8,6 +8,7 @@ from app.core.jwt import decode_access_token
 
 PUBLIC_EXACT_PATHS = {
     "/health",
+    "/health/db",
     "/metrics",
     "/login",
     "/login/",
@@ -1,14 +1,81 @@
 from __future__ import annotations
 
+import ast
 import logging
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 
-from alembic import command
-from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
 
 logger = logging.getLogger(__name__)
 
+# backend/app/core/migrations.py -> backend/
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+VERSIONS_DIR = BACKEND_DIR / "alembic" / "versions"
+
+# What the API does with the schema when a worker starts:
+# - "auto": one query against alembic_version; upgrade (+ seeds) only when the
+#   database is behind the scripts
+# - "always": upgrade (+ seeds) on every start (the old behaviour)
+# - "off": nothing; run `python -m app.core.migrations` as a one-shot step
+MIGRATE_ON_STARTUP = (os.getenv("RENTPRO_MIGRATE_ON_STARTUP") or "auto").strip().lower()
+if MIGRATE_ON_STARTUP not in {"auto", "always", "off"}:
+    raise RuntimeError(
+        "RENTPRO_MIGRATE_ON_STARTUP must be auto, always or off "
+        f"(got {MIGRATE_ON_STARTUP!r})"
+    )
+
+_REVISION_RE = re.compile(r"^revision(?:\s*:[^=]+)?\s*=\s*(.+)$", re.M)
+_DOWN_REVISION_RE = re.compile(r"^down_revision(?:\s*:[^=]+)?\s*=\s*(.+)$", re.M)
+
+
+def _revision_ids(raw: str) -> set[str]:
+    value = ast.literal_eval(raw.strip())
+    if value is None:
+        return set()
+    if isinstance(value, str):
+        return {value}
+    return set(value)
+
+
+@lru_cache(maxsize=None)
+def script_heads(versions_dir: Path = VERSIONS_DIR) -> frozenset[str]:
+    """
+    Head revision(s) of the migration scripts, read from the revision headers
+    without importing Alembic or the scripts themselves.
+    """
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        rev = _REVISION_RE.search(source)
+        if rev is None:
+            continue
+        revisions |= _revision_ids(rev.group(1))
+        down = _DOWN_REVISION_RE.search(source)
+        if down is not None:
+            parents |= _revision_ids(down.group(1))
+    return frozenset(revisions - parents)
+
+
+def database_revisions(engine: Engine) -> frozenset[str]:
+    """Revisions stamped in alembic_version (empty when the table is missing)."""
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT version_num FROM alembic_version"))
+            return frozenset(row[0] for row in rows)
+    except SQLAlchemyError:
+        return frozenset()
+
+
+def is_at_head(engine: Engine) -> bool:
+    heads = script_heads()
+    return bool(heads) and database_revisions(engine) == heads
+
 
 def run_migrations(*, required: bool = True) -> None:
     """
@@ -27,9 +94,7 @@ def run_migrations(*, required: bool = True) -> None:
         logger.warning(msg)
         return
 
-    # backend/app/core/migrations.py -> backend/
-    backend_dir = Path(__file__).resolve().parent.parent.parent
-    alembic_ini = backend_dir / "alembic.ini"
+    alembic_ini = BACKEND_DIR / "alembic.ini"
     if not alembic_ini.exists():
         msg = f"Missing Alembic config at {alembic_ini}"
         if required:
@@ -37,8 +102,53 @@ def run_migrations(*, required: bool = True) -> None:
         logger.warning(msg)
         return
 
+    # Alembic (and, through env.py, every model and revision script) only
+    # loads when there is something to upgrade.
+    from alembic import command
+    from alembic.config import Config
+
     cfg = Config(str(alembic_ini))
     cfg.set_main_option("sqlalchemy.url", db_url)
 
     logger.info("Running DB migrations to head")
     command.upgrade(cfg, "head")
+
+
+def seed_reference_data() -> None:
+    """Locked areas and TOPSIS criteria (idempotent)."""
+    from app.core.seed import seed_locked_areas, seed_locked_criteria
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        seed_locked_areas(db)
+        seed_locked_criteria(db)
+    finally:
+        db.close()
+
+
+def prepare_database(engine: Engine, *, mode: str = MIGRATE_ON_STARTUP) -> bool:
+    """
+    Startup schema step (see MIGRATE_ON_STARTUP). Returns True when the
+    upgrade and seeds ran, False when the database was already current (or
+    mode is "off").
+    """
+    if mode == "off":
+        return False
+    if mode == "auto" and is_at_head(engine):
+        logger.info("Database at head %s; skipping migrations", sorted(script_heads()))
+        return False
+    run_migrations()
+    seed_reference_data()
+    return True
+
+
+def main() -> int:
+    """`python -m app.core.migrations`: upgrade to head and seed, then exit."""
+    run_migrations()
+    seed_reference_data()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
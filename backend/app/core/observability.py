@@ -1,18 +1,29 @@
 from __future__ import annotations
 
+import bisect
 import contextvars
 import json
 import logging
 import os
+import re
 import threading
 import time
 import uuid
-from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Callable
 
 from fastapi import Request
+from fastapi import routing as fastapi_routing
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
+from starlette.routing import Mount, compile_path, replace_params
+
+from app.core.config import env_int
+from app.db.instrumentation import (
+    QueryStats,
+    begin_query_stats,
+    current_query_stats,
+    end_query_stats,
+)
 
 _request_id_ctx: contextvars.ContextVar[str | None] = contextvars.ContextVar(
     "rentpro_request_id", default=None
@@ -73,51 +84,425 @@ def configure_logging() -> None:
     root.addHandler(handler)
 
 
-@dataclass
-class _MetricsSnapshot:
-    uptime_seconds: float
-    requests_total: int
-    by_status: Dict[str, int]
-    by_path: Dict[str, int]
+DEFAULT_LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+)
+
+# Series labels used when a request cannot be attributed to a route template,
+# or when the cardinality cap has been reached.
+UNMATCHED_ROUTE = "__unmatched__"
+OVERFLOW_ROUTE = "__other__"
+
+
+_route_patterns: dict[int, list[tuple[re.Pattern[str], str]]] = {}
+
+
+def _template_from_routes(app: Any, path: str) -> str | None:
+    """
+    Fallback for requests that never reached the router: match the raw path
+    against the app's route patterns (with their convertors, so `{key:path}`
+    spans slashes; compiled once per app).
+    """
+    patterns = _route_patterns.get(id(app))
+    if patterns is None:
+        routes = list(getattr(app, "routes", ()))
+        # FastAPI >= 0.140 keeps included routers nested; iter_route_contexts
+        # yields their routes with the full prefix (older versions flatten
+        # app.routes already)
+        iter_route_contexts = getattr(fastapi_routing, "iter_route_contexts", None)
+        if iter_route_contexts is not None:
+            routes = list(iter_route_contexts(routes))
+        patterns = []
+        for r in routes:
+            if isinstance(r, Mount) or not isinstance(getattr(r, "path", None), str):
+                continue
+            try:
+                regex, path_format, _ = compile_path(r.path)
+            except Exception:
+                continue
+            patterns.append((regex, path_format))
+        _route_patterns[id(app)] = patterns
+
+    for regex, template in patterns:
+        if regex.match(path):
+            return template
+
+    for r in getattr(app, "routes", ()):
+        if isinstance(r, Mount) and path.startswith(r.path + "/"):
+            return f"{r.path}/{{path:path}}"
+    return None
+
+
+def route_template(request: Request) -> str:
+    """
+    Return the route template for a request (e.g. "/properties/{property_id}").
+
+    Raw URL paths are never used as metric labels: ids in the path would create
+    one series per entity. Requests rejected before routing (e.g. 401 from the
+    auth middleware) are matched against the app's route patterns; anything
+    that still does not match collapses into UNMATCHED_ROUTE.
+
+    The matched route's `path_format` is filled with the path params; whatever
+    precedes it in the request path is the router prefix, so nested routers
+    keep their full prefix and values with "/" (`{key:path}`) or repeated
+    values still map to one template.
+    """
+    scope = request.scope
+    path = scope.get("path") or "/"
+    route = scope.get("route")
+    if route is None:
+        return _template_from_routes(scope.get("app"), path) or UNMATCHED_ROUTE
+
+    if isinstance(route, Mount):
+        return f"{route.path}/{{path:path}}"
+
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return _template_from_routes(scope.get("app"), path) or UNMATCHED_ROUTE
+
+    params = scope.get("path_params") or {}
+    try:
+        filled, _ = replace_params(
+            path_format, getattr(route, "param_convertors", {}), dict(params)
+        )
+    except Exception:
+        filled = None
+    if filled is None or not path.endswith(filled):
+        return _template_from_routes(scope.get("app"), path) or UNMATCHED_ROUTE
+    return path[: len(path) - len(filled)] + path_format
+
+
+class _Series:
+    __slots__ = ("count", "sum_ms", "max_ms", "buckets", "db_queries", "db_ms")
+
+    def __init__(self, n_buckets: int) -> None:
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.db_queries = 0
+        self.db_ms = 0.0
+        # one slot per finite bucket + the +Inf bucket
+        self.buckets = [0] * (n_buckets + 1)
+
+
+class _Shard:
+    """
+    Per-thread slice of the metrics store.
+
+    Only the owning thread writes to a shard, so recording needs no lock;
+    snapshot() merges all shards (values may be a few observations behind).
+    """
+
+    __slots__ = ("requests_total", "by_status", "series", "caches", "jobs")
+
+    def __init__(self) -> None:
+        self.requests_total = 0
+        self.by_status: dict[str, int] = {}
+        self.series: dict[tuple[str, str], _Series] = {}
+        # cache name -> [hits, misses]
+        self.caches: dict[str, list[int]] = {}
+        # (job, outcome) -> [runs, total ms]
+        self.jobs: dict[tuple[str, str], list[float]] = {}
+
+
+def _percentile(
+    bounds: tuple[float, ...], buckets: list[int], total: int, q: float
+) -> float | None:
+    """
+    Estimate the q-quantile from fixed buckets (linear interpolation within the
+    bucket, Prometheus histogram_quantile style).
+    """
+    if total <= 0:
+        return None
+
+    rank = q * total
+    cumulative = 0
+    for i, n in enumerate(buckets):
+        if n and cumulative + n >= rank:
+            if i >= len(bounds):
+                # +Inf bucket: best answer is the highest finite bound
+                return bounds[-1] if bounds else None
+            lower = bounds[i - 1] if i > 0 else 0.0
+            upper = bounds[i]
+            return lower + (upper - lower) * ((rank - cumulative) / n)
+        cumulative += n
+    return bounds[-1] if bounds else None
 
 
 class InMemoryMetrics:
     """
     Very small in-memory metrics store (sufficient for demos).
 
+    - Request counts by status and by route template (not raw path).
+    - Fixed-bucket latency histograms keyed by (method, route template),
+      with p50/p95/p99 estimated from the buckets.
+    - Cardinality cap (RENTPRO_METRICS_MAX_SERIES): once reached, new series
+      are folded into a single OVERFLOW_ROUTE series.
+    - Recording is sharded per thread, so worker threads never contend on a
+      lock in the hot path.
+    - Cache hit/miss counters (observe_cache) and pull-style gauges
+      (add_gauge_collector, e.g. DB pool usage) for the Prometheus export.
+
     Notes:
     - Not shared across multiple processes/workers.
     - Resets on container restart.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        buckets_ms: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS,
+        max_series: int | None = None,
+    ) -> None:
         self._start = time.time()
-        self._lock = threading.Lock()
-        self._requests_total = 0
-        self._by_status: Dict[str, int] = {}
-        self._by_path: Dict[str, int] = {}
-
-    def observe(self, *, path: str, status_code: int) -> None:
-        with self._lock:
-            self._requests_total += 1
-            sk = str(int(status_code))
-            self._by_status[sk] = self._by_status.get(sk, 0) + 1
-            self._by_path[path] = self._by_path.get(path, 0) + 1
-
-    def snapshot(self) -> Dict[str, Any]:
-        with self._lock:
-            snap = _MetricsSnapshot(
-                uptime_seconds=time.time() - self._start,
-                requests_total=self._requests_total,
-                by_status=dict(self._by_status),
-                by_path=dict(self._by_path),
-            )
+        self._bounds = tuple(sorted(float(b) for b in buckets_ms))
+        self._max_series = (
+            max_series
+            if max_series is not None
+            else env_int("RENTPRO_METRICS_MAX_SERIES", 200, minimum=1)
+        )
+
+        self._local = threading.local()
+        # Only taken when a thread registers its shard or a new series is admitted.
+        self._registry_lock = threading.Lock()
+        self._shards: list[_Shard] = []
+        self._known_series: set[tuple[str, str]] = set()
+        self._overflowed = 0
+        self._gauge_collectors: list[Callable[[], dict[str, float]]] = []
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            with self._registry_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def _admit(self, key: tuple[str, str]) -> tuple[str, str]:
+        if key in self._known_series:
+            return key
+        with self._registry_lock:
+            if key in self._known_series:
+                return key
+            if len(self._known_series) < self._max_series:
+                self._known_series.add(key)
+                return key
+            self._overflowed += 1
+        return (key[0], OVERFLOW_ROUTE)
+
+    def observe(
+        self,
+        *,
+        path: str,
+        status_code: int,
+        method: str = "GET",
+        duration_ms: float | None = None,
+        db_queries: int = 0,
+        db_ms: float = 0.0,
+    ) -> None:
+        """
+        Record one request. `path` must be a route template (see route_template()).
+        """
+        shard = self._shard()
+        shard.requests_total += 1
+        sk = str(int(status_code))
+        shard.by_status[sk] = shard.by_status.get(sk, 0) + 1
+
+        key = (method.upper(), path)
+        series = shard.series.get(key)
+        if series is None:
+            key = self._admit(key)
+            series = shard.series.get(key)
+            if series is None:
+                series = _Series(len(self._bounds))
+                shard.series[key] = series
+
+        series.count += 1
+        series.db_queries += db_queries
+        series.db_ms += db_ms
+        if duration_ms is not None:
+            ms = float(duration_ms)
+            series.sum_ms += ms
+            if ms > series.max_ms:
+                series.max_ms = ms
+            series.buckets[bisect.bisect_left(self._bounds, ms)] += 1
+
+    def observe_cache(self, cache: str, *, hit: bool) -> None:
+        """
+        Record one lookup against a named in-process cache.
+        """
+        caches = self._shard().caches
+        counts = caches.get(cache)
+        if counts is None:
+            counts = caches[cache] = [0, 0]
+        counts[0 if hit else 1] += 1
+
+    def observe_job(self, job: str, *, outcome: str, duration_ms: float) -> None:
+        """
+        Record one background job run (outcome: ok/failed/locked/running).
+        """
+        jobs = self._shard().jobs
+        stats = jobs.get((job, outcome))
+        if stats is None:
+            stats = jobs[(job, outcome)] = [0, 0.0]
+        stats[0] += 1
+        stats[1] += duration_ms
+
+    def add_gauge_collector(self, fn: Callable[[], dict[str, float]]) -> None:
+        """
+        Register a callable returning {metric_name: value}; evaluated on collect.
+        """
+        self._gauge_collectors.append(fn)
+
+    def gauges(self) -> dict[str, float]:
+        out: dict[str, float] = {}
+        for fn in list(self._gauge_collectors):
+            try:
+                out.update(fn())
+            except Exception:
+                # A broken collector must never break /metrics.
+                continue
+        return out
+
+    @property
+    def bucket_bounds_ms(self) -> tuple[float, ...]:
+        return self._bounds
+
+    @property
+    def uptime_seconds(self) -> float:
+        return time.time() - self._start
+
+    def _merged(
+        self,
+    ) -> tuple[
+        int,
+        dict[str, int],
+        dict[tuple[str, str], _Series],
+        dict[str, list[int]],
+        dict[tuple[str, str], list[float]],
+    ]:
+        with self._registry_lock:
+            shards = list(self._shards)
+
+        requests_total = 0
+        by_status: dict[str, int] = {}
+        series: dict[tuple[str, str], _Series] = {}
+        caches: dict[str, list[int]] = {}
+        jobs: dict[tuple[str, str], list[float]] = {}
+        for shard in shards:
+            requests_total += shard.requests_total
+            for k, v in list(shard.by_status.items()):
+                by_status[k] = by_status.get(k, 0) + v
+            for name, (hits, misses) in list(shard.caches.items()):
+                c = caches.setdefault(name, [0, 0])
+                c[0] += hits
+                c[1] += misses
+            for key, (runs, ms) in list(shard.jobs.items()):
+                j = jobs.setdefault(key, [0, 0.0])
+                j[0] += runs
+                j[1] += ms
+            for key, s in list(shard.series.items()):
+                m = series.get(key)
+                if m is None:
+                    m = series[key] = _Series(len(self._bounds))
+                m.count += s.count
+                m.sum_ms += s.sum_ms
+                m.max_ms = max(m.max_ms, s.max_ms)
+                m.db_queries += s.db_queries
+                m.db_ms += s.db_ms
+                for i, n in enumerate(list(s.buckets)):
+                    m.buckets[i] += n
+        return requests_total, by_status, series, caches, jobs
+
+    def collect(self) -> dict[str, Any]:
+        """
+        Raw merged values (used by exporters; snapshot() is the JSON view).
+        """
+        requests_total, by_status, series, caches, jobs = self._merged()
+        return {
+            "uptime_seconds": self.uptime_seconds,
+            "requests_total": requests_total,
+            "by_status": by_status,
+            "series": {
+                key: {
+                    "count": s.count,
+                    "sum_ms": s.sum_ms,
+                    "max_ms": s.max_ms,
+                    "buckets": list(s.buckets),
+                    "db_queries": s.db_queries,
+                    "db_ms": s.db_ms,
+                }
+                for key, s in series.items()
+            },
+            "caches": {name: (c[0], c[1]) for name, c in caches.items()},
+            "jobs": {key: (int(j[0]), j[1]) for key, j in jobs.items()},
+            "gauges": self.gauges(),
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        requests_total, by_status, series, caches, jobs = self._merged()
+
+        by_path: dict[str, int] = {}
+        routes: dict[str, dict[str, Any]] = {}
+        for (method, route), s in sorted(series.items()):
+            by_path[route] = by_path.get(route, 0) + s.count
+            timed = sum(s.buckets)
+
+            def _q(q: float, s: _Series = s, timed: int = timed) -> float | None:
+                v = _percentile(self._bounds, s.buckets, timed, q)
+                return round(v, 3) if v is not None else None
+
+            routes[f"{method} {route}"] = {
+                "method": method,
+                "route": route,
+                "count": s.count,
+                "sum_ms": round(s.sum_ms, 3),
+                "max_ms": round(s.max_ms, 3),
+                "p50_ms": _q(0.50),
+                "p95_ms": _q(0.95),
+                "p99_ms": _q(0.99),
+                "buckets": list(s.buckets),
+                "db_queries": s.db_queries,
+                "db_queries_avg": round(s.db_queries / s.count, 2) if s.count else 0,
+                "db_ms": round(s.db_ms, 3),
+            }
+
         # return plain dict (FastAPI JSON encodes)
         return {
-            "uptime_seconds": round(snap.uptime_seconds, 3),
-            "requests_total": snap.requests_total,
-            "by_status": snap.by_status,
-            "by_path": snap.by_path,
+            "uptime_seconds": round(time.time() - self._start, 3),
+            "requests_total": requests_total,
+            "by_status": by_status,
+            "by_path": by_path,
+            "latency_buckets_ms": list(self._bounds),
+            "routes": routes,
+            "series_limit": self._max_series,
+            "series_overflowed": self._overflowed,
+            "caches": {
+                name: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": (
+                        round(hits / (hits + misses), 4) if hits + misses else None
+                    ),
+                }
+                for name, (hits, misses) in sorted(caches.items())
+            },
+            "jobs": {
+                f"{job} {outcome}": {"runs": int(runs), "total_ms": round(ms, 3)}
+                for (job, outcome), (runs, ms) in sorted(jobs.items())
+            },
+            "gauges": self.gauges(),
         }
 
 
@@ -127,7 +512,8 @@ class ObservabilityMiddleware(BaseHTTPMiddleware):
     - X-Request-ID header (reuses incoming if provided)
     - request.state.request_id
     - request-scoped logging context (request_id)
-    - basic metrics counting
+    - basic metrics counting + latency histograms (by route template)
+    - per-request SQL statement count/time (X-DB-Queries, Server-Timing)
     """
 
     def __init__(self, app, metrics: InMemoryMetrics | None = None):  # type: ignore[no-untyped-def]
@@ -142,6 +528,8 @@ class ObservabilityMiddleware(BaseHTTPMiddleware):
             rid = uuid.uuid4().hex
 
         token = _request_id_ctx.set(rid)
+        stats_token = begin_query_stats()
+        stats = current_query_stats() or QueryStats()
         request.state.request_id = rid
 
         start = time.perf_counter()
@@ -149,14 +537,25 @@ class ObservabilityMiddleware(BaseHTTPMiddleware):
             response: Response = await call_next(request)
         finally:
             duration_ms = (time.perf_counter() - start) * 1000.0
+            end_query_stats(stats_token)
             _request_id_ctx.reset(token)
 
         response.headers["X-Request-ID"] = rid
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", '
+            f"app;dur={duration_ms:.1f}"
+        )
 
         if self._metrics is not None:
             try:
                 self._metrics.observe(
-                    path=request.url.path, status_code=response.status_code
+                    path=route_template(request),
+                    status_code=response.status_code,
+                    method=request.method,
+                    duration_ms=duration_ms,
+                    db_queries=stats.count,
+                    db_ms=stats.total_ms,
                 )
             except Exception:
                 # Never fail the request due to metrics.
@@ -164,11 +563,13 @@ class ObservabilityMiddleware(BaseHTTPMiddleware):
 
         if self._log_requests:
             self._logger.info(
-                "%s %s -> %s (%.1fms)",
+                "%s %s -> %s (%.1fms, %d queries, %.1fms db)",
                 request.method,
                 request.url.path,
                 response.status_code,
                 duration_ms,
+                stats.count,
+                stats.total_ms,
             )
 
         return response
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import io
+import logging
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import exists, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import env_bool, env_int
+from app.core.uploads import get_storage, pdf_storage_key
+from app.core.workers import call_cpu_bound
+from app.db.session import SessionLocal
+from app.models.contract import Contract
+from app.models.pdf_document import PdfDocument, PdfDocumentStatus
+
+logger = logging.getLogger("rentpro.pdf")
+
+
+PDF_INGEST_ENABLED = env_bool("RENTPRO_PDF_INGEST", True)
+PDF_INGEST_INTERVAL_SECONDS = env_int(
+    "RENTPRO_PDF_INGEST_INTERVAL_SECONDS", 60, minimum=1
+)
+PDF_THUMBNAIL_WIDTH = env_int("RENTPRO_PDF_THUMBNAIL_WIDTH", 320, minimum=1)
+PDF_TEXT_MAX_CHARS = env_int("RENTPRO_PDF_TEXT_MAX_CHARS", 200_000, minimum=1)
+# poppler-utils (pdftotext / pdftoppm) per file; a stuck PDF must not hang a worker
+PDF_TOOL_TIMEOUT_SECONDS = env_int("RENTPRO_PDF_TOOL_TIMEOUT_SECONDS", 30, minimum=1)
+
+THUMB_DIR = "thumbs"
+
+# Malformed PDF content (pypdf raises its PyPdfError family plus the odd
+# builtin on broken structure); anything else (storage, disk, worker pool) is
+# transient.
+_PARSE_ERRORS = (ValueError, IndexError, KeyError, TypeError, RecursionError)
+
+
+class PdfParseError(ValueError):
+    """The PDF itself cannot be read; retrying will not help."""
+
+
+def thumbnail_key(pdf_key: str) -> str:
+    return f"{THUMB_DIR}/{pdf_storage_key(pdf_key)}.png"
+
+
+# ---------------------------------------------------------------------------
+# Extraction (CPU-bound; module-level so it can run in a worker process)
+# ---------------------------------------------------------------------------
+
+
+def _parse_errors() -> tuple[type[BaseException], ...]:
+    from pypdf.errors import PyPdfError
+
+    return (PyPdfError, *_PARSE_ERRORS)
+
+
+def _open_pdf(data: bytes) -> Any:
+    """pypdf reader over `data` (imported here: only ingestion needs it)."""
+    from pypdf import PdfReader
+
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        if reader.is_encrypted and not reader.decrypt(""):
+            raise PdfParseError("encrypted PDF (password required)")
+        # walks the page tree: a broken one fails here, not later
+        pages = len(reader.pages)
+    except PdfParseError:
+        raise
+    except _parse_errors() as e:
+        raise PdfParseError(f"unreadable PDF: {e}") from e
+    if not pages:
+        raise PdfParseError("unreadable PDF: no pages")
+    return reader
+
+
+def _reader_text(reader: Any) -> str:
+    try:
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    except _parse_errors() as e:
+        raise PdfParseError(f"unreadable PDF text: {e}") from e
+
+
+def _normalize_text(text: str) -> str:
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _run_tool(args: list[str]) -> subprocess.CompletedProcess[bytes] | None:
+    if shutil.which(args[0]) is None:
+        return None
+    try:
+        proc = subprocess.run(
+            args, capture_output=True, timeout=PDF_TOOL_TIMEOUT_SECONDS, check=False
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        logger.warning("%s failed", args[0], exc_info=True)
+        return None
+    return proc if proc.returncode == 0 else None
+
+
+def extract_pdf_facts(data: bytes) -> dict[str, Any]:
+    """
+    Page count, searchable text and a first-page PNG thumbnail of one PDF.
+
+    The file is parsed with pypdf (page count; PdfParseError when it is not a
+    readable PDF). Text comes from `pdftotext` and the thumbnail from
+    `pdftoppm` (poppler-utils) when installed; without them the text comes
+    from pypdf and there is no thumbnail.
+    """
+    reader = _open_pdf(data)
+    facts: dict[str, Any] = {
+        "page_count": len(reader.pages),
+        "text": None,
+        "thumbnail": None,
+    }
+
+    with tempfile.TemporaryDirectory(prefix="rentpro-pdf-") as tmp:
+        src = Path(tmp) / "in.pdf"
+        src.write_bytes(data)
+
+        proc = _run_tool(["pdftotext", "-enc", "UTF-8", str(src), "-"])
+        if proc is not None:
+            text = proc.stdout.decode("utf-8", "replace")
+        else:
+            text = _reader_text(reader)
+        facts["text"] = _normalize_text(text)[:PDF_TEXT_MAX_CHARS]
+
+        proc = _run_tool(
+            [
+                "pdftoppm",
+                "-png",
+                "-singlefile",
+                "-f",
+                "1",
+                "-l",
+                "1",
+                "-scale-to-x",
+                str(PDF_THUMBNAIL_WIDTH),
+                "-scale-to-y",
+                "-1",
+                str(src),
+                str(Path(tmp) / "thumb"),
+            ]
+        )
+        thumb = Path(tmp) / "thumb.png"
+        if proc is not None and thumb.is_file():
+            facts["thumbnail"] = thumb.read_bytes()
+
+    return facts
+
+
+# ---------------------------------------------------------------------------
+# Ingestion
+# ---------------------------------------------------------------------------
+
+
+def ingest_pdf(db: Session, pdf_key: str) -> PdfDocument:
+    """
+    Extract and store facts for one stored PDF; no-op if already ingested.
+
+    Only a PDF that cannot be parsed is recorded as FAILED (for good). Storage,
+    disk or worker errors propagate without a row, so the pdf_ingest job
+    tries the file again on its next run.
+    """
+    doc = db.get(PdfDocument, pdf_key)
+    if doc is not None:
+        return doc
+
+    storage = get_storage()
+    try:
+        facts = call_cpu_bound(
+            extract_pdf_facts, storage.read(pdf_storage_key(pdf_key))
+        )
+    except PdfParseError as e:
+        logger.warning("PDF ingestion failed for %s", pdf_key, exc_info=True)
+        doc = PdfDocument(
+            pdf_file=pdf_key, status=PdfDocumentStatus.FAILED, error=str(e)[:500]
+        )
+    else:
+        thumb = None
+        if facts["thumbnail"]:
+            thumb = thumbnail_key(pdf_key)
+            storage.put(thumb, facts["thumbnail"], content_type="image/png")
+        doc = PdfDocument(
+            pdf_file=pdf_key,
+            status=PdfDocumentStatus.READY,
+            page_count=facts["page_count"],
+            thumbnail=thumb,
+            text=facts["text"],
+        )
+
+    db.add(doc)
+    try:
+        db.commit()
+    except IntegrityError:
+        # ingested concurrently (same blob, another contract or worker)
+        db.rollback()
+        doc = db.get(PdfDocument, pdf_key)
+    return doc
+
+
+def ingest_pending(db: Session, *, limit: int = 50) -> int:
+    """
+    Ingest contract PDFs that have no pdf_documents row yet (the catch-up job).
+    Returns how many were ingested; files that hit a transient error are
+    logged and left for the next run.
+    """
+    keys = (
+        db.execute(
+            select(Contract.pdf_file)
+            .where(
+                Contract.pdf_file.is_not(None),
+                ~exists().where(PdfDocument.pdf_file == Contract.pdf_file),
+            )
+            .distinct()
+            .limit(limit)
+        )
+        .scalars()
+        .all()
+    )
+    done = 0
+    for key in keys:
+        try:
+            ingest_pdf(db, key)
+        except Exception:
+            db.rollback()
+            logger.warning("PDF ingestion deferred for %s", key, exc_info=True)
+            continue
+        done += 1
+    return done
+
+
+def ingest_after_upload(pdf_key: str) -> None:
+    """Background task run after upload_contract_pdf commits."""
+    db = SessionLocal()
+    try:
+        ingest_pdf(db, pdf_key)
+    except Exception:
+        # transient failure, nothing stored: the pdf_ingest job retries it
+        logger.exception("PDF ingestion failed for %s", pdf_key)
+    finally:
+        db.close()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import functools
+import inspect
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+
+# Opt-in: nothing in this module touches the request path unless enabled.
+# Read once at import so disabled workers do not even wrap endpoints.
+PROFILING_ENABLED = os.getenv("RENTPRO_PROFILING_ENABLED", "").strip() == "1"
+
+MAX_SAMPLE_SECONDS = 60.0
+
+# Profilers collected for the current `?profile=1` request. Set by
+# ProfilingMiddleware; copied into the threadpool together with the context.
+_profiles_ctx: contextvars.ContextVar[list[cProfile.Profile] | None] = (
+    contextvars.ContextVar("rentpro_profiles", default=None)
+)
+
+# cProfile hooks are per thread: two overlapping `?profile=1` requests would
+# fight over the event-loop thread's profiler, so only one runs at a time.
+_request_profile_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Sampling profiler (whole worker, N seconds)
+# ---------------------------------------------------------------------------
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    # keep labels short and stable: app code relative to the package root
+    marker = f"{os.sep}app{os.sep}"
+    if marker in filename:
+        filename = "app" + os.sep + filename.split(marker, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def sample_stacks(
+    seconds: float, *, interval: float = 0.005, include_idle: bool = False
+) -> Counter[str]:
+    """
+    Sample the stacks of every thread in this process for `seconds`.
+
+    Returns collapsed stacks ("root;child;leaf" -> samples), the input format of
+    flamegraph.pl / speedscope / inferno. Thread-based: the calling thread
+    polls sys._current_frames(), so no signal handlers are installed and it
+    works from any worker thread.
+    """
+    seconds = max(0.0, min(float(seconds), MAX_SAMPLE_SECONDS))
+    interval = max(0.001, float(interval))
+    me = threading.get_ident()
+    names = {t.ident: t.name for t in threading.enumerate()}
+
+    stacks: Counter[str] = Counter()
+    deadline = time.monotonic() + seconds
+    while True:
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            labels: list[str] = []
+            f = frame
+            while f is not None:
+                labels.append(_frame_label(f))
+                f = f.f_back
+            if not include_idle and _is_idle(labels[0] if labels else ""):
+                continue
+            thread = names.get(ident) or f"thread-{ident}"
+            stacks[";".join([thread, *reversed(labels)])] += 1
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(interval)
+    return stacks
+
+
+_IDLE_LEAVES = ("wait (threading.py", "select (selectors.py", "_worker (thread.py")
+
+
+def _is_idle(leaf: str) -> bool:
+    return leaf.startswith(_IDLE_LEAVES)
+
+
+def render_collapsed(stacks: Counter[str]) -> str:
+    return "".join(f"{stack} {n}\n" for stack, n in stacks.most_common())
+
+
+# ---------------------------------------------------------------------------
+# Per-request cProfile (`?profile=1`, admins only)
+# ---------------------------------------------------------------------------
+
+
+def _profiled(fn: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiles = _profiles_ctx.get()
+        if profiles is None:
+            return fn(*args, **kwargs)
+        prof = cProfile.Profile()
+        profiles.append(prof)
+        prof.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            prof.disable()
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """
+    APIRoute that lets `?profile=1` capture sync endpoints.
+
+    Sync handlers run in the threadpool, out of reach of a profiler enabled in
+    the middleware (cProfile is per thread), so they are wrapped to enable their
+    own profiler when the request asked for one. With profiling disabled the
+    endpoint is registered unwrapped.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        if PROFILING_ENABLED and not inspect.iscoroutinefunction(endpoint):
+            endpoint = _profiled(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _is_admin_request(request: Request) -> bool:
+    from app.core.utils import is_admin
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return is_admin(request, db)
+    finally:
+        db.close()
+
+
+def render_profiles(
+    profiles: list[cProfile.Profile], *, sort: str = "cumulative", limit: int = 60
+) -> str:
+    profiles = [p for p in profiles if p.getstats()]
+    if not profiles:
+        return "no profile data\n"
+    out = io.StringIO()
+    stats = pstats.Stats(profiles[0], stream=out)
+    for p in profiles[1:]:
+        stats.add(p)
+    try:
+        stats.sort_stats(sort)
+    except KeyError:
+        stats.sort_stats("cumulative")
+    stats.print_stats(limit)
+    return out.getvalue()
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """
+    `?profile=1` on any request by an admin returns a cProfile report (text)
+    instead of the normal response. The original status is kept in the
+    X-Profiled-Status header.
+
+    The event-loop part is profiled in the middleware (this also catches async
+    handlers; other coroutines that run meanwhile show up too), sync handlers
+    through ProfiledRoute. Only installed when RENTPRO_PROFILING_ENABLED=1.
+    """
+
+    def __init__(  # type: ignore[no-untyped-def]
+        self, app, authorize: Callable[[Request], bool] | None = None
+    ):
+        super().__init__(app)
+        self._authorize = authorize or _is_admin_request
+
+    async def dispatch(self, request: Request, call_next):  # type: ignore[no-untyped-def]
+        if request.query_params.get("profile") != "1":
+            return await call_next(request)
+        if not self._authorize(request):
+            return await call_next(request)
+        if not _request_profile_lock.acquire(blocking=False):
+            return PlainTextResponse("Another profile is in progress", status_code=409)
+
+        profiles: list[cProfile.Profile] = []
+        token = _profiles_ctx.set(profiles)
+        loop_prof = cProfile.Profile()
+        profiles.append(loop_prof)
+        loop_prof.enable()
+        try:
+            response = await call_next(request)
+            # drain the body so streaming work is part of the profile
+            async for _ in response.body_iterator:
+                pass
+        finally:
+            loop_prof.disable()
+            _profiles_ctx.reset(token)
+            _request_profile_lock.release()
+
+        sort = request.query_params.get("profile_sort") or "cumulative"
+        return PlainTextResponse(
+            render_profiles(profiles, sort=sort),
+            headers={"X-Profiled-Status": str(response.status_code)},
+        )
@@ -0,0 +1,483 @@
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Iterable
+
+from fastapi import Request
+from starlette.responses import Response
+
+from app.core.config import env_float
+from app.core.observability import InMemoryMetrics
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# (name, sorted label pairs) -> value
+Samples = dict[tuple[str, tuple[tuple[str, str], ...]], float]
+
+# family -> (type, help)
+_FAMILIES: dict[str, tuple[str, str]] = {
+    "rentpro_uptime_seconds": ("gauge", "Seconds since the worker started."),
+    "rentpro_http_responses_total": ("counter", "HTTP responses by status code."),
+    "rentpro_http_requests_total": (
+        "counter",
+        "HTTP requests by method and route template.",
+    ),
+    "rentpro_http_request_duration_seconds": (
+        "histogram",
+        "HTTP request latency by method and route template.",
+    ),
+    "rentpro_db_queries_total": (
+        "counter",
+        "SQL statements executed by method and route template.",
+    ),
+    "rentpro_db_query_seconds_total": (
+        "counter",
+        "Time spent in SQL statements by method and route template.",
+    ),
+    "rentpro_cache_requests_total": (
+        "counter",
+        "In-process cache lookups by cache and result (hit/miss).",
+    ),
+    "rentpro_cache_hit_ratio": ("gauge", "hits / (hits + misses) per cache."),
+    "rentpro_job_runs_total": (
+        "counter",
+        "Background job runs by job and outcome (ok/failed/locked/running).",
+    ),
+    "rentpro_job_seconds_total": (
+        "counter",
+        "Time spent in background job runs by job and outcome.",
+    ),
+    "rentpro_db_pool_checkouts": (
+        "gauge",
+        "Connections checked out of the pool since the worker started.",
+    ),
+    "rentpro_db_pool_checkout_timeouts": (
+        "gauge",
+        "Checkouts that gave up after RENTPRO_DB_POOL_TIMEOUT.",
+    ),
+    "rentpro_db_pool_checkout_wait_ms_total": (
+        "gauge",
+        "Total time spent waiting for a pooled connection (ms).",
+    ),
+    "rentpro_db_pool_checkout_wait_ms_max": (
+        "gauge",
+        "Longest wait for a pooled connection (ms).",
+    ),
+}
+
+_HISTOGRAM_SUFFIXES = ("_bucket", "_sum", "_count")
+
+
+def _multiproc_dir() -> Path | None:
+    raw = (os.getenv("RENTPRO_METRICS_MULTIPROC_DIR") or "").strip()
+    return Path(raw) if raw else None
+
+
+def _flush_interval() -> float:
+    return env_float("RENTPRO_METRICS_FLUSH_SECONDS", 1.0, minimum=0.1)
+
+
+def _labels(**kw: str) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted(kw.items()))
+
+
+def collect_samples(metrics: InMemoryMetrics) -> tuple[Samples, Samples]:
+    """
+    Flatten an InMemoryMetrics store into Prometheus samples.
+
+    Returns (counters, gauges). Counter-like samples (including histogram
+    buckets, which are emitted cumulatively) are additive across processes;
+    gauges are per process.
+    """
+    data = metrics.collect()
+    bounds = metrics.bucket_bounds_ms
+
+    counters: Samples = {}
+    for status, n in data["by_status"].items():
+        counters[("rentpro_http_responses_total", _labels(status=status))] = n
+
+    for (method, route), s in data["series"].items():
+        base = _labels(method=method, route=route)
+        counters[("rentpro_http_requests_total", base)] = s["count"]
+        counters[("rentpro_db_queries_total", base)] = s["db_queries"]
+        counters[("rentpro_db_query_seconds_total", base)] = s["db_ms"] / 1000.0
+
+        cumulative = 0
+        for i, n in enumerate(s["buckets"]):
+            cumulative += n
+            le = _format_value(bounds[i] / 1000.0) if i < len(bounds) else "+Inf"
+            key = ("rentpro_http_request_duration_seconds_bucket", _with(base, le=le))
+            counters[key] = cumulative
+        counters[("rentpro_http_request_duration_seconds_sum", base)] = (
+            s["sum_ms"] / 1000.0
+        )
+        counters[("rentpro_http_request_duration_seconds_count", base)] = cumulative
+
+    for cache, (hits, misses) in data["caches"].items():
+        counters[
+            ("rentpro_cache_requests_total", _labels(cache=cache, result="hit"))
+        ] = hits
+        counters[
+            ("rentpro_cache_requests_total", _labels(cache=cache, result="miss"))
+        ] = misses
+
+    for (job, outcome), (runs, ms) in data["jobs"].items():
+        labels = _labels(job=job, outcome=outcome)
+        counters[("rentpro_job_runs_total", labels)] = runs
+        counters[("rentpro_job_seconds_total", labels)] = ms / 1000.0
+
+    gauges: Samples = {("rentpro_uptime_seconds", ()): data["uptime_seconds"]}
+    for name, value in data["gauges"].items():
+        gauges[(name, ())] = float(value)
+
+    return counters, gauges
+
+
+def _with(
+    labels: tuple[tuple[str, str], ...], **extra: str
+) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((*labels, *extra.items())))
+
+
+def _derive_cache_ratios(counters: Samples) -> Samples:
+    totals: dict[str, list[float]] = {}
+    for (name, labels), value in counters.items():
+        if name != "rentpro_cache_requests_total":
+            continue
+        lbl = dict(labels)
+        t = totals.setdefault(lbl["cache"], [0.0, 0.0])
+        t[0 if lbl["result"] == "hit" else 1] += value
+
+    return {
+        ("rentpro_cache_hit_ratio", _labels(cache=cache)): hits / (hits + misses)
+        for cache, (hits, misses) in totals.items()
+        if hits + misses > 0
+    }
+
+
+def _format_value(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    if math.isnan(v):
+        return "NaN"
+    if float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _family(name: str) -> str:
+    if name in _FAMILIES:
+        return name
+    for suffix in _HISTOGRAM_SUFFIXES:
+        if name.endswith(suffix) and name[: -len(suffix)] in _FAMILIES:
+            return name[: -len(suffix)]
+    return name
+
+
+def render(samples: Iterable[Samples]) -> str:
+    """
+    Render samples in the Prometheus text exposition format (version 0.0.4).
+    """
+    by_family: dict[str, list[tuple[str, tuple[tuple[str, str], ...], float]]] = {}
+    for group in samples:
+        for (name, labels), value in group.items():
+            by_family.setdefault(_family(name), []).append((name, labels, value))
+
+    lines: list[str] = []
+    for family in sorted(by_family):
+        kind, help_text = _FAMILIES.get(family, ("gauge", family))
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {kind}")
+        for name, labels, value in sorted(by_family[family], key=_sort_key):
+            if labels:
+                rendered = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels)
+                lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+            else:
+                lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _sort_key(sample: tuple[str, tuple[tuple[str, str], ...], float]):  # type: ignore[no-untyped-def]
+    name, labels, _ = sample
+    # keep histogram buckets in numeric `le` order
+    plain = tuple((k, v) for k, v in labels if k != "le")
+    le = dict(labels).get("le")
+    le_order = math.inf if le in (None, "+Inf") else float(le)
+    return (plain, name, le_order)
+
+
+# ---------------------------------------------------------------------------
+# Multiprocess mode
+# ---------------------------------------------------------------------------
+
+_INITIAL_MMAP_SIZE = 1 << 16
+
+
+def _read_all_values(data: bytes, used: int) -> Iterable[tuple[str, float, int]]:
+    pos = 8
+    while pos < used:
+        (encoded_len,) = struct.unpack_from("i", data, pos)
+        pos += 4
+        encoded = data[pos : pos + encoded_len]
+        pos += encoded_len + (8 - (encoded_len + 4) % 8)
+        (value,) = struct.unpack_from("d", data, pos)
+        yield encoded.decode("utf-8"), value, pos
+        pos += 8
+
+
+class _MmapedDict:
+    """
+    Append-only str -> float64 map backed by a memory-mapped file.
+
+    Same layout as prometheus_client's multiprocess files: an 8-byte header
+    holding the used size, then entries of [int32 len][key, padded][float64].
+    Values are updated in place, so readers never see a half-written file.
+    """
+
+    def __init__(self, filename: Path) -> None:
+        self._f = open(filename, "a+b")
+        capacity = os.fstat(self._f.fileno()).st_size
+        if capacity == 0:
+            self._f.truncate(_INITIAL_MMAP_SIZE)
+            capacity = _INITIAL_MMAP_SIZE
+        self._capacity = capacity
+        self._m = mmap.mmap(self._f.fileno(), self._capacity)
+
+        self._positions: dict[str, int] = {}
+        self._used = struct.unpack_from("i", self._m, 0)[0]
+        if self._used == 0:
+            self._used = 8
+            struct.pack_into("i", self._m, 0, self._used)
+        else:
+            for key, _, pos in _read_all_values(self._m, self._used):
+                self._positions[key] = pos
+
+    def _init_value(self, key: str) -> None:
+        encoded = key.encode("utf-8")
+        padded = encoded + b" " * (8 - (len(encoded) + 4) % 8)
+        entry = struct.pack(f"i{len(padded)}sd", len(encoded), padded, 0.0)
+        if self._used + len(entry) > self._capacity:
+            while self._used + len(entry) > self._capacity:
+                self._capacity *= 2
+            # Windows refuses to resize a file while a view of it is open
+            self._m.close()
+            self._f.truncate(self._capacity)
+            self._m = mmap.mmap(self._f.fileno(), self._capacity)
+        self._m[self._used : self._used + len(entry)] = entry
+        self._used += len(entry)
+        struct.pack_into("i", self._m, 0, self._used)
+        self._positions[key] = self._used - 8
+
+    def write_value(self, key: str, value: float) -> None:
+        if key not in self._positions:
+            self._init_value(key)
+        struct.pack_into("d", self._m, self._positions[key], float(value))
+
+    def close(self) -> None:
+        self._m.close()
+        self._f.close()
+
+
+def _encode_key(name: str, labels: tuple[tuple[str, str], ...]) -> str:
+    return json.dumps([name, list(labels)], separators=(",", ":"))
+
+
+def _decode_key(key: str) -> tuple[str, tuple[tuple[str, str], ...]]:
+    name, labels = json.loads(key)
+    return name, tuple((k, v) for k, v in labels)
+
+
+def _pid_alive_windows(pid: int) -> bool:
+    # os.kill(pid, 0) on Windows sends CTRL_C_EVENT instead of probing
+    import ctypes
+    from ctypes import wintypes
+
+    process_query_limited_information = 0x1000
+    still_active = 259
+    error_invalid_parameter = 87  # no such process
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    handle = kernel32.OpenProcess(process_query_limited_information, False, pid)
+    if not handle:
+        # e.g. access denied: the process exists
+        return ctypes.get_last_error() != error_invalid_parameter
+    try:
+        code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True
+        return code.value == still_active
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if sys.platform == "win32":
+        return _pid_alive_windows(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # EPERM: exists but belongs to someone else; anything else: assume alive
+        return True
+    return True
+
+
+class MultiprocessStore:
+    """
+    Per-worker mmap files under RENTPRO_METRICS_MULTIPROC_DIR.
+
+    Each worker periodically writes its absolute totals to
+    counter_<pid>.db / gauge_<pid>.db; any worker answering a scrape sums
+    counters across all files (dead workers included, so totals stay
+    monotonic) and reports gauges of live workers with a `pid` label.
+
+    The directory must be emptied before the server starts (same contract as
+    prometheus_client's PROMETHEUS_MULTIPROC_DIR).
+    """
+
+    def __init__(self, directory: Path, *, pid: int | None = None) -> None:
+        self._dir = directory
+        self._pid = pid if pid is not None else os.getpid()
+        self._lock = threading.Lock()
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._counters = _MmapedDict(self._dir / f"counter_{self._pid}.db")
+        self._gauges = _MmapedDict(self._dir / f"gauge_{self._pid}.db")
+
+    def flush(self, metrics: InMemoryMetrics) -> None:
+        counters, gauges = collect_samples(metrics)
+        with self._lock:
+            for (name, labels), value in counters.items():
+                self._counters.write_value(_encode_key(name, labels), value)
+            for (name, labels), value in gauges.items():
+                self._gauges.write_value(_encode_key(name, labels), value)
+
+    def aggregate(self) -> tuple[Samples, Samples]:
+        counters: Samples = {}
+        gauges: Samples = {}
+
+        for path in glob.glob(str(self._dir / "counter_*.db")):
+            for key, value in _read_file(path):
+                k = _decode_key(key)
+                counters[k] = counters.get(k, 0.0) + value
+
+        for path in glob.glob(str(self._dir / "gauge_*.db")):
+            pid = Path(path).stem.split("_", 1)[1]
+            if not pid.isdigit() or not _pid_alive(int(pid)):
+                continue
+            for key, value in _read_file(path):
+                name, labels = _decode_key(key)
+                gauges[(name, _with(labels, pid=pid))] = value
+
+        return counters, gauges
+
+    def close(self) -> None:
+        with self._lock:
+            self._counters.close()
+            self._gauges.close()
+
+
+def _read_file(path: str) -> list[tuple[str, float]]:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return []
+    if len(data) < 8:
+        return []
+    used = struct.unpack_from("i", data, 0)[0]
+    return [(key, value) for key, value, _ in _read_all_values(data, used)]
+
+
+class _Flusher:
+    def __init__(
+        self, store: MultiprocessStore, metrics: InMemoryMetrics, interval: float
+    ) -> None:
+        self.store = store
+        self._metrics = metrics
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="rentpro-metrics-flush", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.store.flush(self._metrics)
+            except Exception:
+                logger.exception("Metrics flush failed")
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self._interval + 1.0)
+        try:
+            self.store.flush(self._metrics)
+        finally:
+            self.store.close()
+
+
+_flusher: _Flusher | None = None
+
+
+def start_multiprocess_flusher(metrics: InMemoryMetrics) -> bool:
+    """
+    Start the background flush thread if RENTPRO_METRICS_MULTIPROC_DIR is set.
+    Returns True when multiprocess mode is active.
+    """
+    global _flusher
+    directory = _multiproc_dir()
+    if directory is None:
+        return False
+    if _flusher is None:
+        _flusher = _Flusher(MultiprocessStore(directory), metrics, _flush_interval())
+    return True
+
+
+def stop_multiprocess_flusher() -> None:
+    global _flusher
+    if _flusher is not None:
+        _flusher.stop()
+        _flusher = None
+
+
+def wants_prometheus(request: Request, fmt: str | None = None) -> bool:
+    """
+    Prometheus format is selected with ?format=prometheus or by a scraper's
+    Accept header (text/plain / openmetrics); browsers and JSON clients keep
+    getting the JSON snapshot.
+    """
+    if fmt:
+        return fmt.strip().lower() in {"prometheus", "prom", "text"}
+    accept = (request.headers.get("accept") or "").lower()
+    return "text/plain" in accept or "openmetrics" in accept
+
+
+def prometheus_response(metrics: InMemoryMetrics) -> Response:
+    if _flusher is not None:
+        _flusher.store.flush(metrics)
+        counters, gauges = _flusher.store.aggregate()
+    else:
+        counters, gauges = collect_samples(metrics)
+
+    body = render([counters, _derive_cache_ratios(counters), gauges])
+    return Response(content=body, media_type=CONTENT_TYPE_LATEST)
@@ -1,14 +1,27 @@
-from passlib.context import CryptContext
+from __future__ import annotations
 
-pwd_context = CryptContext(
-    schemes=["pbkdf2_sha256"],
-    deprecated="auto",
-)
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@lru_cache(maxsize=1)
+def _pwd_context() -> CryptContext:
+    # passlib loads its hash handlers when the first password is checked, not
+    # when the app is imported (cold start / worker fork)
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        deprecated="auto",
+    )
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Iterable
 
+from sqlalchemy import case, exists, update
 from sqlalchemy.orm import Session
 
 from app.models.contract import Contract, ContractStatus
@@ -92,3 +94,69 @@ def sync_overdue_contracts_global(db: Session, *, today: date | None = None) ->
         sync_property_status(db, pid, today=today)
 
     return len(affected_property_ids)
+
+
+def effective_property_status(today: date):
+    """
+    SQL expression for the status sync_property_status would compute, without
+    writing it (e.g. for exports).
+    """
+    running = exists().where(
+        Contract.property_id == Property.id,
+        Contract.status == ContractStatus.ACTIVE,
+        Contract.start_date <= today,
+        Contract.end_date >= today,
+    )
+    return case(
+        (running, PropertyStatus.RENTED.value),
+        else_=PropertyStatus.AVAILABLE.value,
+    )
+
+
+def effective_contract_status(today: date):
+    """SQL expression for a contract's status once overdue ACTIVE ones expire."""
+    return case(
+        (
+            (Contract.status == ContractStatus.ACTIVE) & (Contract.end_date < today),
+            ContractStatus.EXPIRED.value,
+        ),
+        else_=Contract.status,
+    )
+
+
+def recompute_property_statuses(
+    db: Session,
+    property_ids: Iterable[int],
+    *,
+    today: date | None = None,
+    batch_size: int = 500,
+) -> None:
+    """
+    Set-based equivalent of sync_property_status for many properties: expire
+    their overdue ACTIVE contracts and set RENTED/AVAILABLE with one UPDATE
+    each per batch, then commit once.
+    """
+    today = today or date.today()
+    ids = sorted(set(property_ids))
+    if not ids:
+        return
+
+    for i in range(0, len(ids), batch_size):
+        batch = ids[i : i + batch_size]
+        db.execute(
+            update(Contract)
+            .where(
+                Contract.property_id.in_(batch),
+                Contract.status == ContractStatus.ACTIVE,
+                Contract.end_date < today,
+            )
+            .values(status=ContractStatus.EXPIRED)
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            update(Property)
+            .where(Property.id.in_(batch))
+            .values(status=effective_property_status(today))
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
@@ -0,0 +1,561 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import quote, urlsplit
+from uuid import uuid4
+
+from fastapi import HTTPException
+
+# Where uploads are staged before they get their content address.
+TMP_DIR = "tmp"
+
+S3_MIN_PART_BYTES = 5 * 1024 * 1024  # S3 minimum for all parts but the last
+_EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+
+class StorageError(RuntimeError):
+    """The storage backend refused or failed a request."""
+
+
+def _ensure_within_root(root: Path, target: Path) -> None:
+    root = root.resolve()
+    target = target.resolve()
+    if root not in target.parents and root != target:
+        raise HTTPException(status_code=400, detail="Invalid upload path")
+
+
+def _fsync_dir(path: Path) -> None:
+    # makes the rename itself durable (POSIX); not possible on every platform
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# ---------------------------------------------------------------------------
+# Filesystem
+# ---------------------------------------------------------------------------
+
+
+class _FileWriter:
+    def __init__(self, storage: FilesystemStorage):
+        self.storage = storage
+        self.tmp_path = storage.root / TMP_DIR / f"{uuid4().hex}.tmp"
+        self._f = None
+
+    def open(self) -> None:
+        self.tmp_path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.tmp_path, "wb")
+
+    def write(self, data: bytes) -> None:
+        self._f.write(data)
+
+    def close(self) -> None:
+        if self._f is None:
+            return
+        try:
+            if self.storage.fsync != "none":
+                self._f.flush()
+                os.fsync(self._f.fileno())
+        finally:
+            self._f.close()
+            self._f = None
+
+    def commit(self, key: str) -> None:
+        dest_abs_path = self.storage.local_path(key)
+        if dest_abs_path.exists():
+            # dedup; refresh mtime so GC's grace period covers the new reference
+            os.utime(dest_abs_path)
+            return
+        dest_abs_path.parent.mkdir(parents=True, exist_ok=True)
+        # atomic replace
+        os.replace(self.tmp_path, dest_abs_path)
+        if self.storage.fsync == "full":
+            _fsync_dir(dest_abs_path.parent)
+
+    def discard(self) -> None:
+        self.close()
+        try:
+            if self.tmp_path.exists():
+                self.tmp_path.unlink()
+        except OSError:
+            pass
+
+
+class FilesystemStorage:
+    """Uploads under a local directory (one node, or a shared volume)."""
+
+    name = "filesystem"
+
+    def __init__(self, root: Path, *, fsync: str = "none"):
+        self.root = root
+        self.fsync = fsync
+
+    def local_path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        _ensure_within_root(self.root, path)
+        return path
+
+    def writer(self) -> _FileWriter:
+        return _FileWriter(self)
+
+    def exists(self, key: str) -> bool:
+        return self.local_path(key).is_file()
+
+    def read(self, key: str) -> bytes:
+        return self.local_path(key).read_bytes()
+
+    def put(self, key: str, data: bytes, *, content_type: str) -> None:
+        """Store a small derived file (e.g. a thumbnail) in one go."""
+        path = self.local_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / TMP_DIR / f"{uuid4().hex}.tmp"
+        tmp_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str) -> None:
+        self.local_path(key).unlink(missing_ok=True)
+
+    def list_keys(self, prefix: str) -> Iterator[tuple[str, float]]:
+        """(key, mtime) of every stored file under `prefix`."""
+        base = self.root / prefix
+        if not base.is_dir():
+            return
+        for path in base.rglob("*"):
+            try:
+                if path.is_file():
+                    yield path.relative_to(self.root).as_posix(), path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+
+    def presigned_url(
+        self, key: str, *, media_type: str, filename: str | None = None
+    ) -> str | None:
+        # served by the API (or the proxy, see RENTPRO_FILE_OFFLOAD)
+        return None
+
+
+# ---------------------------------------------------------------------------
+# S3-compatible (AWS S3, MinIO, ...), signed with SigV4 over plain HTTP(S)
+# ---------------------------------------------------------------------------
+
+
+def _uri_encode(value: str, *, safe: str = "-_.~") -> str:
+    return quote(value, safe=safe)
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _xml_text(root: ET.Element, name: str) -> str | None:
+    for el in root.iter():
+        if _local_name(el.tag) == name:
+            return el.text
+    return None
+
+
+def _error_code(data: bytes) -> str | None:
+    try:
+        doc = ET.fromstring(data)
+    except ET.ParseError:
+        return None
+    return _xml_text(doc, "Code") if _local_name(doc.tag) == "Error" else None
+
+
+class _S3Writer:
+    """
+    Buffers up to one part in memory. Small uploads become a single PUT to
+    the final key; larger ones a multipart upload to a tmp/ key that is
+    copied to its content address once the digest is known.
+    """
+
+    def __init__(self, storage: S3Storage):
+        self.storage = storage
+        self.tmp_key = f"{TMP_DIR}/{uuid4().hex}.tmp"
+        self._buf = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[tuple[int, str]] = []
+        self._tmp_written = False
+
+    def open(self) -> None:
+        pass
+
+    def write(self, data: bytes) -> None:
+        self._buf += data
+        part = self.storage.part_bytes
+        while len(self._buf) >= part:
+            self._send_part(bytes(self._buf[:part]))
+            del self._buf[:part]
+
+    def _send_part(self, data: bytes) -> None:
+        if self._upload_id is None:
+            self._upload_id = self.storage.create_multipart(self.tmp_key)
+        number = len(self._parts) + 1
+        etag = self.storage.upload_part(self.tmp_key, self._upload_id, number, data)
+        self._parts.append((number, etag))
+
+    def close(self) -> None:
+        pass
+
+    def commit(self, key: str) -> None:
+        s3 = self.storage
+        if s3.exists(key):
+            # dedup; refresh LastModified so GC's grace period covers it
+            s3.touch(key)
+            return
+        if self._upload_id is None:
+            s3.put_object(key, bytes(self._buf))
+            return
+        if self._buf:
+            self._send_part(bytes(self._buf))
+            self._buf.clear()
+        s3.complete_multipart(self.tmp_key, self._upload_id, self._parts)
+        self._upload_id = None
+        self._tmp_written = True
+        s3.copy_object(self.tmp_key, key)
+
+    def discard(self) -> None:
+        try:
+            if self._upload_id is not None:
+                self.storage.abort_multipart(self.tmp_key, self._upload_id)
+                self._upload_id = None
+            if self._tmp_written:
+                self.storage.delete(self.tmp_key)
+                self._tmp_written = False
+        except StorageError:
+            # left for the bucket lifecycle rule / upload GC
+            pass
+
+
+class S3Storage:
+    """
+    S3-compatible object storage. Every node sees the same objects, and PDF
+    downloads are presigned, time-limited GETs straight to the bucket.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        *,
+        bucket: str,
+        endpoint_url: str,
+        region: str,
+        access_key_id: str,
+        secret_access_key: str,
+        session_token: str | None = None,
+        prefix: str = "",
+        addressing: str = "path",
+        public_url: str | None = None,
+        part_bytes: int = 8 * 1024 * 1024,
+        presign_seconds: int = 300,
+        timeout_seconds: float = 30.0,
+    ):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.public_url = (public_url or endpoint_url).rstrip("/")
+        self.region = region
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.session_token = session_token
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.addressing = addressing
+        self.part_bytes = max(S3_MIN_PART_BYTES, part_bytes)
+        self.presign_seconds = presign_seconds
+        self.timeout_seconds = timeout_seconds
+
+    # -- signing -----------------------------------------------------------
+
+    def _location(self, base_url: str, key: str | None) -> tuple[str, str, str]:
+        """(scheme://host, host, canonical path) for an object or the bucket."""
+        parts = urlsplit(base_url)
+        host = parts.netloc
+        path = parts.path.rstrip("/")
+        if self.addressing == "virtual":
+            host = f"{self.bucket}.{host}"
+        else:
+            path += "/" + _uri_encode(self.bucket)
+        if key is not None:
+            path += "/" + _uri_encode(self.prefix + key, safe="/-_.~")
+        return f"{parts.scheme}://{host}", host, path or "/"
+
+    def _signing_key(self, day: str) -> bytes:
+        k = _hmac(("AWS4" + self.secret_access_key).encode(), day)
+        k = _hmac(k, self.region)
+        k = _hmac(k, "s3")
+        return _hmac(k, "aws4_request")
+
+    def _signature(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, str],
+        headers: dict[str, str],
+        payload_hash: str,
+        now: datetime,
+    ) -> tuple[str, str]:
+        """(signed header names, signature) for a request."""
+        canonical_query = "&".join(
+            f"{_uri_encode(k)}={_uri_encode(v)}" for k, v in sorted(query.items())
+        )
+        names = sorted(h.lower() for h in headers)
+        lowered = {k.lower(): " ".join(str(v).split()) for k, v in headers.items()}
+        canonical_headers = "".join(f"{n}:{lowered[n]}\n" for n in names)
+        signed_headers = ";".join(names)
+        canonical_request = "\n".join(
+            [
+                method,
+                path,
+                canonical_query,
+                canonical_headers,
+                signed_headers,
+                payload_hash,
+            ]
+        )
+        day = now.strftime("%Y%m%d")
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                now.strftime("%Y%m%dT%H%M%SZ"),
+                f"{day}/{self.region}/s3/aws4_request",
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            ]
+        )
+        signature = hmac.new(
+            self._signing_key(day), string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
+        return signed_headers, signature
+
+    def presign(
+        self,
+        method: str,
+        key: str,
+        *,
+        expires: int,
+        query: dict[str, str] | None = None,
+        now: datetime | None = None,
+    ) -> str:
+        now = now or datetime.now(timezone.utc)
+        origin, host, path = self._location(self.public_url, key)
+        q = dict(query or {})
+        q.update(
+            {
+                "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+                "X-Amz-Credential": (
+                    f"{self.access_key_id}/{now:%Y%m%d}/{self.region}/s3/aws4_request"
+                ),
+                "X-Amz-Date": now.strftime("%Y%m%dT%H%M%SZ"),
+                "X-Amz-Expires": str(expires),
+                "X-Amz-SignedHeaders": "host",
+            }
+        )
+        if self.session_token:
+            q["X-Amz-Security-Token"] = self.session_token
+        _, signature = self._signature(
+            method, path, q, {"host": host}, "UNSIGNED-PAYLOAD", now
+        )
+        q["X-Amz-Signature"] = signature
+        query_string = "&".join(
+            f"{_uri_encode(k)}={_uri_encode(v)}" for k, v in sorted(q.items())
+        )
+        return f"{origin}{path}?{query_string}"
+
+    # -- requests ----------------------------------------------------------
+
+    def _request(
+        self,
+        method: str,
+        key: str | None,
+        *,
+        query: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+        body: bytes = b"",
+    ) -> tuple[int, dict[str, str], bytes]:
+        now = datetime.now(timezone.utc)
+        origin, host, path = self._location(self.endpoint_url, key)
+        query = query or {}
+        payload_hash = hashlib.sha256(body).hexdigest() if body else _EMPTY_SHA256
+        hdrs = dict(headers or {})
+        hdrs.update(
+            {
+                "host": host,
+                "x-amz-content-sha256": payload_hash,
+                "x-amz-date": now.strftime("%Y%m%dT%H%M%SZ"),
+            }
+        )
+        if self.session_token:
+            hdrs["x-amz-security-token"] = self.session_token
+        signed_headers, signature = self._signature(
+            method, path, query, hdrs, payload_hash, now
+        )
+        hdrs["Authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key_id}/{now:%Y%m%d}/"
+            f"{self.region}/s3/aws4_request, SignedHeaders={signed_headers}, "
+            f"Signature={signature}"
+        )
+        url = origin + path
+        if query:
+            url += "?" + "&".join(
+                f"{_uri_encode(k)}={_uri_encode(v)}" if v else _uri_encode(k)
+                for k, v in sorted(query.items())
+            )
+        hdrs.pop("host")
+        req = urllib.request.Request(
+            url, data=body if method in {"PUT", "POST"} else None, method=method
+        )
+        for k, v in hdrs.items():
+            req.add_header(k, v)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout_seconds) as resp:
+                status, resp_headers, data = (
+                    resp.status,
+                    dict(resp.headers),
+                    resp.read(),
+                )
+        except urllib.error.HTTPError as e:
+            status, resp_headers, data = e.code, dict(e.headers), e.read()
+        except OSError as e:
+            raise StorageError(f"S3 {method} {key or ''} failed: {e}") from e
+        if status >= 300 and not (method == "HEAD" and status == 404):
+            raise StorageError(
+                f"S3 {method} {key or ''} -> {status} {_error_code(data) or ''}"
+            )
+        if method == "POST" or "x-amz-copy-source" in hdrs:
+            # multipart completion and copies can report failure in a 200 body
+            code = _error_code(data)
+            if code:
+                raise StorageError(f"S3 {method} {key or ''} failed: {code}")
+        return status, resp_headers, data
+
+    def put_object(
+        self, key: str, data: bytes, *, content_type: str = "application/pdf"
+    ) -> None:
+        self._request("PUT", key, headers={"content-type": content_type}, body=data)
+
+    def create_multipart(self, key: str) -> str:
+        _, _, data = self._request(
+            "POST",
+            key,
+            query={"uploads": ""},
+            headers={"content-type": "application/pdf"},
+        )
+        upload_id = _xml_text(ET.fromstring(data), "UploadId")
+        if not upload_id:
+            raise StorageError("S3 did not return an UploadId")
+        return upload_id
+
+    def upload_part(self, key: str, upload_id: str, number: int, data: bytes) -> str:
+        _, headers, _ = self._request(
+            "PUT",
+            key,
+            query={"partNumber": str(number), "uploadId": upload_id},
+            body=data,
+        )
+        etag = {k.lower(): v for k, v in headers.items()}.get("etag")
+        if not etag:
+            raise StorageError("S3 did not return a part ETag")
+        return etag
+
+    def complete_multipart(
+        self, key: str, upload_id: str, parts: list[tuple[int, str]]
+    ) -> None:
+        body = "".join(
+            f"<Part><PartNumber>{n}</PartNumber><ETag>{etag}</ETag></Part>"
+            for n, etag in parts
+        )
+        self._request(
+            "POST",
+            key,
+            query={"uploadId": upload_id},
+            body=f"<CompleteMultipartUpload>{body}</CompleteMultipartUpload>".encode(),
+        )
+
+    def abort_multipart(self, key: str, upload_id: str) -> None:
+        self._request("DELETE", key, query={"uploadId": upload_id})
+
+    def copy_object(
+        self, src_key: str, dest_key: str, *, replace: bool = False
+    ) -> None:
+        source = quote(f"/{self.bucket}/{self.prefix}{src_key}", safe="/-_.~")
+        headers = {"x-amz-copy-source": source}
+        if replace:
+            headers.update(
+                {
+                    "x-amz-metadata-directive": "REPLACE",
+                    "content-type": "application/pdf",
+                }
+            )
+        self._request("PUT", dest_key, headers=headers)
+
+    def touch(self, key: str) -> None:
+        # S3 has no utime; an in-place copy with new metadata resets LastModified
+        self.copy_object(key, key, replace=True)
+
+    def writer(self) -> _S3Writer:
+        return _S3Writer(self)
+
+    def exists(self, key: str) -> bool:
+        status, _, _ = self._request("HEAD", key)
+        return status == 200
+
+    def read(self, key: str) -> bytes:
+        _, _, data = self._request("GET", key)
+        return data
+
+    def put(self, key: str, data: bytes, *, content_type: str) -> None:
+        self.put_object(key, data, content_type=content_type)
+
+    def delete(self, key: str) -> None:
+        self._request("DELETE", key)
+
+    def list_keys(self, prefix: str) -> Iterator[tuple[str, float]]:
+        """(key, LastModified) of every object under `prefix` (ListObjectsV2)."""
+        token: str | None = None
+        while True:
+            query = {"list-type": "2", "prefix": self.prefix + prefix}
+            if token:
+                query["continuation-token"] = token
+            _, _, data = self._request("GET", None, query=query)
+            doc = ET.fromstring(data)
+            for item in doc:
+                if _local_name(item.tag) != "Contents":
+                    continue
+                key = _xml_text(item, "Key") or ""
+                modified = _xml_text(item, "LastModified") or ""
+                yield (
+                    key[len(self.prefix) :],
+                    datetime.fromisoformat(modified.replace("Z", "+00:00")).timestamp(),
+                )
+            if (_xml_text(doc, "IsTruncated") or "").lower() != "true":
+                return
+            token = _xml_text(doc, "NextContinuationToken")
+
+    def presigned_url(
+        self, key: str, *, media_type: str, filename: str | None = None
+    ) -> str:
+        query = {"response-content-type": media_type}
+        if filename is not None:
+            query["response-content-disposition"] = (
+                f"inline; filename*=utf-8''{quote(filename)}"
+            )
+        return self.presign("GET", key, expires=self.presign_seconds, query=query)
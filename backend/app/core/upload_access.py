@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+
+from app.core.config import env_float
+from app.core.pdf_ingest import THUMB_DIR
+from app.models.contract import Contract
+from app.models.property import Property
+from app.models.role import UserRole
+from app.models.user import User
+
+UPLOAD_ACCESS_CACHE = "upload_access"
+
+
+# GET /uploads/<key> decisions per (user, stored file), per worker, so repeat
+# fetches of a PDF skip the database. Revoked access (contract deleted, PDF
+# replaced, user removed) is honoured by other workers after the TTL.
+# 0 disables the cache.
+UPLOAD_ACCESS_CACHE_SECONDS = env_float(
+    "RENTPRO_UPLOAD_ACCESS_CACHE_SECONDS", 30.0, minimum=0
+)
+_MAX_ENTRIES = 10_000
+
+# (username, key) -> (expires_at, allowed)
+_cache: dict[tuple[str, str], tuple[float, bool]] = {}
+_lock = threading.Lock()
+_observer: Callable[..., None] | None = None
+
+
+def set_cache_observer(observer: Callable[..., None] | None) -> None:
+    """observer(cache_name, hit=bool), e.g. InMemoryMetrics.observe_cache."""
+    global _observer
+    _observer = observer
+
+
+def _observe(hit: bool) -> None:
+    if _observer is not None:
+        try:
+            _observer(UPLOAD_ACCESS_CACHE, hit=hit)
+        except Exception:
+            pass
+
+
+def contract_pdf_files(key: str) -> list[str]:
+    """
+    Contract.pdf_file values that make `key` readable: the PDF itself (older
+    rows hold a bare filename for contracts/<name>) or the PDF of a thumbnail.
+    """
+    if key.startswith(f"{THUMB_DIR}/") and key.endswith(".png"):
+        key = key[len(THUMB_DIR) + 1 : -len(".png")]
+    values = [key]
+    folder, _, name = key.partition("/")
+    if folder == "contracts" and name and "/" not in name:
+        values.append(name)
+    return values
+
+
+def _allowed(db: Session, username: str, key: str) -> bool:
+    user = db.execute(
+        select(User.id, User.role).where(User.username == username)
+    ).first()
+    if user is None:
+        return False
+    refs = select(Contract.id).where(Contract.pdf_file.in_(contract_pdf_files(key)))
+    if user.role != UserRole.ADMIN:
+        refs = refs.join(Contract.property).where(Property.owner_id == user.id)
+    return bool(db.execute(select(exists(refs))).scalar())
+
+
+def can_read_upload(db: Session, username: str, key: str) -> bool:
+    """
+    Whether the user may read the stored file `key`: admins any contract's
+    file, owners files of contracts on their properties (same rule as
+    GET /contracts/{id}/pdf). Anything no contract references is denied.
+    """
+    if UPLOAD_ACCESS_CACHE_SECONDS <= 0:
+        return _allowed(db, username, key)
+
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get((username, key))
+    if entry is not None and entry[0] > now:
+        _observe(True)
+        return entry[1]
+    _observe(False)
+
+    allowed = _allowed(db, username, key)
+    with _lock:
+        if len(_cache) >= _MAX_ENTRIES:
+            for k in [k for k, v in _cache.items() if v[0] <= now]:
+                del _cache[k]
+            if len(_cache) >= _MAX_ENTRIES:
+                _cache.clear()
+        _cache[(username, key)] = (now + UPLOAD_ACCESS_CACHE_SECONDS, allowed)
+    return allowed
+
+
+def invalidate_upload_access_cache(pdf_file: str | None = None) -> None:
+    """Drop this worker's decisions (for one contract PDF and its thumbnail, or all)."""
+    with _lock:
+        if pdf_file is None:
+            _cache.clear()
+            return
+        for k in [k for k in _cache if pdf_file in contract_pdf_files(k[1])]:
+            del _cache[k]
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.storage import TMP_DIR
+from app.core.uploads import BLOB_DIR, blob_digest, get_storage
+from app.models.contract import Contract
+from app.models.pdf_document import PdfDocument
+
+logger = logging.getLogger("rentpro.uploads")
+
+# Blobs are written before the contract row that references them is
+# committed; anything younger than this is never collected.
+DEFAULT_GRACE_SECONDS = 24 * 3600
+
+
+def blob_references(db: Session) -> dict[str, int]:
+    """Reference count per blob path, from Contract.pdf_file."""
+    counts: dict[str, int] = {}
+    rows = db.execute(
+        select(Contract.pdf_file).where(Contract.pdf_file.like(f"{BLOB_DIR}/%"))
+    ).scalars()
+    for rel in rows:
+        counts[rel] = counts.get(rel, 0) + 1
+    return counts
+
+
+def _forget_document(db: Session, storage, key: str) -> None:
+    # ingestion results (and thumbnail) of a removed blob
+    document = db.get(PdfDocument, key)
+    if document is None:
+        return
+    if document.thumbnail:
+        storage.delete(document.thumbnail)
+    db.delete(document)
+
+
+def collect_orphans(
+    db: Session,
+    *,
+    grace_seconds: float = DEFAULT_GRACE_SECONDS,
+    dry_run: bool = False,
+) -> list[str]:
+    """
+    Delete blobs no contract points at (and stale upload temp files) older
+    than `grace_seconds`, in whichever storage backend is configured. Returns
+    the removed keys (paths relative to the upload root).
+    """
+    storage = get_storage()
+    referenced = blob_references(db)
+    cutoff = time.time() - grace_seconds
+
+    candidates = [
+        (key, mtime)
+        for key, mtime in storage.list_keys(f"{BLOB_DIR}/")
+        if blob_digest(key) and key not in referenced
+    ]
+    candidates.extend(storage.list_keys(f"{TMP_DIR}/"))
+
+    removed: list[str] = []
+    for key, mtime in candidates:
+        if mtime > cutoff:
+            continue
+        if not dry_run:
+            storage.delete(key)
+            _forget_document(db, storage, key)
+        removed.append(key)
+    if not dry_run:
+        db.commit()
+
+    if removed:
+        logger.info(
+            "%s %d orphaned upload(s)",
+            "would remove" if dry_run else "removed",
+            len(removed),
+        )
+    return removed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.core.upload_gc",
+        description="Remove uploaded blobs that no contract references.",
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--grace-seconds", type=float, default=DEFAULT_GRACE_SECONDS)
+    args = parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        removed = collect_orphans(
+            db, grace_seconds=args.grace_seconds, dry_run=args.dry_run
+        )
+    finally:
+        db.close()
+    for rel in removed:
+        print(rel)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,13 +1,72 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from uuid import uuid4
+from typing import Any, Callable, TypeVar
 
 from fastapi import HTTPException, UploadFile
 
+from app.core.config import env_int
+from app.core.storage import FilesystemStorage, S3Storage
+
 DEFAULT_MAX_UPLOAD_BYTES = 5 * 1024 * 1024  # 5MB
 
+T = TypeVar("T")
+
+
+# "none": rely on the OS page cache (fastest). "file": fsync the blob before
+# it is published. "full": also fsync its directory so the rename survives a
+# crash.
+UPLOAD_FSYNC = (os.getenv("RENTPRO_UPLOAD_FSYNC") or "none").strip().lower()
+if UPLOAD_FSYNC not in {"none", "file", "full"}:
+    raise RuntimeError(
+        f"RENTPRO_UPLOAD_FSYNC must be none, file or full (got {UPLOAD_FSYNC!r})"
+    )
+UPLOAD_MIN_CHUNK_BYTES = 64 * 1024
+UPLOAD_MAX_CHUNK_BYTES = max(
+    UPLOAD_MIN_CHUNK_BYTES,
+    env_int("RENTPRO_UPLOAD_MAX_CHUNK_BYTES", 256 * 1024, minimum=1),
+)
+UPLOAD_WRITE_BATCH_BYTES = env_int(
+    "RENTPRO_UPLOAD_WRITE_BATCH_BYTES", 256 * 1024, minimum=1
+)
+# Dedicated threads: slow disks then hold up other uploads, not the shared
+# threadpool that sync endpoints run on.
+UPLOAD_IO_THREADS = env_int("RENTPRO_UPLOAD_IO_THREADS", 4, minimum=1)
+
+_io_executor: ThreadPoolExecutor | None = None
+_io_executor_lock = threading.Lock()
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(
+                max_workers=UPLOAD_IO_THREADS, thread_name_prefix="rentpro-upload-io"
+            )
+        return _io_executor
+
+
+async def run_upload_io(fn: Callable[..., T], *args: Any) -> T:
+    """Run blocking upload file I/O on the upload executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_io_executor(), functools.partial(fn, *args))
+
+
+def shutdown_upload_io() -> None:
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is not None:
+            _io_executor.shutdown(wait=True)
+            _io_executor = None
+
 
 def get_upload_root() -> Path:
     """
@@ -25,78 +84,184 @@ def get_upload_root() -> Path:
     return (backend_dir / "uploads").resolve()
 
 
-def _ensure_within_root(root: Path, target: Path) -> None:
-    root = root.resolve()
-    target = target.resolve()
-    if root not in target.parents and root != target:
-        raise HTTPException(status_code=400, detail="Invalid upload path")
+# "filesystem": RENTPRO_UPLOAD_DIR on this node (or a shared volume).
+# "s3": an S3-compatible bucket shared by every node; PDF downloads are
+# presigned URLs to the bucket.
+STORAGE_BACKEND = (os.getenv("RENTPRO_STORAGE_BACKEND") or "filesystem").strip().lower()
+if STORAGE_BACKEND not in {"filesystem", "s3"}:
+    raise RuntimeError(
+        f"RENTPRO_STORAGE_BACKEND must be filesystem or s3 (got {STORAGE_BACKEND!r})"
+    )
+
+_storage: FilesystemStorage | S3Storage | None = None
+
+
+def _s3_storage_from_env() -> S3Storage:
+    bucket = os.getenv("RENTPRO_S3_BUCKET")
+    access_key = os.getenv("RENTPRO_S3_ACCESS_KEY_ID") or os.getenv("AWS_ACCESS_KEY_ID")
+    secret_key = os.getenv("RENTPRO_S3_SECRET_ACCESS_KEY") or os.getenv(
+        "AWS_SECRET_ACCESS_KEY"
+    )
+    if not (bucket and access_key and secret_key):
+        raise RuntimeError(
+            "RENTPRO_STORAGE_BACKEND=s3 needs RENTPRO_S3_BUCKET and "
+            "RENTPRO_S3_ACCESS_KEY_ID / RENTPRO_S3_SECRET_ACCESS_KEY"
+        )
+    region = os.getenv("RENTPRO_S3_REGION") or "us-east-1"
+    addressing = (os.getenv("RENTPRO_S3_ADDRESSING") or "path").strip().lower()
+    if addressing not in {"path", "virtual"}:
+        raise RuntimeError(
+            f"RENTPRO_S3_ADDRESSING must be path or virtual (got {addressing!r})"
+        )
+    return S3Storage(
+        bucket=bucket,
+        endpoint_url=os.getenv("RENTPRO_S3_ENDPOINT_URL")
+        or f"https://s3.{region}.amazonaws.com",
+        region=region,
+        access_key_id=access_key,
+        secret_access_key=secret_key,
+        session_token=os.getenv("AWS_SESSION_TOKEN") or None,
+        prefix=os.getenv("RENTPRO_S3_PREFIX") or "",
+        addressing=addressing,
+        public_url=os.getenv("RENTPRO_S3_PUBLIC_URL") or None,
+        part_bytes=env_int("RENTPRO_S3_PART_BYTES", 8 * 1024 * 1024, minimum=1),
+        presign_seconds=env_int("RENTPRO_S3_PRESIGN_SECONDS", 300, minimum=1),
+    )
+
+
+def get_storage() -> FilesystemStorage | S3Storage:
+    """The configured upload storage backend."""
+    global _storage
+    if _storage is not None:
+        return _storage
+    if STORAGE_BACKEND == "s3":
+        _storage = _s3_storage_from_env()
+        return _storage
+    # cheap; follows RENTPRO_UPLOAD_DIR / UPLOAD_FSYNC changes
+    return FilesystemStorage(get_upload_root(), fsync=UPLOAD_FSYNC)
+
 
+# Content-addressed store: blobs/sha256/<aa>/<sha256>.pdf under the upload
+# root. The same bytes are stored once however many contracts point at them;
+# Contract.pdf_file holds the relative path, so contracts are the references.
+BLOB_DIR = "blobs"
+_BLOB_RE = re.compile(r"^blobs/sha256/[0-9a-f]{2}/([0-9a-f]{64})\.[a-z0-9]+$")
 
-def contract_pdf_destination(contract_id: int) -> tuple[Path, str]:
+
+def pdf_storage_key(pdf_file: str) -> str:
+    """Storage key of a Contract.pdf_file value (older rows hold a bare filename)."""
+    rel = pdf_file.lstrip("/").replace("\\", "/")
+    if "/" not in rel:
+        rel = f"contracts/{rel}"
+    return rel
+
+
+def blob_rel_path(digest: str, suffix: str = ".pdf") -> str:
+    return f"{BLOB_DIR}/sha256/{digest[:2]}/{digest}{suffix}"
+
+
+def blob_digest(rel_path: str | None) -> str | None:
+    """SHA-256 of a content-addressed blob, from its path (None for legacy files)."""
+    if not rel_path:
+        return None
+    m = _BLOB_RE.match(rel_path.lstrip("/").replace("\\", "/"))
+    return m.group(1) if m else None
+
+
+# sniff: PDF files start with "%PDF-"
+_PDF_MAGIC = b"%PDF-"
+
+
+class _BlobWriter:
     """
-    Returns (absolute_dest_path, relative_path_to_store_in_db)
+    Running SHA-256 over a storage writer. Every method does I/O or hashing
+    and runs on the upload I/O executor, never on the event loop.
     """
-    root = get_upload_root()
-    rel_dir = Path("contracts")
-    filename = f"contract_{contract_id}_{uuid4().hex}.pdf"
-    rel_path = rel_dir / filename
-    abs_path = (root / rel_path).resolve()
-    _ensure_within_root(root, abs_path)
-    return abs_path, rel_path.as_posix()
+
+    def __init__(self, storage: FilesystemStorage | S3Storage):
+        self.digest = hashlib.sha256()
+        self._out = storage.writer()
+
+    def open(self) -> None:
+        self._out.open()
+
+    def write(self, data: bytes) -> None:
+        self.digest.update(data)
+        self._out.write(data)
+
+    def close(self) -> None:
+        self._out.close()
+
+    def commit(self) -> str:
+        """Store under the content address (unless already stored) and return it."""
+        rel = blob_rel_path(self.digest.hexdigest())
+        self._out.commit(rel)
+        return rel
+
+    def discard(self) -> None:
+        self._out.discard()
 
 
 async def save_pdf_upload(
     upload: UploadFile,
-    dest_abs_path: Path,
     *,
     max_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
-) -> None:
+) -> str:
     """
-    Streams upload to disk, enforces:
+    Streams upload into the blob store and returns its relative path. Enforces:
       - header content-type sanity
       - PDF magic bytes sniffing
       - max size
-      - atomic write (tmp then replace)
+      - atomic write (tmp then replace), fsync per RENTPRO_UPLOAD_FSYNC
+    The SHA-256 is computed while streaming; already stored bytes are not
+    written again. Reads grow from 64KB up to UPLOAD_MAX_CHUNK_BYTES while the
+    upload keeps filling them; hashing and writes run on the upload I/O
+    executor in batches of UPLOAD_WRITE_BATCH_BYTES.
     """
     # weak signal: Content-Type header
     if upload.content_type not in (None, "", "application/pdf"):
         raise HTTPException(status_code=415, detail="Only application/pdf is allowed")
 
-    dest_abs_path.parent.mkdir(parents=True, exist_ok=True)
-
-    tmp_path = dest_abs_path.with_suffix(dest_abs_path.suffix + ".tmp")
+    writer = _BlobWriter(get_storage())
 
     total = 0
-    seen_header = b""
+    header = b""
+    chunk_size = UPLOAD_MIN_CHUNK_BYTES
+    pending: list[bytes] = []
+    pending_bytes = 0
     try:
-        with open(tmp_path, "wb") as f:
-            while True:
-                chunk = await upload.read(64 * 1024)
-                if not chunk:
-                    break
+        await run_upload_io(writer.open)
+        while True:
+            # never read much past the limit
+            chunk = await upload.read(min(chunk_size, max_bytes - total + 1))
+            if not chunk:
+                break
 
-                if total == 0:
-                    # collect enough bytes to sniff
-                    seen_header = chunk[:8]
+            if len(header) < len(_PDF_MAGIC):
+                # collect enough bytes to sniff
+                header += chunk[: len(_PDF_MAGIC) - len(header)]
 
-                total += len(chunk)
-                if total > max_bytes:
-                    raise HTTPException(status_code=413, detail="File too large")
+            total += len(chunk)
+            if total > max_bytes:
+                raise HTTPException(status_code=413, detail="File too large")
 
-                f.write(chunk)
+            if len(chunk) >= chunk_size:
+                chunk_size = min(chunk_size * 2, UPLOAD_MAX_CHUNK_BYTES)
+            pending.append(chunk)
+            pending_bytes += len(chunk)
+            if pending_bytes >= UPLOAD_WRITE_BATCH_BYTES:
+                await run_upload_io(writer.write, b"".join(pending))
+                pending, pending_bytes = [], 0
 
-        # sniff: PDF files start with "%PDF-"
-        if not seen_header.startswith(b"%PDF-"):
+        if pending:
+            await run_upload_io(writer.write, b"".join(pending))
+        if header != _PDF_MAGIC:
             raise HTTPException(status_code=415, detail="File is not a valid PDF")
 
-        # atomic replace
-        os.replace(tmp_path, dest_abs_path)
+        await run_upload_io(writer.close)
+        return await run_upload_io(writer.commit)
 
     finally:
-        # best-effort cleanup
-        try:
-            if tmp_path.exists():
-                tmp_path.unlink()
-        except OSError:
-            pass
+        # best-effort cleanup (no-op after a successful replace)
+        await run_upload_io(writer.discard)
         await upload.close()
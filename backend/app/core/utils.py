@@ -1,8 +1,11 @@
 from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.models.role import UserRole
+from app.models.user import User
 
 
 def get_current_user_payload(request: Request) -> dict:
@@ -32,8 +35,6 @@ def get_current_user(
     user_payload = get_current_user_payload(request)
     username = user_payload.get("sub")
 
-    from app.models.user import User
-
     user = db.query(User).filter(User.username == username).first()
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
@@ -41,6 +42,21 @@ def get_current_user(
     return user
 
 
+async def get_current_user_async(request: Request, db: AsyncSession):
+    """
+    Async variant of get_current_user (for handlers using get_async_db).
+    """
+    user_payload = get_current_user_payload(request)
+    username = user_payload.get("sub")
+
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    return user
+
+
 def is_admin(request: Request, db: Session) -> bool:
     """
     Returns True if the authenticated user is ADMIN, otherwise False.
@@ -54,8 +70,6 @@ def is_admin(request: Request, db: Session) -> bool:
     if not username:
         return False
 
-    from app.models.user import User
-
     user = db.query(User).filter(User.username == username).first()
     if not user:
         return False
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import env_int
+
+T = TypeVar("T")
+
+
+# 0 = run CPU-bound steps in the threadpool (keeps the event loop free, still
+# shares the GIL); N > 0 = a pool of N worker processes.
+CPU_WORKERS = env_int("RENTPRO_CPU_WORKERS", 0, minimum=0)
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a process that runs threads (uvicorn, DB pools)
+            # is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=CPU_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+async def run_cpu_bound(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a CPU-bound function off the event loop.
+
+    With RENTPRO_CPU_WORKERS > 0, `fn` and its arguments must be picklable
+    (module-level function, plain data).
+    """
+    if CPU_WORKERS > 0:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_executor(), functools.partial(fn, *args, **kwargs)
+        )
+    return await run_in_threadpool(fn, *args, **kwargs)
+
+
+def call_cpu_bound(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Blocking variant of run_cpu_bound for code already off the event loop
+    (threadpool handlers, background tasks, jobs).
+    """
+    if CPU_WORKERS > 0:
+        return _get_executor().submit(fn, *args, **kwargs).result()
+    return fn(*args, **kwargs)
+
+
+def shutdown_cpu_workers() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
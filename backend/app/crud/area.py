@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import env_float
+from app.models.area import Area
+
+AREA_CACHE = "areas"
+
+
+# Areas are a small, admin-managed dictionary: cache active rows per worker.
+# Writes through the areas router invalidate this worker immediately; other
+# workers see changes after the TTL. 0 disables the cache.
+AREA_CACHE_SECONDS = env_float("RENTPRO_AREA_CACHE_SECONDS", 60.0, minimum=0)
+
+# area_id -> (expires_at, detached snapshot)
+_cache: dict[int, tuple[float, Area]] = {}
+_lock = threading.Lock()
+_observer: Callable[..., None] | None = None
+
+
+def set_cache_observer(observer: Callable[..., None] | None) -> None:
+    """observer(cache_name, hit=bool), e.g. InMemoryMetrics.observe_cache."""
+    global _observer
+    _observer = observer
+
+
+def _observe(hit: bool) -> None:
+    if _observer is not None:
+        try:
+            _observer(AREA_CACHE, hit=hit)
+        except Exception:
+            pass
+
+
+def _snapshot(area: Area) -> Area:
+    copy = Area(
+        id=area.id,
+        code=area.code,
+        name=area.name,
+        area_score=area.area_score,
+        is_active=area.is_active,
+        created_at=area.created_at,
+        updated_at=area.updated_at,
+    )
+    make_transient_to_detached(copy)
+    return copy
+
+
+def get_active_area(db: Session, area_id: int) -> Area | None:
+    """
+    Active Area by id, attached to `db`.
+
+    Served from the session's identity map or the worker cache when possible
+    (merge(load=False) attaches the cached row without SQL); otherwise one
+    SELECT by primary key.
+    """
+    now = time.monotonic()
+    if AREA_CACHE_SECONDS > 0:
+        with _lock:
+            entry = _cache.get(area_id)
+        if entry is not None and entry[0] > now:
+            _observe(True)
+            return db.merge(entry[1], load=False)
+        _observe(False)
+
+    area = db.get(Area, area_id)
+    if area is None or not area.is_active:
+        return None
+    if AREA_CACHE_SECONDS > 0:
+        with _lock:
+            _cache[area_id] = (now + AREA_CACHE_SECONDS, _snapshot(area))
+    return area
+
+
+def invalidate_area_cache(area_id: int | None = None) -> None:
+    with _lock:
+        if area_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(area_id, None)
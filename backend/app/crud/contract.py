@@ -1,11 +1,35 @@
 from __future__ import annotations
 
+import re
 from datetime import date
+from typing import AsyncIterator
 
-from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import (
+    Select,
+    column,
+    func,
+    literal,
+    literal_column,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager
 
+from app.core.bulk import BulkReport, Record, insert_chunk, validation_messages
+from app.core.status_sync import (
+    effective_contract_status,
+    recompute_property_statuses,
+)
 from app.models.contract import Contract, ContractStatus
+from app.models.pdf_document import PdfDocument
 from app.models.property import Property
+from app.models.tenant import Tenant
+from app.schemas.bulk import BulkImportResult
 from app.schemas.contract import ContractCreate, ContractUpdate
 
 
@@ -27,6 +51,27 @@ def get_contract(db: Session, contract_id: int):
     return db.query(Contract).filter(Contract.id == contract_id).first()
 
 
+def get_contract_scoped(
+    db: Session, contract_id: int, *, user_id: int, admin: bool
+) -> tuple[Contract | None, bool]:
+    """
+    Contract (with its property loaded) and whether the caller may act on it:
+    admins always, owners for contracts of their properties. One query, so a
+    404 and a 403 are told apart from the same row.
+    """
+    allowed = literal(True) if admin else Property.owner_id == user_id
+    row = db.execute(
+        select(Contract, allowed.label("allowed"))
+        .join(Contract.property)
+        .outerjoin(Contract.document)
+        .options(contains_eager(Contract.property), contains_eager(Contract.document))
+        .where(Contract.id == contract_id)
+    ).first()
+    if row is None:
+        return None, False
+    return row[0], bool(row[1])
+
+
 def get_contracts(
     db: Session,
     skip: int = 0,
@@ -37,7 +82,12 @@ def get_contracts(
     status: ContractStatus | None = None,
     running_today: bool | None = None,
 ):
-    q = db.query(Contract)
+    # ingestion results (page count, thumbnail) ride along in the same query
+    q = (
+        db.query(Contract)
+        .outerjoin(Contract.document)
+        .options(contains_eager(Contract.document))
+    )
 
     if owner_id is not None:
         q = q.join(Property).filter(Property.owner_id == owner_id)
@@ -62,6 +112,107 @@ def get_contracts(
     return q.order_by(Contract.id.desc()).offset(skip).limit(limit).all()
 
 
+_FTS5_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def _fts5_query(q: str) -> str:
+    """
+    User input as an FTS5 query: words (AND), "quoted phrases" and word*
+    prefixes. Everything is quoted, so FTS5 operators/syntax never leak in.
+    """
+    terms = []
+    for phrase, word in _FTS5_TERM_RE.findall(q):
+        if phrase.strip():
+            terms.append('"' + " ".join(phrase.split()) + '"')
+            continue
+        prefix = word.endswith("*")
+        word = word.replace('"', "").rstrip("*")
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search_contracts(
+    db: Session,
+    q: str,
+    *,
+    owner_id: int | None = None,
+    skip: int = 0,
+    limit: int = 20,
+) -> list[tuple[Contract, str | None]]:
+    """
+    Contracts whose PDF text matches `q`, best match first, with a snippet
+    ([matched] terms). Answered from the full-text index over
+    pdf_documents.text (PostgreSQL tsvector / SQLite FTS5), never from the files.
+    """
+    stmt = (
+        select(Contract)
+        .join(Contract.document)
+        .options(contains_eager(Contract.document))
+    )
+    if owner_id is not None:
+        stmt = stmt.join(Contract.property).where(Property.owner_id == owner_id)
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        config = literal_column("'simple'::regconfig")
+        query = func.websearch_to_tsquery(config, q)
+        vector = literal_column("pdf_documents.search_vector")
+        stmt = (
+            stmt.add_columns(
+                func.ts_headline(
+                    config,
+                    PdfDocument.text,
+                    query,
+                    "StartSel=[, StopSel=], MaxWords=20, MinWords=5",
+                ).label("snippet")
+            )
+            .where(vector.op("@@")(query))
+            .order_by(func.ts_rank(vector, query).desc(), Contract.id.desc())
+        )
+    elif dialect == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return []
+        fts = table("pdf_documents_fts", column("pdf_file"))
+        fts_ref = literal_column("pdf_documents_fts")  # FTS5 aux function argument
+        stmt = (
+            stmt.add_columns(
+                func.snippet(fts_ref, 1, "[", "]", "…", 12).label("snippet")
+            )
+            .join(fts, fts.c.pdf_file == PdfDocument.pdf_file)
+            .where(text("pdf_documents_fts MATCH :match").bindparams(match=match))
+            .order_by(func.bm25(fts_ref), Contract.id.desc())
+        )
+    else:
+        raise HTTPException(
+            status_code=501, detail="Contract search is not available on this database"
+        )
+
+    rows = db.execute(stmt.offset(skip).limit(limit)).all()
+    return [(row[0], row[1]) for row in rows]
+
+
+def export_statement(
+    *, owner_id: int | None = None, today: date | None = None
+) -> Select:
+    """Column SELECT for streaming exports; overdue contracts show as EXPIRED."""
+    stmt = select(
+        Contract.id,
+        Contract.property_id,
+        Contract.tenant_id,
+        Contract.start_date,
+        Contract.end_date,
+        Contract.rent_amount,
+        effective_contract_status(today or date.today()).label("status"),
+        Contract.terminated_at,
+        Contract.created_at,
+    ).order_by(Contract.id)
+    if owner_id is not None:
+        stmt = stmt.join(Property).where(Property.owner_id == owner_id)
+    return stmt
+
+
 def update_contract(
     db: Session,
     contract_id: int,
@@ -90,3 +241,166 @@ def delete_contract(db: Session, contract_id: int):
         db.delete(db_contract)
         db.commit()
     return db_contract
+
+
+def _int_or_none(value) -> int | None:  # type: ignore[no-untyped-def]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def import_contracts(
+    db: AsyncSession,
+    chunks: AsyncIterator[list[Record]],
+    *,
+    user_id: int,
+    admin: bool,
+) -> BulkImportResult:
+    """
+    Bulk insert contracts from streamed records (see app.core.bulk).
+
+    Rows are ContractCreate; `tenant_afm` may replace `tenant_id` (resolved
+    among the property owner's tenants). Per chunk, with a handful of
+    set-wise queries:
+    - property and tenant existence/ownership (as in POST /contracts/)
+    - one ACTIVE contract per property (uq_contracts_one_active_per_property),
+      after expiring overdue ones, also across rows of the import
+    Contracts that already ended are stored as EXPIRED. Property statuses are
+    recomputed once, set-based, at the end.
+    """
+    today = date.today()
+    report = BulkReport()
+    touched: set[int] = set()
+
+    async for chunk in chunks:
+        rows = []
+        for row, data, error in chunk:
+            report.received += 1
+            if error is not None:
+                report.fail(row, error)
+            else:
+                rows.append((row, data))
+        if not rows:
+            continue
+
+        property_ids = {_int_or_none(d.get("property_id")) for _, d in rows} - {None}
+        owner_by_property = dict(
+            (
+                await db.execute(
+                    select(Property.id, Property.owner_id).where(
+                        Property.id.in_(property_ids)
+                    )
+                )
+            ).all()
+        )
+
+        afm_rows = [d for _, d in rows if "tenant_afm" in d and "tenant_id" not in d]
+        tenant_by_owner_afm: dict[tuple[int, str], int] = {}
+        if afm_rows:
+            result = await db.execute(
+                select(Tenant.owner_id, Tenant.afm, Tenant.id).where(
+                    Tenant.afm.in_({str(d["tenant_afm"]).strip() for d in afm_rows}),
+                    Tenant.owner_id.in_(set(owner_by_property.values())),
+                )
+            )
+            tenant_by_owner_afm = {(o, a): t for o, a, t in result.all()}
+
+        candidates: list[tuple[int, ContractCreate]] = []
+        for row, data in rows:
+            afm = data.pop("tenant_afm", None)
+            if afm is not None and "tenant_id" not in data:
+                owner_id = owner_by_property.get(_int_or_none(data.get("property_id")))
+                tenant_id = tenant_by_owner_afm.get((owner_id, str(afm).strip()))
+                if tenant_id is None:
+                    report.fail(row, f"tenant_afm: no tenant with AFM {afm!r}")
+                    continue
+                data["tenant_id"] = tenant_id
+            try:
+                candidates.append((row, ContractCreate.model_validate(data)))
+            except ValidationError as e:
+                report.fail(row, validation_messages(e))
+
+        tenant_ids = {c.tenant_id for _, c in candidates}
+        owner_by_tenant = dict(
+            (
+                await db.execute(
+                    select(Tenant.id, Tenant.owner_id).where(Tenant.id.in_(tenant_ids))
+                )
+            ).all()
+        )
+
+        # authorization before any write: rows for other owners' properties
+        # or tenants must not expire (or recompute) anything
+        authorized: list[tuple[int, ContractCreate]] = []
+        for row, c in candidates:
+            prop_owner = owner_by_property.get(c.property_id)
+            tenant_owner = owner_by_tenant.get(c.tenant_id)
+            if prop_owner is None:
+                report.fail(row, "property_id: Property not found")
+                continue
+            if not admin and prop_owner != user_id:
+                report.fail(
+                    row,
+                    "property_id: Not authorized to create contract for this property",
+                )
+                continue
+            if tenant_owner is None:
+                report.fail(row, "tenant_id: Tenant not found")
+                continue
+            if not admin and tenant_owner != user_id:
+                report.fail(row, "tenant_id: Tenant does not belong to current owner")
+                continue
+            authorized.append((row, c))
+
+        # expire overdue ACTIVE contracts first, as sync_property_status does
+        active_property_ids = {
+            c.property_id for _, c in authorized if c.end_date >= today
+        }
+        if active_property_ids:
+            await db.execute(
+                update(Contract)
+                .where(
+                    Contract.property_id.in_(active_property_ids),
+                    Contract.status == ContractStatus.ACTIVE,
+                    Contract.end_date < today,
+                )
+                .values(status=ContractStatus.EXPIRED)
+                .execution_options(synchronize_session=False)
+            )
+        has_active: set[int] = set()
+        if active_property_ids:
+            has_active = set(
+                (
+                    await db.execute(
+                        select(Contract.property_id).where(
+                            Contract.property_id.in_(active_property_ids),
+                            Contract.status == ContractStatus.ACTIVE,
+                        )
+                    )
+                ).scalars()
+            )
+
+        valid = []
+        for row, c in authorized:
+            values = c.model_dump(exclude_none=True)
+            if c.end_date < today:
+                values["status"] = ContractStatus.EXPIRED
+            else:
+                if c.property_id in has_active:
+                    report.fail(
+                        row, "property_id: Property already has an ACTIVE contract"
+                    )
+                    continue
+                values["status"] = ContractStatus.ACTIVE
+                has_active.add(c.property_id)
+            values["created_by_id"] = values["updated_by_id"] = user_id
+            valid.append((row, values))
+
+        # rejected rows roll back to a savepoint; the expiry UPDATE is kept
+        inserted = await insert_chunk(db, Contract, valid, report)
+        touched.update(active_property_ids)
+        touched.update(values["property_id"] for _, values in inserted)
+
+    await db.run_sync(recompute_property_statuses, touched, today=today)
+    return report.result()
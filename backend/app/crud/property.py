@@ -1,26 +1,54 @@
 from __future__ import annotations
 
+from datetime import date
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.bulk import BulkReport, Record, insert_chunk, validation_messages
+from app.core.status_sync import effective_property_status
+from app.models.area import Area
 from app.models.property import Property, PropertyStatus
+from app.models.role import UserRole
+from app.models.user import User
+from app.schemas.bulk import BulkImportResult
 from app.schemas.property import PropertyCreate, PropertySearchFilters, PropertyUpdate
 
 
-def create_property(db: Session, property: PropertyCreate, owner_id: int):
+def _commit_keep_loaded(db: Session) -> None:
+    """
+    Commit without expiring loaded objects.
+
+    After the flush the session already holds the written row (primary key
+    from RETURNING / lastrowid, Python-side defaults applied), so reloading it
+    would only repeat what we just sent.
+    """
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
+def create_property(
+    db: Session, property: PropertyCreate, owner_id: int, *, area: Area | None = None
+):
+    """
+    Insert a property and return it with `area` populated (pass the Area the
+    caller already validated to avoid looking it up again).
+    """
     data = property.model_dump()
     data.pop("owner_id", None)
 
     db_property = Property(**data, owner_id=owner_id)
+    db_property.area = area if area is not None else db.get(Area, db_property.area_id)
     db.add(db_property)
-    db.commit()
-    db.refresh(db_property)
-    # Reload with relationship eager-loaded for deterministic API responses.
-    return (
-        db.query(Property)
-        .options(joinedload(Property.area))
-        .filter(Property.id == db_property.id)
-        .first()
-    )
+    _commit_keep_loaded(db)
+    return db_property
 
 
 def get_properties(db: Session, skip: int = 0, limit: int = 100):
@@ -42,29 +70,37 @@ def get_property(db: Session, property_id: int):
     )
 
 
-def update_property(db: Session, property_id: int, property: PropertyUpdate):
-    db_property = (
-        db.query(Property)
+async def get_property_async(db: AsyncSession, property_id: int):
+    result = await db.execute(
+        select(Property)
         .options(joinedload(Property.area))
-        .filter(Property.id == property_id)
-        .first()
+        .where(Property.id == property_id)
     )
-    if not db_property:
-        return None
+    return result.scalars().first()
+
 
+def update_property(
+    db: Session,
+    db_property: Property,
+    property: PropertyUpdate,
+    *,
+    area: Area | None = None,
+):
+    """
+    Apply `property` to an already loaded Property (one UPDATE, no reload).
+    Pass the new Area when area_id changes and the caller already has it.
+    """
     property_data = property.model_dump(exclude_unset=True)
     for key, value in property_data.items():
         setattr(db_property, key, value)
 
-    db.commit()
-    db.refresh(db_property)
-    # Ensure Area relationship remains loaded for response serialization.
-    return (
-        db.query(Property)
-        .options(joinedload(Property.area))
-        .filter(Property.id == property_id)
-        .first()
-    )
+    if property_data.get("area_id") is not None:
+        db_property.area = (
+            area if area is not None else db.get(Area, db_property.area_id)
+        )
+
+    _commit_keep_loaded(db)
+    return db_property
 
 
 def delete_property(db: Session, property_id: int):
@@ -77,40 +113,162 @@ def delete_property(db: Session, property_id: int):
     return db_property
 
 
-def search_properties(db: Session, filters: PropertySearchFilters):
-    """
-    UC-03 search:
-    - Only AVAILABLE properties are visible in the public marketplace search.
-    - Returns (items, total) so API can provide FR-11 meta.
-    """
-    q = (
-        db.query(Property)
-        .options(joinedload(Property.area))
-        .filter(Property.status == PropertyStatus.AVAILABLE)
-    )
+def export_statement(
+    *, owner_id: int | None = None, today: date | None = None
+) -> Select:
+    """Column SELECT for streaming exports; status computed in SQL, not synced."""
+    stmt = select(
+        Property.id,
+        Property.owner_id,
+        Property.area_id,
+        Property.title,
+        Property.description,
+        Property.address,
+        Property.type,
+        Property.size,
+        Property.price,
+        effective_property_status(today or date.today()).label("status"),
+    ).order_by(Property.id)
+    if owner_id is not None:
+        stmt = stmt.where(Property.owner_id == owner_id)
+    return stmt
+
+
+def _search_statement(filters: PropertySearchFilters) -> Select:
+    stmt = select(Property).where(Property.status == PropertyStatus.AVAILABLE)
 
     if filters.area_id:
-        q = q.filter(Property.area_id == filters.area_id)
+        stmt = stmt.where(Property.area_id == filters.area_id)
 
     # Free-text substring search on address.
     if filters.address:
-        q = q.filter(Property.address.ilike(f"%{filters.address}%"))
+        stmt = stmt.where(Property.address.ilike(f"%{filters.address}%"))
 
     if filters.type:
-        q = q.filter(Property.type.ilike(f"%{filters.type}%"))
+        stmt = stmt.where(Property.type.ilike(f"%{filters.type}%"))
 
     if filters.min_price is not None:
-        q = q.filter(Property.price >= filters.min_price)
+        stmt = stmt.where(Property.price >= filters.min_price)
     if filters.max_price is not None:
-        q = q.filter(Property.price <= filters.max_price)
+        stmt = stmt.where(Property.price <= filters.max_price)
 
     if filters.min_size is not None:
-        q = q.filter(Property.size >= filters.min_size)
+        stmt = stmt.where(Property.size >= filters.min_size)
     if filters.max_size is not None:
-        q = q.filter(Property.size <= filters.max_size)
+        stmt = stmt.where(Property.size <= filters.max_size)
+
+    return stmt
 
-    total = q.count()
-    items = (
-        q.order_by(Property.id.desc()).offset(filters.offset).limit(filters.limit).all()
+
+def _search_page(stmt: Select, filters: PropertySearchFilters) -> tuple[Select, Select]:
+    count_stmt = select(func.count()).select_from(stmt.subquery())
+    page_stmt = (
+        stmt.options(joinedload(Property.area))
+        .order_by(Property.id.desc())
+        .offset(filters.offset)
+        .limit(filters.limit)
     )
+    return page_stmt, count_stmt
+
+
+def search_properties(db: Session, filters: PropertySearchFilters):
+    """
+    UC-03 search:
+    - Only AVAILABLE properties are visible in the public marketplace search.
+    - Returns (items, total) so API can provide FR-11 meta.
+    """
+    page_stmt, count_stmt = _search_page(_search_statement(filters), filters)
+    total = db.execute(count_stmt).scalar_one()
+    items = db.execute(page_stmt).scalars().all()
     return items, total
+
+
+async def search_properties_async(db: AsyncSession, filters: PropertySearchFilters):
+    """Async variant of search_properties (same filters and result)."""
+    page_stmt, count_stmt = _search_page(_search_statement(filters), filters)
+    total = (await db.execute(count_stmt)).scalar_one()
+    items = (await db.execute(page_stmt)).scalars().all()
+    return items, total
+
+
+async def import_properties(
+    db: AsyncSession,
+    chunks: AsyncIterator[list[Record]],
+    *,
+    owner_id: int | None,
+) -> BulkImportResult:
+    """
+    Bulk insert from streamed records (see app.core.bulk).
+
+    Rows are validated with PropertyCreate; `area_code` may stand in for
+    `area_id`. With `owner_id` set (OWNER caller) every row belongs to that
+    owner; with None (ADMIN caller) each row needs an `owner_id` of an OWNER
+    user, checked once per chunk. Each chunk is one multi-row INSERT and one
+    transaction; rows that fail validation are reported and skipped.
+    """
+    areas = (await db.execute(select(Area.id, Area.code).where(Area.is_active))).all()
+    area_id_by_code = {code.upper(): area_id for area_id, code in areas}
+    active_area_ids = set(area_id_by_code.values())
+
+    report = BulkReport()
+    async for chunk in chunks:
+        candidates: list[tuple[int, dict]] = []
+        for row, data, error in chunk:
+            report.received += 1
+            if error is not None:
+                report.fail(row, error)
+                continue
+
+            code = data.pop("area_code", None)
+            if code is not None and "area_id" not in data:
+                area_id = area_id_by_code.get(str(code).strip().upper())
+                if area_id is None:
+                    report.fail(row, f"area_code: unknown area {code!r}")
+                    continue
+                data["area_id"] = area_id
+
+            try:
+                item = PropertyCreate.model_validate(data)
+            except ValidationError as e:
+                report.fail(row, validation_messages(e))
+                continue
+
+            if item.area_id not in active_area_ids:
+                report.fail(row, "area_id: Invalid area_id")
+                continue
+            if owner_id is not None:
+                if item.owner_id is not None and item.owner_id != owner_id:
+                    report.fail(
+                        row, "owner_id: owners cannot create properties for others"
+                    )
+                    continue
+            elif item.owner_id is None:
+                report.fail(row, "owner_id: required for admins")
+                continue
+
+            values = item.model_dump()
+            values["owner_id"] = owner_id if owner_id is not None else item.owner_id
+            candidates.append((row, values))
+
+        if owner_id is None and candidates:
+            wanted = {values["owner_id"] for _, values in candidates}
+            owners = set(
+                (
+                    await db.execute(
+                        select(User.id).where(
+                            User.id.in_(wanted), User.role == UserRole.OWNER
+                        )
+                    )
+                ).scalars()
+            )
+            valid = []
+            for row, values in candidates:
+                if values["owner_id"] in owners:
+                    valid.append((row, values))
+                else:
+                    report.fail(row, "owner_id: must refer to a user with role OWNER")
+            candidates = valid
+
+        await insert_chunk(db, Property, candidates, report)
+
+    return report.result()
@@ -1,7 +1,15 @@
+from typing import AsyncIterator
+
 from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.bulk import BulkReport, Record, insert_chunk, validation_messages
 from app.models.tenant import Tenant
+from app.models.user import User
+from app.schemas.bulk import BulkImportResult
 from app.schemas.tenant import TenantCreate, TenantUpdate
 
 
@@ -47,6 +55,22 @@ def list_tenants(
     return q.offset(skip).limit(limit).all()
 
 
+def export_statement(*, owner_id: int | None = None) -> Select:
+    """Column SELECT for streaming exports."""
+    stmt = select(
+        Tenant.id,
+        Tenant.owner_id,
+        Tenant.name,
+        Tenant.afm,
+        Tenant.phone,
+        Tenant.email,
+        Tenant.created_at,
+    ).order_by(Tenant.id)
+    if owner_id is not None:
+        stmt = stmt.where(Tenant.owner_id == owner_id)
+    return stmt
+
+
 def update_tenant(
     db: Session,
     tenant_id: int,
@@ -89,3 +113,78 @@ def delete_tenant(db: Session, tenant_id: int):
     db.delete(db_tenant)
     db.commit()
     return db_tenant
+
+
+async def import_tenants(
+    db: AsyncSession,
+    chunks: AsyncIterator[list[Record]],
+    *,
+    user_id: int,
+    admin: bool,
+) -> BulkImportResult:
+    """
+    Bulk insert tenants from streamed records (see app.core.bulk).
+
+    Same rules as create_tenant: rows belong to the caller unless an admin
+    gives `owner_id`; (owner_id, afm) must be unique, checked set-wise per
+    chunk against the database and the rest of the chunk.
+    """
+    report = BulkReport()
+    async for chunk in chunks:
+        candidates: list[tuple[int, dict]] = []
+        for row, data, error in chunk:
+            report.received += 1
+            if error is not None:
+                report.fail(row, error)
+                continue
+            try:
+                item = TenantCreate.model_validate(data)
+            except ValidationError as e:
+                report.fail(row, validation_messages(e))
+                continue
+            if item.owner_id is not None and not admin:
+                report.fail(row, "owner_id: Only admin can set owner_id")
+                continue
+            values = item.model_dump(exclude={"owner_id"})
+            values["owner_id"] = item.owner_id or user_id
+            values["created_by_id"] = values["updated_by_id"] = user_id
+            candidates.append((row, values))
+
+        if not candidates:
+            continue
+
+        owner_ids = {v["owner_id"] for _, v in candidates}
+        known_owners = set(
+            (await db.execute(select(User.id).where(User.id.in_(owner_ids)))).scalars()
+        )
+        existing = set(
+            (
+                await db.execute(
+                    select(Tenant.owner_id, Tenant.afm).where(
+                        Tenant.owner_id.in_(owner_ids),
+                        Tenant.afm.in_({v["afm"] for _, v in candidates}),
+                    )
+                )
+            ).all()
+        )
+
+        valid = []
+        chunk_keys: set[tuple[int, str]] = set()
+        for row, values in candidates:
+            key = (values["owner_id"], values["afm"])
+            if values["owner_id"] not in known_owners:
+                report.fail(row, "owner_id: user not found")
+            elif key in existing:
+                report.fail(
+                    row, "afm: Tenant with this AFM already exists for this owner"
+                )
+            elif key in chunk_keys:
+                report.fail(row, "afm: duplicate AFM for this owner in the import")
+            else:
+                chunk_keys.add(key)
+                valid.append((row, values))
+
+        # earlier chunks are committed, so `existing` already covers them
+        await insert_chunk(db, Tenant, valid, report)
+
+    return report.result()
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Iterator
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.util import await_only
+
+from app.db import session as sync_db
+from app.db.replicas import REPLICA_URLS, RoundRobin, wants_primary
+
+# Same database as app.db.session, through an asyncio driver.
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Map a sync SQLAlchemy URL to its asyncio driver
+    (postgresql+psycopg2 -> postgresql+asyncpg, sqlite -> sqlite+aiosqlite).
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise RuntimeError(
+            f"No async driver for {backend!r}; set RENTPRO_ASYNC_DATABASE_URL"
+        )
+    if parsed.drivername == driver:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = (os.getenv("RENTPRO_ASYNC_DATABASE_URL") or "").strip() or (
+    async_database_url(sync_db.SQLALCHEMY_DATABASE_URL)
+)
+
+
+def _async_pool_settings() -> dict[str, Any]:
+    # Same knobs as the sync pool; async engines bring their own pool class.
+    settings = sync_db.pool_settings()
+    settings.pop("poolclass", None)
+    return settings
+
+
+async_engine: AsyncEngine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=sync_db._connect_args,
+    **_async_pool_settings(),
+)
+
+
+async def _acquire_writer_slot() -> None:
+    # wait in a thread so the event loop keeps serving; a slot acquired after
+    # the waiting task was cancelled is handed straight back
+    loop = asyncio.get_running_loop()
+    waiting = loop.run_in_executor(
+        None, sync_db.writer_slot.acquire, True, sync_db.WRITER_SLOT_TIMEOUT
+    )
+    try:
+        acquired = await asyncio.shield(waiting)
+    except asyncio.CancelledError:
+        waiting.add_done_callback(
+            lambda f: f.exception() is None
+            and f.result()
+            and sync_db.writer_slot.release()
+        )
+        raise
+    if not acquired:
+        raise PoolTimeoutError(
+            f"Timed out after {sync_db.WRITER_SLOT_TIMEOUT:g}s waiting for the writer"
+        )
+
+
+def _take_writer_slot(dbapi_conn, connection_record, connection_proxy):  # type: ignore[no-untyped-def]
+    # runs inside the AsyncEngine's greenlet, where await_only() may suspend
+    if not sync_db.writer_slot.acquire(blocking=False):
+        await_only(_acquire_writer_slot())
+    sync_db.hold_writer_slot(connection_record)
+
+
+# Mirror the SQLite profile: pragmas on connect and one writer connection,
+# which shares the sync writer's slot (sync_db.writer_slot): a process still
+# writes through one connection at a time.
+async_writer_engine: AsyncEngine | None = None
+
+if sync_db.SQLITE_PERFORMANCE:
+    event.listen(async_engine.sync_engine, "connect", sync_db._apply_sqlite_pragmas)
+    async_writer_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        connect_args=sync_db._connect_args,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=sync_db.WRITER_SLOT_TIMEOUT,
+    )
+    event.listen(
+        async_writer_engine.sync_engine, "connect", sync_db._apply_sqlite_pragmas
+    )
+    event.listen(async_writer_engine.sync_engine, "checkout", _take_writer_slot)
+    event.listen(async_writer_engine.sync_engine, "checkin", sync_db.free_writer_slot)
+
+# Read replicas (RENTPRO_DATABASE_REPLICA_URLS), used round-robin by
+# get_async_read_db.
+async_replica_engines: list[AsyncEngine] = [
+    create_async_engine(
+        async_database_url(url),
+        connect_args=sync_db._connect_args,
+        **_async_pool_settings(),
+    )
+    for url in REPLICA_URLS
+]
+_replicas = RoundRobin(async_replica_engines)
+
+for _eng in (async_engine, async_writer_engine, *async_replica_engines):
+    if _eng is not None:
+        sync_db.register_engine(_eng.sync_engine)
+
+
+class AsyncRoutingSession(sync_db.RoutingSession):
+    """RoutingSession over the async engines (used as AsyncSession.sync_session_class)."""
+
+    def routing_engines(self) -> tuple[Engine, Engine | None]:
+        writer = async_writer_engine.sync_engine if async_writer_engine else None
+        return async_engine.sync_engine, writer
+
+
+# expire_on_commit=False: expired attributes would need an implicit (sync) load
+# when the response is serialized.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=AsyncRoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Like get_async_db, but reads go to a replica (round-robin) when replicas
+    are configured and the client is outside its read-your-writes window.
+    Writes still go to the primary and pin the session there.
+    """
+    async with AsyncSessionLocal() as db:
+        if _replicas and not wants_primary(request):
+            db.sync_session.info[sync_db.REPLICA_KEY] = _replicas.next().sync_engine
+        yield db
+
+
+@contextmanager
+def on_primary(db: AsyncSession) -> Iterator[AsyncSession]:
+    """
+    Read from the primary inside the block (e.g. status sync before a replica
+    read). If the block wrote, the session stays on the primary afterwards.
+    """
+    info = db.sync_session.info
+    replica = info.pop(sync_db.REPLICA_KEY, None)
+    try:
+        yield db
+    finally:
+        if replica is not None and not info.get(sync_db.PINNED_KEY):
+            info[sync_db.REPLICA_KEY] = replica
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import env_float
+
+logger = logging.getLogger("rentpro.sql")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+
+
+# Set per request by ObservabilityMiddleware next to the request_id contextvar.
+# The object is mutable on purpose: sync handlers run in a threadpool with a
+# copied context, and they must update the same instance.
+_query_stats_ctx: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar(
+    "rentpro_query_stats", default=None
+)
+
+_START_KEY = "rentpro_query_start"
+
+
+# Statements slower than this are logged (0 disables the slow-query log).
+SLOW_QUERY_MS = env_float("RENTPRO_SLOW_QUERY_MS", 200.0, minimum=0)
+
+
+def begin_query_stats() -> contextvars.Token:
+    return _query_stats_ctx.set(QueryStats())
+
+
+def end_query_stats(token: contextvars.Token) -> None:
+    _query_stats_ctx.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _query_stats_ctx.get()
+
+
+def _before_cursor_execute(  # type: ignore[no-untyped-def]
+    conn, cursor, statement, parameters, context, executemany
+):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(  # type: ignore[no-untyped-def]
+    conn, cursor, statement, parameters, context, executemany
+):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000.0
+
+    stats = _query_stats_ctx.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+
+    if SLOW_QUERY_MS > 0 and elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning(
+            "slow query (%.1fms): %s", elapsed_ms, " ".join(statement.split())[:500]
+        )
+
+
+def _handle_error(exception_context):  # type: ignore[no-untyped-def]
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    conn = exception_context.connection
+    starts = conn.info.get(_START_KEY) if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    """
+    Count statements and DB time per request (see QueryStats) and log slow
+    queries. Safe to call more than once.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if not event.contains(engine, "handle_error", _handle_error):
+        event.listen(engine, "handle_error", _handle_error)
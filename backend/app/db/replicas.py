@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import contextvars
+import itertools
+import os
+import threading
+import time
+from typing import Any, Sequence
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import env_float
+
+
+def _replica_urls() -> list[str]:
+    raw = os.getenv("RENTPRO_DATABASE_REPLICA_URLS") or ""
+    return [u.strip() for u in raw.split(",") if u.strip()]
+
+
+# Comma-separated SQLAlchemy URLs of streaming replicas (same schema as the
+# primary). Empty = every request uses the primary.
+REPLICA_URLS = _replica_urls()
+
+# After a client's own write, its reads go to the primary for this long so it
+# never sees a replica that has not caught up yet.
+READ_YOUR_WRITES_SECONDS = env_float("RENTPRO_READ_YOUR_WRITES_SECONDS", 5.0, minimum=0)
+
+PRIMARY_COOKIE = "rentpro_primary_until"
+
+
+class RoundRobin:
+    """Thread-safe round-robin over a fixed sequence."""
+
+    def __init__(self, items: Sequence[Any]):
+        self._items = list(items)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def next(self) -> Any:
+        with self._lock:
+            i = next(self._counter)
+        return self._items[i % len(self._items)]
+
+
+# ---------------------------------------------------------------------------
+# Read-your-writes window
+# ---------------------------------------------------------------------------
+
+
+class _RequestWrites:
+    __slots__ = ("wrote",)
+
+    def __init__(self) -> None:
+        self.wrote = False
+
+
+# Mutable holder so commits in threadpool handlers (copied context) are seen
+# by the middleware.
+_request_writes_ctx: contextvars.ContextVar[_RequestWrites | None] = (
+    contextvars.ContextVar("rentpro_request_writes", default=None)
+)
+
+# username -> monotonic deadline, for clients that do not keep cookies
+_recent_writers: dict[str, float] = {}
+_recent_writers_lock = threading.Lock()
+
+
+def note_committed_write() -> None:
+    """Called when a session commits a transaction that wrote."""
+    holder = _request_writes_ctx.get()
+    if holder is not None:
+        holder.wrote = True
+
+
+def _username(request: Request) -> str | None:
+    payload = getattr(request.state, "user", None)
+    if isinstance(payload, dict):
+        return payload.get("sub") or None
+    return None
+
+
+def wants_primary(request: Request) -> bool:
+    """
+    True while the client is inside its read-your-writes window (cookie set on
+    the response to its last write, or a recent write by the same user seen
+    by this worker).
+    """
+    if READ_YOUR_WRITES_SECONDS <= 0:
+        return False
+    raw = request.cookies.get(PRIMARY_COOKIE)
+    if raw:
+        try:
+            if float(raw) > time.time():
+                return True
+        except ValueError:
+            pass
+    username = _username(request)
+    if username:
+        with _recent_writers_lock:
+            deadline = _recent_writers.get(username)
+        if deadline is not None and deadline > time.monotonic():
+            return True
+    return False
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    Opens the read-your-writes window for clients whose request committed a
+    write: sets a short-lived cookie and remembers the user in this worker.
+    Only installed when RENTPRO_DATABASE_REPLICA_URLS is set.
+    """
+
+    async def dispatch(self, request: Request, call_next):  # type: ignore[no-untyped-def]
+        holder = _RequestWrites()
+        token = _request_writes_ctx.set(holder)
+        try:
+            response = await call_next(request)
+        finally:
+            _request_writes_ctx.reset(token)
+
+        if holder.wrote and READ_YOUR_WRITES_SECONDS > 0:
+            window = READ_YOUR_WRITES_SECONDS
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                f"{time.time() + window:.3f}",
+                max_age=max(1, int(window + 0.999)),
+                httponly=True,
+                samesite="lax",
+            )
+            username = _username(request)
+            if username:
+                now = time.monotonic()
+                with _recent_writers_lock:
+                    _recent_writers[username] = now + window
+                    if len(_recent_writers) > 10_000:
+                        for k in [k for k, v in _recent_writers.items() if v <= now]:
+                            del _recent_writers[k]
+        return response
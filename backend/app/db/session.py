@@ -1,7 +1,16 @@
 import os
+import threading
+import time
+from typing import Any
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import env_bool, env_float, env_int
+from app.db.replicas import note_committed_write
 
 SQLALCHEMY_DATABASE_URL = os.getenv(
     "RENTPRO_DATABASE_URL",  # Use this env variable if set
@@ -9,17 +18,278 @@ SQLALCHEMY_DATABASE_URL = os.getenv(
 )
 
 _is_sqlite = SQLALCHEMY_DATABASE_URL.strip().lower().startswith("sqlite")
+_is_sqlite_memory = _is_sqlite and (
+    ":memory:" in SQLALCHEMY_DATABASE_URL
+    or SQLALCHEMY_DATABASE_URL.strip().rstrip("/").lower() in ("sqlite:", "sqlite:/")
+    or "mode=memory" in SQLALCHEMY_DATABASE_URL
+)
 _connect_args = {"check_same_thread": False} if _is_sqlite else {}
 
+
+class PoolWaitStats:
+    """
+    Time spent waiting for a connection in QueuePool checkout.
+
+    Only the wait for a pooled connection is measured (not the statement), so a
+    growing average means the pool is too small for the concurrency.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.timeouts = 0
+
+    def record(self, wait_ms: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            if wait_ms > self.wait_ms_max:
+                self.wait_ms_max = wait_ms
+
+    def as_dict(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "checkout_wait_ms_total": round(self.wait_ms_total, 3),
+                "checkout_wait_ms_max": round(self.wait_ms_max, 3),
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time in `pool_wait_stats`."""
+
+    def _do_get(self):  # type: ignore[no-untyped-def]
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            pool_wait_stats.record((time.perf_counter() - t0) * 1000.0, timed_out=True)
+            raise
+        pool_wait_stats.record((time.perf_counter() - t0) * 1000.0)
+        return conn
+
+
+def pool_settings() -> dict[str, Any]:
+    """
+    Engine pool options from the environment.
+
+    RENTPRO_DB_POOL_SIZE / RENTPRO_DB_MAX_OVERFLOW / RENTPRO_DB_POOL_TIMEOUT
+    default to SQLAlchemy's (5 / 10 / 30s). Liveness is either pre-ping (one
+    extra round trip per checkout, default outside SQLite) or recycle-based:
+    set RENTPRO_DB_POOL_PRE_PING=0 together with RENTPRO_DB_POOL_RECYCLE
+    (seconds, below the server's idle timeout).
+    """
+    recycle = env_int("RENTPRO_DB_POOL_RECYCLE", -1, minimum=-1)
+    settings: dict[str, Any] = {
+        "pool_pre_ping": env_bool("RENTPRO_DB_POOL_PRE_PING", not _is_sqlite),
+        "pool_recycle": recycle,
+    }
+    if not _is_sqlite_memory:
+        settings.update(
+            poolclass=TimedQueuePool,
+            pool_size=env_int("RENTPRO_DB_POOL_SIZE", 5, minimum=1),
+            max_overflow=env_int("RENTPRO_DB_MAX_OVERFLOW", 10, minimum=-1),
+            pool_timeout=env_float("RENTPRO_DB_POOL_TIMEOUT", 30.0, minimum=0),
+        )
+    return settings
+
+
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args=_connect_args,
-    pool_pre_ping=not _is_sqlite,
+    **pool_settings(),
+)
+
+
+# ---------------------------------------------------------------------------
+# SQLite performance profile
+# ---------------------------------------------------------------------------
+
+# On by default for file-based SQLite (RENTPRO_SQLITE_PERFORMANCE=0 turns it
+# off): WAL + pragmas on every connection, and a single writer connection.
+SQLITE_PERFORMANCE = (
+    _is_sqlite
+    and not _is_sqlite_memory
+    and env_bool("RENTPRO_SQLITE_PERFORMANCE", True)
+)
+
+
+def sqlite_pragmas() -> list[tuple[str, Any]]:
+    return [
+        # readers never block the writer (and vice versa)
+        ("journal_mode", "WAL"),
+        # fsync on checkpoint only; safe in WAL mode
+        ("synchronous", "NORMAL"),
+        ("busy_timeout", env_int("RENTPRO_SQLITE_BUSY_TIMEOUT_MS", 5000, minimum=0)),
+        # negative = KiB
+        ("cache_size", -env_int("RENTPRO_SQLITE_CACHE_SIZE_KB", 64 * 1024, minimum=0)),
+        (
+            "mmap_size",
+            env_int("RENTPRO_SQLITE_MMAP_SIZE", 256 * 1024 * 1024, minimum=0),
+        ),
+        ("temp_store", "MEMORY"),
+    ]
+
+
+def _apply_sqlite_pragmas(dbapi_conn, connection_record):  # type: ignore[no-untyped-def]
+    cursor = dbapi_conn.cursor()
+    try:
+        for name, value in _SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+# All ORM writes (flushes and DML statements) go through this single
+# connection. Waiting for it is the write queue: concurrent writers line up in
+# the pool instead of failing with "database is locked", while reads keep
+# using the main pool.
+writer_engine: Engine | None = None
+
+# The async engine (app.db.async_session) needs a writer connection of its own
+# driver, so the queue itself is this per-process slot: a writer connection of
+# either engine holds it from checkout to checkin, and sync and async writes
+# take turns instead of racing for the SQLite write lock.
+writer_slot = threading.Lock()
+WRITER_SLOT_TIMEOUT = env_float("RENTPRO_DB_POOL_TIMEOUT", 30.0, minimum=0)
+_SLOT_KEY = "rentpro_writer_slot"
+
+
+def hold_writer_slot(connection_record) -> None:  # type: ignore[no-untyped-def]
+    """Record that this writer connection holds writer_slot (already acquired)."""
+    connection_record.record_info[_SLOT_KEY] = True
+
+
+def _take_writer_slot(dbapi_conn, connection_record, connection_proxy):  # type: ignore[no-untyped-def]
+    if not writer_slot.acquire(timeout=WRITER_SLOT_TIMEOUT):
+        raise PoolTimeoutError(
+            f"Timed out after {WRITER_SLOT_TIMEOUT:g}s waiting for the writer"
+        )
+    hold_writer_slot(connection_record)
+
+
+def free_writer_slot(dbapi_conn, connection_record):  # type: ignore[no-untyped-def]
+    if connection_record.record_info.pop(_SLOT_KEY, False):
+        writer_slot.release()
+
+
+if SQLITE_PERFORMANCE:
+    _SQLITE_PRAGMAS = sqlite_pragmas()
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    writer_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args=_connect_args,
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=WRITER_SLOT_TIMEOUT,
+    )
+    event.listen(writer_engine, "connect", _apply_sqlite_pragmas)
+    event.listen(writer_engine, "checkout", _take_writer_slot)
+    event.listen(writer_engine, "checkin", free_writer_slot)
+
+
+# Engines created elsewhere on the same database (e.g. the async engine's
+# sync_engine), so instrumentation and test helpers see every statement.
+_extra_engines: list[Engine] = []
+
+
+def register_engine(extra: Engine) -> None:
+    if extra not in _extra_engines:
+        _extra_engines.append(extra)
+
+
+def all_engines() -> list[Engine]:
+    return [e for e in (engine, writer_engine, *_extra_engines) if e is not None]
+
+
+_WROTE_KEY = "rentpro_wrote"
+# Engine reads go to for the rest of the session (set by the replica-aware
+# dependencies); dropped for good as soon as the session writes (PINNED_KEY).
+REPLICA_KEY = "rentpro_replica"
+PINNED_KEY = "rentpro_pinned"
+
+
+class RoutingSession(Session):
+    """
+    Session that sends writes to the primary/writer engine and, when the
+    session was given a replica (REPLICA_KEY), reads to that replica.
+
+    Flushes and INSERT/UPDATE/DELETE statements use the writer (the single
+    SQLite writer connection when there is one, otherwise the primary). Once
+    the transaction has written, later reads stick to the writer too so they
+    see their own uncommitted changes, and a session that wrote never goes
+    back to its replica. Without a writer engine or replica it behaves like a
+    plain Session.
+    """
+
+    def routing_engines(self) -> tuple[Engine, Engine | None]:
+        return engine, writer_engine
+
+    def get_bind(self, mapper=None, clause=None, **kw):  # type: ignore[no-untyped-def]
+        primary, writer = self.routing_engines()
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info[_WROTE_KEY] = True
+            self.info[PINNED_KEY] = True
+            self.info.pop(REPLICA_KEY, None)
+        replica = self.info.get(REPLICA_KEY)
+        if writer is None and replica is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+        if self.info.get(_WROTE_KEY):
+            return writer or primary
+        return replica or primary
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _note_write(session):  # type: ignore[no-untyped-def]
+    if session.info.get(_WROTE_KEY):
+        note_committed_write()
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):  # type: ignore[no-untyped-def]
+    if transaction.parent is None:
+        session.info.pop(_WROTE_KEY, None)
+
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def pool_status() -> dict[str, float]:
+    """
+    Current connection pool usage plus checkout wait totals (keys present
+    depend on the pool class).
+    """
+    pool = engine.pool
+    out: dict[str, float] = {}
+    for key, attr in (
+        ("size", "size"),
+        ("checked_in", "checkedin"),
+        ("checked_out", "checkedout"),
+        ("overflow", "overflow"),
+    ):
+        fn = getattr(pool, attr, None)
+        if callable(fn):
+            out[key] = int(fn())
+    if isinstance(pool, TimedQueuePool):
+        out.update(pool_wait_stats.as_dict())
+    if writer_engine is not None:
+        out["writer_checked_out"] = int(writer_engine.pool.checkedout())
+    return out
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -1,14 +1,15 @@
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
 from pydantic import ValidationError
-from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
 from pathlib import Path
 import os
+import time
 
 import app.models
 from app.core.observability import (
@@ -16,18 +17,47 @@ from app.core.observability import (
     ObservabilityMiddleware,
     configure_logging,
 )
-from app.core.migrations import run_migrations
-from app.core.uploads import get_upload_root
+from app.core.jobs import JOBS_ENABLED, JobRunner, default_jobs, set_job_observer
+from app.core.migrations import prepare_database
+from app.core.profiling import PROFILING_ENABLED, ProfilingMiddleware
+from app.core.prometheus import (
+    prometheus_response,
+    start_multiprocess_flusher,
+    stop_multiprocess_flusher,
+    wants_prometheus,
+)
+from app.core.uploads import get_upload_root, shutdown_upload_io
+from app.core.workers import shutdown_cpu_workers
 from app.core.jwt_middleware import JWTAuthMiddleware
-from app.core.seed import seed_e2e_fixtures, seed_locked_areas, seed_locked_criteria
-from app.db.session import SessionLocal
+from app.core.upload_access import (
+    set_cache_observer as set_upload_access_cache_observer,
+)
+from app.crud.area import set_cache_observer as set_area_cache_observer
+from app.db.async_session import (
+    async_engine,
+    async_replica_engines,
+    async_writer_engine,
+)
+from app.db.instrumentation import install_query_instrumentation
+from app.db.replicas import REPLICA_URLS, ReadYourWritesMiddleware
+from app.db.session import SessionLocal, all_engines, engine, pool_status
 from app.routers import api_router
 
 load_dotenv()
 configure_logging()
 
+for _engine in all_engines():
+    install_query_instrumentation(_engine)
+
 app = FastAPI()
 app.state.metrics = InMemoryMetrics()
+set_area_cache_observer(app.state.metrics.observe_cache)
+set_upload_access_cache_observer(app.state.metrics.observe_cache)
+set_job_observer(app.state.metrics.observe_job)
+app.state.jobs = JobRunner(default_jobs() if JOBS_ENABLED else [])
+app.state.metrics.add_gauge_collector(
+    lambda: {f"rentpro_db_pool_{k}": v for k, v in pool_status().items()}
+)
 
 origins = [
     "http://localhost:3000",  # React dev
@@ -37,17 +67,45 @@ origins = [
 
 @app.on_event("startup")
 def on_startup_migrate_and_seed():
-    run_migrations()
-    # Safe, idempotent seeds
-    db = SessionLocal()
-    try:
-        seed_locked_areas(db)
-        seed_locked_criteria(db)
-        if os.getenv("RENTPRO_E2E_SEED", "").strip() == "1":
+    # Upgrade + reference seeds only when alembic_version is behind the
+    # scripts (RENTPRO_MIGRATE_ON_STARTUP); a current database costs one query.
+    prepare_database(engine)
+    if os.getenv("RENTPRO_E2E_SEED", "").strip() == "1":
+        from app.core.seed import seed_e2e_fixtures
+
+        db = SessionLocal()
+        try:
             pwd = os.getenv("RENTPRO_E2E_PASSWORD", "rentpro-e2e")
             seed_e2e_fixtures(db, password=pwd)
-    finally:
-        db.close()
+        finally:
+            db.close()
+
+    start_multiprocess_flusher(app.state.metrics)
+
+
+@app.on_event("startup")
+async def on_startup_start_jobs():
+    # after migrations: jobs touch the database right away on some schedules
+    app.state.jobs.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown_stop_jobs():
+    await app.state.jobs.stop()
+
+
+@app.on_event("shutdown")
+def on_shutdown_flush_metrics():
+    stop_multiprocess_flusher()
+
+
+@app.on_event("shutdown")
+async def on_shutdown_release_workers():
+    shutdown_cpu_workers()
+    shutdown_upload_io()
+    for async_eng in (async_engine, async_writer_engine, *async_replica_engines):
+        if async_eng is not None:
+            await async_eng.dispose()
 
 
 @app.exception_handler(OperationalError)
@@ -111,6 +169,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if REPLICA_URLS:
+    # Inside JWTAuthMiddleware: remembers the user that wrote.
+    app.add_middleware(ReadYourWritesMiddleware)
+if PROFILING_ENABLED:
+    # Inside JWTAuthMiddleware: needs request.state.user for the admin check.
+    app.add_middleware(ProfilingMiddleware)
 app.add_middleware(JWTAuthMiddleware)
 app.add_middleware(ObservabilityMiddleware, metrics=app.state.metrics)
 
@@ -119,10 +183,10 @@ app.include_router(api_router)
 BASE_DIR = Path(__file__).resolve().parent.parent
 UPLOADS_DIR = get_upload_root()
 
+# Served by the authorized /uploads router (app.routers.uploads), not a
+# public static mount.
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
-app.mount("/uploads", StaticFiles(directory=str(UPLOADS_DIR)), name="uploads")
-
 
 @app.get("/")
 def read_root():
@@ -134,6 +198,34 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/health/db")
+def health_db():
+    pool = pool_status()
+    t0 = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "pool": pool_status()},
+        )
+    latency_ms = round((time.perf_counter() - t0) * 1000.0, 3)
+    return {
+        "status": "ok",
+        "latency_ms": latency_ms,
+        "pool_class": type(engine.pool).__name__,
+        "pool": pool,
+    }
+
+
 @app.get("/metrics")
-def metrics():
+def metrics(
+    request: Request,
+    format: str | None = Query(
+        default=None, description="'prometheus' for text exposition format"
+    ),
+):
+    if wants_prometheus(request, format):
+        return prometheus_response(app.state.metrics)
     return app.state.metrics.snapshot()
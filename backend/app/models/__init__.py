@@ -1,7 +1,9 @@
 from .area import Area as Area
 from .contract import Contract as Contract
 from .criterion import Criterion as Criterion
+from .job_lock import JobLock as JobLock
 from .pairwise_comparison import PairwiseComparison as PairwiseComparison
+from .pdf_document import PdfDocument as PdfDocument
 from .preference_profile import PreferenceProfile as PreferenceProfile
 from .property import Property as Property
 from .property_location_features import (
@@ -20,4 +22,6 @@ __all__ = [
     "PreferenceProfile",
     "PairwiseComparison",
     "PropertyLocationFeatures",
+    "JobLock",
+    "PdfDocument",
 ]
@@ -63,6 +63,13 @@ class Contract(Base):
 
     property = relationship("Property", back_populates="contracts")
     tenant = relationship("Tenant", back_populates="contracts")
+    # ingestion results for pdf_file (shared by contracts with the same blob)
+    document = relationship(
+        "PdfDocument",
+        primaryjoin="foreign(Contract.pdf_file) == PdfDocument.pdf_file",
+        uselist=False,
+        viewonly=True,
+    )
 
 
 # DB-level: at most 1 ACTIVE contract per property (works on PostgreSQL + SQLite partial index)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, String
+
+from app.db.session import Base
+
+
+class JobLock(Base):
+    """
+    Lease held by the worker running a background job (see app.core.jobs).
+    Used where the database has no advisory locks (SQLite).
+    """
+
+    __tablename__ = "job_locks"
+
+    name = Column(String, primary_key=True)
+    owner = Column(String, nullable=False)
+    locked_until = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import enum
+
+from sqlalchemy import Column, DateTime, Integer, String, Text, func
+from sqlalchemy import Enum as SAEnum
+
+from app.db.session import Base
+
+
+class PdfDocumentStatus(str, enum.Enum):
+    READY = "READY"
+    FAILED = "FAILED"
+
+
+class PdfDocument(Base):
+    """
+    What ingestion extracted from a stored PDF (see app.core.pdf_ingest).
+    Keyed by the storage key, so contracts sharing a deduplicated blob share
+    one row. No row yet = not ingested.
+    """
+
+    __tablename__ = "pdf_documents"
+
+    pdf_file = Column(String, primary_key=True)
+    status = Column(
+        SAEnum(PdfDocumentStatus, name="pdf_document_status", native_enum=False),
+        nullable=False,
+    )
+    page_count = Column(Integer, nullable=True)
+    # storage key of the first-page PNG
+    thumbnail = Column(String, nullable=True)
+    text = Column(Text, nullable=True)
+    error = Column(String, nullable=True)
+    ingested_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 
+from app.core.profiling import PROFILING_ENABLED
+
 from .area import router as area_router
 from .auth import router as auth_router
 from .contract import router as contract_router
@@ -7,6 +9,7 @@ from .preference_profile import router as preference_profile_router
 from .property import router as property_router
 from .recommendation import router as recommendation_router
 from .tenant import router as tenant_router
+from .uploads import router as uploads_router
 from .user import router as user_router
 
 api_router = APIRouter()
@@ -15,6 +18,7 @@ api_router.include_router(user_router, prefix="/users", tags=["users"])
 api_router.include_router(property_router, prefix="/properties", tags=["properties"])
 api_router.include_router(contract_router, prefix="/contracts", tags=["contracts"])
 api_router.include_router(tenant_router, prefix="/tenants", tags=["tenants"])
+api_router.include_router(uploads_router, prefix="/uploads", tags=["uploads"])
 api_router.include_router(auth_router, prefix="", tags=["auth"])
 api_router.include_router(
     preference_profile_router,
@@ -24,3 +28,10 @@ api_router.include_router(
 api_router.include_router(
     recommendation_router, prefix="/recommendations", tags=["recommendations"]
 )
+
+if PROFILING_ENABLED:
+    from .profiling import router as profiling_router
+
+    api_router.include_router(
+        profiling_router, prefix="/admin/profiling", tags=["profiling"]
+    )
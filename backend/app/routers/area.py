@@ -1,25 +1,28 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.profiling import ProfiledRoute
 from app.core.utils import is_admin
+from app.crud.area import invalidate_area_cache
+from app.db.async_session import get_async_read_db
 from app.db.session import get_db
 from app.models.area import Area
 from app.schemas.area import AreaAdminOut, AreaCreate, AreaOut, AreaUpdate
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("/", response_model=list[AreaOut])
-def list_areas(db: Session = Depends(get_db)):
+async def list_areas(db: AsyncSession = Depends(get_async_read_db)):
     # Public read-only list for UI dropdowns
-    return (
-        db.query(Area)
-        .filter(Area.is_active)  # noqa: E712
-        .order_by(Area.name.asc())
-        .all()
+    result = await db.execute(
+        select(Area).where(Area.is_active).order_by(Area.name.asc())  # noqa: E712
     )
+    return result.scalars().all()
 
 
 @router.get("/admin", response_model=list[AreaAdminOut])
@@ -50,6 +53,7 @@ def create_area(
     )
     db.add(area)
     db.commit()
+    invalidate_area_cache(area.id)
     db.refresh(area)
     return area
 
@@ -79,6 +83,7 @@ def update_area(
         area.is_active = bool(data["is_active"])
 
     db.commit()
+    invalidate_area_cache(area.id)
     db.refresh(area)
     return area
 
@@ -101,5 +106,6 @@ def delete_area(request: Request, area_id: int, db: Session = Depends(get_db)):
 
     area.is_active = False
     db.commit()
+    invalidate_area_cache(area.id)
     db.refresh(area)
     return area
@@ -5,13 +5,14 @@ from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app.core.jwt import create_access_token, create_refresh_token, verify_refresh_token
+from app.core.profiling import ProfiledRoute
 from app.core.rate_limit import rate_limit_auth
 from app.core.security import verify_password
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.user import Token, UserLogin
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 def _cookie_secure(request: Request) -> bool:
@@ -3,86 +3,118 @@ from __future__ import annotations
 from datetime import date, datetime, timezone
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
+from fastapi.responses import RedirectResponse
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy import exists, select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.bulk import BULK_REQUEST_BODY, bulk_format, iter_record_chunks
+from app.core.downloads import file_download, strong_etag
+from app.core.export import export_format, export_response
+from app.core.jobs import inline_status_sync
+from app.core.pdf_ingest import PDF_INGEST_ENABLED, ingest_after_upload
+from app.core.profiling import ProfiledRoute
 from app.core.status_sync import sync_property_status
-from app.core.uploads import contract_pdf_destination, get_upload_root, save_pdf_upload
-from app.core.utils import get_current_user, is_admin
+from app.core.upload_access import invalidate_upload_access_cache
+from app.core.uploads import (
+    get_storage,
+    get_upload_root,
+    pdf_storage_key,
+    save_pdf_upload,
+)
+from app.core.utils import get_current_user, get_current_user_async, is_admin
 from app.crud import contract as crud_contract
-from app.db.session import get_db
+from app.db.async_session import get_async_db, get_async_read_db
+from app.db.session import REPLICA_KEY, get_db
 from app.models.contract import Contract, ContractStatus
 from app.models.property import Property, PropertyStatus
+from app.models.role import UserRole
 from app.models.tenant import Tenant
-from app.schemas.contract import ContractCreate, ContractOut, ContractUpdate
+from app.schemas.bulk import BulkImportResult
+from app.schemas.contract import (
+    ContractCreate,
+    ContractOut,
+    ContractSearchHit,
+    ContractUpdate,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 def _auto_expire_contracts(db: Session, *, owner_id: int | None = None) -> int:
     """
-    Auto-expire overdue ACTIVE contracts.
+    Auto-expire overdue ACTIVE contracts, set-based (two UPDATEs, one commit).
+    Nothing overdue (the usual case) costs one SELECT and writes nothing, so
+    reads do not take the writer connection or pin the user to the primary.
     If owner_id provided => only contracts of properties owned by that user.
+    Properties left without a current ACTIVE contract become AVAILABLE.
     Returns number of contracts expired.
     """
     today = date.today()
 
-    q = (
-        db.query(Contract)
-        .join(Property, Contract.property_id == Property.id)
-        .filter(
-            Contract.status == ContractStatus.ACTIVE,
-            Contract.end_date < today,
-        )
-    )
-
+    overdue = [
+        Contract.status == ContractStatus.ACTIVE,
+        Contract.end_date < today,
+    ]
     if owner_id is not None:
-        q = q.filter(Property.owner_id == owner_id)
+        overdue.append(
+            Contract.property_id.in_(
+                select(Property.id).where(Property.owner_id == owner_id)
+            )
+        )
 
-    overdue = q.all()
-    if not overdue:
+    if not db.execute(select(exists().where(*overdue))).scalar():
         return 0
 
-    expired_count = 0
-    for c in overdue:
-        c.status = ContractStatus.EXPIRED
-        expired_count += 1
-
-        other_current_active_exists = (
-            db.query(Contract.id)
-            .filter(
-                Contract.property_id == c.property_id,
-                Contract.status == ContractStatus.ACTIVE,
-                Contract.id != c.id,
-                Contract.end_date >= today,
-            )
-            .first()
-            is not None
+    # properties first, while the overdue contracts are still ACTIVE
+    current_active_exists = (
+        select(Contract.id)
+        .where(
+            Contract.property_id == Property.id,
+            Contract.status == ContractStatus.ACTIVE,
+            Contract.end_date >= today,
         )
-        if not other_current_active_exists:
-            c.property.status = PropertyStatus.AVAILABLE
-
+        .exists()
+    )
+    db.execute(
+        update(Property)
+        .where(
+            Property.id.in_(select(Contract.property_id).where(*overdue)),
+            ~current_active_exists,
+        )
+        .values(status=PropertyStatus.AVAILABLE)
+        .execution_options(synchronize_session=False)
+    )
+    expired = db.execute(
+        update(Contract)
+        .where(*overdue)
+        .values(status=ContractStatus.EXPIRED)
+        .execution_options(synchronize_session=False)
+    ).rowcount
     db.commit()
-    return expired_count
+    return expired
 
 
 def _pdf_url(pdf_file: str | None) -> str | None:
     """
-    pdf_file is stored as a relative path (e.g. "contracts/<file>.pdf") from upload_contract_pdf.
-    Public URL is served by StaticFiles: /uploads/<relative-path>
+    pdf_file is stored as a relative path (e.g. "blobs/sha256/ab/<sha256>.pdf") from upload_contract_pdf.
+    URL: /uploads/<storage key>, served to authorized users by the uploads router
     """
     if not pdf_file:
         return None
-
-    rel = pdf_file.lstrip("/").replace("\\", "/")
-
-    # Backward compatibility: if older rows store only filename
-    if "/" not in rel:
-        rel = f"contracts/{rel}"
-
-    return f"/uploads/{rel}"
+    return f"/uploads/{pdf_storage_key(pdf_file)}"
 
 
 def _pdf_abs_path(pdf_file: str | None) -> Path | None:
@@ -92,10 +124,7 @@ def _pdf_abs_path(pdf_file: str | None) -> Path | None:
     if not pdf_file:
         return None
 
-    rel = pdf_file.lstrip("/").replace("\\", "/")
-    if "/" not in rel:
-        rel = f"contracts/{rel}"
-
+    rel = pdf_storage_key(pdf_file)
     root = get_upload_root()
     abs_path = (root / Path(rel)).resolve()
 
@@ -107,9 +136,27 @@ def _pdf_abs_path(pdf_file: str | None) -> Path | None:
     return abs_path
 
 
+def _get_authorized_contract(
+    db: Session, contract_id: int, user, *, detail: str = "Not authorized"
+) -> Contract:
+    db_contract, allowed = crud_contract.get_contract_scoped(
+        db, contract_id, user_id=user.id, admin=user.role == UserRole.ADMIN
+    )
+    if db_contract is None:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    if not allowed:
+        raise HTTPException(status_code=403, detail=detail)
+    return db_contract
+
+
 def _to_out(c: Contract) -> ContractOut:
     dto = ContractOut.model_validate(c)
     dto.pdf_url = _pdf_url(getattr(c, "pdf_file", None))
+    # only when the query loaded it (lists / detail); never a lazy load
+    if "document" not in sa_inspect(c).unloaded and c.document is not None:
+        dto.pdf_pages = c.document.page_count
+        if c.document.thumbnail:
+            dto.pdf_thumbnail_url = f"/contracts/{c.id}/thumbnail"
     return dto
 
 
@@ -172,6 +219,56 @@ def create_contract(
     return _to_out(db_contract)
 
 
+@router.post("/bulk", response_model=BulkImportResult, openapi_extra=BULK_REQUEST_BODY)
+async def bulk_import_contracts(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import contracts from a streamed CSV (header row) or NDJSON body.
+
+    Same checks as POST /contracts/, done per chunk; `tenant_afm` may replace
+    `tenant_id`. Already-ended contracts are stored as EXPIRED. Returns a
+    per-row error report.
+    """
+    user = await get_current_user_async(request, db)
+    bulk_format(request)
+    return await crud_contract.import_contracts(
+        db,
+        iter_record_chunks(request),
+        user_id=user.id,
+        admin=user.role == UserRole.ADMIN,
+    )
+
+
+@router.get("/export")
+async def export_contracts(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    format: str = Query(default="csv", description="csv or ndjson"),
+    owner_id: int | None = Query(
+        default=None, description="Admin-only filter by property owner id"
+    ),
+):
+    """
+    Stream the caller's contracts (admin: all) as CSV or NDJSON.
+    Overdue ACTIVE contracts are reported as EXPIRED without being written.
+    """
+    user = await get_current_user_async(request, db)
+    fmt = export_format(format)
+
+    if user.role != UserRole.ADMIN:
+        if owner_id is not None:
+            raise HTTPException(status_code=403, detail="owner_id filter is admin-only")
+        owner_id = user.id
+
+    return export_response(
+        crud_contract.export_statement(owner_id=owner_id),
+        fmt,
+        filename="contracts",
+        replica=db.sync_session.info.get(REPLICA_KEY),
+    )
+
+
 @router.get("/", response_model=list[ContractOut])
 def list_contracts(
     request: Request,
@@ -189,7 +286,7 @@ def list_contracts(
     limit: int = Query(default=100, ge=1, le=500),
 ):
     user = get_current_user(request, db)
-    admin = is_admin(request, db)
+    admin = user.role == UserRole.ADMIN
 
     if owner_id is not None and not admin:
         raise HTTPException(status_code=403, detail="owner_id filter is admin-only")
@@ -199,7 +296,8 @@ def list_contracts(
     )
 
     # Keep the list fresh (UC-05 A3): expire overdue contracts before listing
-    _auto_expire_contracts(db, owner_id=effective_owner_id)
+    if inline_status_sync():
+        _auto_expire_contracts(db, owner_id=effective_owner_id)
 
     items = crud_contract.get_contracts(
         db,
@@ -214,24 +312,60 @@ def list_contracts(
     return [_to_out(c) for c in items]
 
 
+@router.get("/search", response_model=list[ContractSearchHit])
+def search_contracts(
+    request: Request,
+    q: str = Query(min_length=1, max_length=200, description="Words in the PDF"),
+    db: Session = Depends(get_db),
+    owner_id: int | None = Query(
+        default=None, description="Admin-only filter by property owner id"
+    ),
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+):
+    """
+    Full-text search over the contract PDFs (text extracted by ingestion),
+    scoped like list_contracts. PDFs not ingested yet are not found.
+    """
+    user = get_current_user(request, db)
+    admin = user.role == UserRole.ADMIN
+
+    if owner_id is not None and not admin:
+        raise HTTPException(status_code=403, detail="owner_id filter is admin-only")
+
+    effective_owner_id = (
+        owner_id if admin and owner_id is not None else (None if admin else user.id)
+    )
+
+    if inline_status_sync():
+        _auto_expire_contracts(db, owner_id=effective_owner_id)
+
+    hits = crud_contract.search_contracts(
+        db, q, owner_id=effective_owner_id, skip=skip, limit=limit
+    )
+    return [
+        ContractSearchHit(**_to_out(c).model_dump(), snippet=snippet)
+        for c, snippet in hits
+    ]
+
+
 @router.get("/{contract_id}", response_model=ContractOut)
 def get_contract(
     request: Request,
     contract_id: int,
     db: Session = Depends(get_db),
 ):
-    db_contract = crud_contract.get_contract(db, contract_id)
-    if not db_contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
-
     user = get_current_user(request, db)
-    if db_contract.property.owner_id != user.id and not is_admin(request, db):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to view this contract"
-        )
+    db_contract = _get_authorized_contract(
+        db, contract_id, user, detail="Not authorized to view this contract"
+    )
 
     today = date.today()
-    if db_contract.status == ContractStatus.ACTIVE and db_contract.end_date < today:
+    if (
+        inline_status_sync()
+        and db_contract.status == ContractStatus.ACTIVE
+        and db_contract.end_date < today
+    ):
         db_contract.status = ContractStatus.EXPIRED
 
         other_current_active_exists = (
@@ -262,13 +396,8 @@ def update_contract(
     db: Session = Depends(get_db),
 ):
     user = get_current_user(request, db)
-
-    db_contract = crud_contract.get_contract(db, contract_id)
-    if not db_contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
-
-    if not is_admin(request, db) and db_contract.property.owner_id != user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    admin = user.role == UserRole.ADMIN
+    db_contract = _get_authorized_contract(db, contract_id, user)
 
     if db_contract.status != ContractStatus.ACTIVE:
         raise HTTPException(
@@ -295,7 +424,7 @@ def update_contract(
         tenant_obj = db.query(Tenant).filter(Tenant.id == contract.tenant_id).first()
         if not tenant_obj:
             raise HTTPException(status_code=404, detail="Tenant not found")
-        if (not is_admin(request, db)) and tenant_obj.owner_id != user.id:
+        if not admin and tenant_obj.owner_id != user.id:
             raise HTTPException(
                 status_code=403, detail="Tenant does not belong to current owner"
             )
@@ -321,15 +450,9 @@ def terminate_contract(
     contract_id: int, request: Request, db: Session = Depends(get_db)
 ):
     user = get_current_user(request, db)
-
-    db_contract = crud_contract.get_contract(db, contract_id)
-    if not db_contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
-
-    if db_contract.property.owner_id != user.id and not is_admin(request, db):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to terminate this contract"
-        )
+    db_contract = _get_authorized_contract(
+        db, contract_id, user, detail="Not authorized to terminate this contract"
+    )
 
     if db_contract.status != ContractStatus.ACTIVE:
         raise HTTPException(status_code=409, detail="Contract is not active")
@@ -349,32 +472,34 @@ def terminate_contract(
 async def upload_contract_pdf(
     contract_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
 ):
     user = get_current_user(request, db)
+    db_contract = _get_authorized_contract(db, contract_id, user)
 
-    db_contract = crud_contract.get_contract(db, contract_id)
-    if not db_contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
-
-    if (not is_admin(request, db)) and db_contract.property.owner_id != user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    if db_contract.pdf_file and not is_admin(request, db):
+    if db_contract.pdf_file and user.role != UserRole.ADMIN:
         raise HTTPException(status_code=409, detail="PDF already uploaded")
 
-    dest_abs, rel = contract_pdf_destination(contract_id)
-    await save_pdf_upload(file, dest_abs_path=dest_abs)
+    rel = await save_pdf_upload(file)
 
-    db_contract.pdf_file = rel  # e.g. "contracts/<file>.pdf"
+    previous = db_contract.pdf_file
+    db_contract.pdf_file = rel  # e.g. "blobs/sha256/ab/<sha256>.pdf"
     db_contract.updated_by_id = user.id
     db.commit()
     db.refresh(db_contract)
+    for pdf_file in (previous, rel):
+        if pdf_file:
+            invalidate_upload_access_cache(pdf_file)
+    if PDF_INGEST_ENABLED:
+        # page count / thumbnail / text, after the response is sent
+        background_tasks.add_task(ingest_after_upload, rel)
     return _to_out(db_contract)
 
 
 @router.get("/{contract_id}/pdf")
+@router.head("/{contract_id}/pdf", operation_id="head_contract_pdf")
 def get_contract_pdf_inline(
     request: Request,
     contract_id: int,
@@ -383,30 +508,72 @@ def get_contract_pdf_inline(
     """
     Auth-guarded PDF access:
     - checks ownership/admin like GET /contracts/{id}
-    - serves the PDF directly (FileResponse) for robust inline viewing
+    - serves the PDF directly for robust inline viewing, with ETag /
+      Last-Modified revalidation (304) and Range requests (206)
+    - with S3 storage: 307 to a short-lived presigned bucket URL instead
     """
-    db_contract = crud_contract.get_contract(db, contract_id)
-    if not db_contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
-
     user = get_current_user(request, db)
-    if db_contract.property.owner_id != user.id and not is_admin(request, db):
-        raise HTTPException(status_code=403, detail="Not authorized")
+    db_contract = _get_authorized_contract(db, contract_id, user)
 
-    abs_path = _pdf_abs_path(getattr(db_contract, "pdf_file", None))
-    if not abs_path:
+    pdf_file = getattr(db_contract, "pdf_file", None)
+    if not pdf_file:
         raise HTTPException(status_code=404, detail="No PDF uploaded for this contract")
 
+    # Object storage: the bytes come straight from the bucket
+    key = pdf_storage_key(pdf_file)
+    url = get_storage().presigned_url(
+        key, media_type="application/pdf", filename=Path(key).name
+    )
+    if url is not None:
+        return RedirectResponse(
+            url, status_code=307, headers={"Cache-Control": "private, no-store"}
+        )
+
+    abs_path = _pdf_abs_path(pdf_file)
     if not abs_path.exists() or not abs_path.is_file():
         raise HTTPException(status_code=404, detail="PDF file missing on server")
 
     # Inline display in browser tab (content-disposition: inline)
-    filename = abs_path.name
-    return FileResponse(
-        path=str(abs_path),
+    return file_download(
+        request,
+        abs_path,
+        rel_path=abs_path.relative_to(get_upload_root().resolve()).as_posix(),
+        etag=strong_etag(pdf_file),
         media_type="application/pdf",
-        filename=filename,
-        content_disposition_type="inline",
+        filename=abs_path.name,
+    )
+
+
+@router.get("/{contract_id}/thumbnail")
+@router.head("/{contract_id}/thumbnail", operation_id="head_contract_thumbnail")
+def get_contract_thumbnail(
+    request: Request,
+    contract_id: int,
+    db: Session = Depends(get_db),
+):
+    """First-page PNG of the contract PDF (once ingestion has made one)."""
+    user = get_current_user(request, db)
+    db_contract = _get_authorized_contract(db, contract_id, user)
+
+    document = db_contract.document
+    if document is None or not document.thumbnail:
+        raise HTTPException(status_code=404, detail="No thumbnail for this contract")
+
+    storage = get_storage()
+    url = storage.presigned_url(document.thumbnail, media_type="image/png")
+    if url is not None:
+        return RedirectResponse(
+            url, status_code=307, headers={"Cache-Control": "private, no-store"}
+        )
+    abs_path = storage.local_path(document.thumbnail)
+    if not abs_path.is_file():
+        raise HTTPException(status_code=404, detail="Thumbnail missing on server")
+    return file_download(
+        request,
+        abs_path,
+        rel_path=document.thumbnail,
+        etag=strong_etag(document.thumbnail),
+        media_type="image/png",
     )
 
 
@@ -416,13 +583,8 @@ def delete_contract(
     request: Request,
     db: Session = Depends(get_db),
 ):
-    db_contract = crud_contract.get_contract(db, contract_id)
-    if not db_contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
-
     user = get_current_user(request, db)
-    if (not is_admin(request, db)) and db_contract.property.owner_id != user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    db_contract = _get_authorized_contract(db, contract_id, user)
 
     # Policy: cannot delete ACTIVE; terminate it first
     if db_contract.status == ContractStatus.ACTIVE:
@@ -432,8 +594,11 @@ def delete_contract(
         )
 
     property_id = db_contract.property_id
+    pdf_file = db_contract.pdf_file
     db.delete(db_contract)
     db.commit()
+    if pdf_file:
+        invalidate_upload_access_cache(pdf_file)
 
     # Keep property status consistent (A3)
     sync_property_status(db, property_id)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
+from app.core.profiling import ProfiledRoute
 from app.core.utils import get_current_user
 from app.crud import preference_profile as crud_pref
 from app.db.session import get_db
@@ -14,7 +15,7 @@ from app.schemas.preference_profile import (
     PreferenceProfileUpsert,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.put("/me", response_model=PreferenceProfileOut)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiling import (
+    MAX_SAMPLE_SECONDS,
+    ProfiledRoute,
+    render_collapsed,
+    sample_stacks,
+)
+from app.core.utils import require_admin
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/sample", response_class=PlainTextResponse)
+def sample_worker(
+    _: dict = Depends(require_admin),
+    seconds: float = Query(default=5.0, gt=0, le=MAX_SAMPLE_SECONDS),
+    interval_ms: float = Query(default=5.0, ge=1, le=1000),
+    include_idle: bool = Query(default=False),
+):
+    """
+    Sample every thread of this worker for `seconds` and return collapsed
+    stacks (feed to flamegraph.pl / speedscope). Only the worker that serves
+    this request is sampled.
+    """
+    stacks = sample_stacks(
+        seconds, interval=interval_ms / 1000.0, include_idle=include_idle
+    )
+    return PlainTextResponse(
+        render_collapsed(stacks),
+        headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'},
+    )
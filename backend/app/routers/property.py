@@ -2,16 +2,25 @@ from datetime import date
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.profiling import ProfiledRoute
 from app.core.status_sync import sync_overdue_contracts_global, sync_property_status
-from app.core.utils import get_current_user, is_admin
+from app.core.bulk import BULK_REQUEST_BODY, bulk_format, iter_record_chunks
+from app.core.export import export_format, export_response
+from app.core.jobs import inline_status_sync
+from app.core.utils import get_current_user, get_current_user_async, is_admin
 from app.crud import property as crud_property
-from app.db.session import get_db
-from app.models.area import Area
+from app.crud.area import get_active_area
+from app.db.async_session import get_async_db, get_async_read_db, on_primary
+from app.db.session import REPLICA_KEY, get_db
 from app.models.contract import Contract, ContractStatus
 from app.models.property import Property, PropertyStatus
 from app.models.role import UserRole
+from app.models.user import User
+from app.schemas.bulk import BulkImportResult
 from app.schemas.property import (
     PropertyCreate,
     PropertyOut,
@@ -21,7 +30,7 @@ from app.schemas.property import (
     PropertyUpdate,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/", response_model=PropertyOut)
@@ -30,13 +39,8 @@ def create_property(
 ):
     user = get_current_user(request, db)
 
-    exists = (
-        db.query(Area.id)
-        .filter(Area.id == property.area_id, Area.is_active)  # noqa: E712
-        .first()
-        is not None
-    )
-    if not exists:
+    area = get_active_area(db, property.area_id)
+    if area is None:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Invalid area_id",
@@ -59,8 +63,6 @@ def create_property(
                 detail="owner_id is required for admins",
             )
 
-        from app.models.user import User
-
         owner = db.query(User).filter(User.id == property.owner_id).first()
         if owner is None:
             raise HTTPException(
@@ -82,7 +84,35 @@ def create_property(
         )
 
     return crud_property.create_property(
-        db=db, property=property, owner_id=target_owner_id
+        db=db, property=property, owner_id=target_owner_id, area=area
+    )
+
+
+@router.post("/bulk", response_model=BulkImportResult, openapi_extra=BULK_REQUEST_BODY)
+async def bulk_import_properties(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import many properties from a streamed CSV (header row) or NDJSON body.
+
+    Columns/keys are those of PropertyCreate; `area_code` may replace
+    `area_id`. Owners import for themselves, admins must give `owner_id` per
+    row. Returns a per-row error report; valid rows are inserted in chunks.
+    """
+    user = await get_current_user_async(request, db)
+    if user.role == UserRole.OWNER:
+        owner_id = user.id
+    elif user.role == UserRole.ADMIN:
+        owner_id = None
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only owners or admins can create properties",
+        )
+    bulk_format(request)
+
+    return await crud_property.import_properties(
+        db, iter_record_chunks(request), owner_id=owner_id
     )
 
 
@@ -103,8 +133,9 @@ def list_properties(
         if owner_id is not None:
             q = q.filter(Property.owner_id == owner_id)
         items = q.order_by(Property.id.desc()).offset(skip).limit(limit).all()
-        for p in items:
-            sync_property_status(db, p.id)
+        if inline_status_sync():
+            for p in items:
+                sync_property_status(db, p.id)
         return items
 
     if user.role == UserRole.OWNER:
@@ -118,8 +149,9 @@ def list_properties(
             .limit(limit)
             .all()
         )
-        for p in items:
-            sync_property_status(db, p.id)
+        if inline_status_sync():
+            for p in items:
+                sync_property_status(db, p.id)
         return items
 
     raise HTTPException(
@@ -128,16 +160,53 @@ def list_properties(
     )
 
 
+@router.get("/export")
+async def export_properties(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    format: str = Query(default="csv", description="csv or ndjson"),
+    owner_id: int | None = Query(
+        default=None, description="Admin-only filter by property owner id"
+    ),
+):
+    """
+    Stream the caller's properties (admin: all) as CSV or NDJSON.
+    Statuses are computed in the query; nothing is synced or written.
+    """
+    user = await get_current_user_async(request, db)
+    fmt = export_format(format)
+
+    if user.role == UserRole.OWNER:
+        if owner_id is not None:
+            raise HTTPException(status_code=403, detail="owner_id filter is admin-only")
+        owner_id = user.id
+    elif user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only owners or admins can export properties",
+        )
+
+    return export_response(
+        crud_property.export_statement(owner_id=owner_id),
+        fmt,
+        filename="properties",
+        replica=db.sync_session.info.get(REPLICA_KEY),
+    )
+
+
 @router.get("/search", response_model=PropertySearchResponse)
-def search_properties(
+async def search_properties(
     filters: PropertySearchFilters = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     # Public endpoint (UC-03): no auth required
     # Ensure overdue ACTIVE contracts are expired so property availability is not stale.
-    sync_overdue_contracts_global(db)
+    # Runs on the primary; the search itself may be served by a replica.
+    if inline_status_sync():
+        with on_primary(db):
+            await db.run_sync(sync_overdue_contracts_global)
 
-    items, total = crud_property.search_properties(db=db, filters=filters)
+    items, total = await crud_property.search_properties_async(db=db, filters=filters)
     return {
         "meta": PropertySearchMeta(
             total=total,
@@ -150,18 +219,19 @@ def search_properties(
 
 
 @router.get("/{property_id}", response_model=PropertyOut)
-def get_property(
+async def get_property(
     request: Request,
     property_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    db_property = crud_property.get_property(db, property_id)
+    db_property = await crud_property.get_property_async(db, property_id)
     if not db_property:
         raise HTTPException(status_code=404, detail="Property not found")
 
     # A3: sync on access so expired contracts flip property to AVAILABLE immediately.
-    sync_property_status(db, property_id)
-    db.refresh(db_property)
+    if inline_status_sync():
+        await db.run_sync(sync_property_status, property_id)
+        await db.refresh(db_property)
 
     if db_property.status == PropertyStatus.AVAILABLE:
         return db_property
@@ -171,9 +241,8 @@ def get_property(
     if not user_payload or not user_payload.get("sub"):
         raise HTTPException(status_code=404, detail="Property not found")
 
-    from app.models.user import User  # <-- ensure User is defined
-
-    user = db.query(User).filter(User.username == user_payload["sub"]).first()
+    result = await db.execute(select(User).where(User.username == user_payload["sub"]))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
@@ -198,25 +267,20 @@ def update_property(
         raise HTTPException(status_code=404, detail="Property not found")
     # Check ownership
     user = get_current_user(request, db)
-    if db_property.owner_id != user.id and not is_admin(request, db):
+    if db_property.owner_id != user.id and user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=403, detail="Not authorized to update this property"
         )
 
+    area = None
     if property.area_id is not None:
-        exists = (
-            db.query(Area.id)
-            .filter(Area.id == property.area_id, Area.is_active)  # noqa: E712
-            .first()
-            is not None
-        )
-        if not exists:
+        area = get_active_area(db, property.area_id)
+        if area is None:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Invalid area_id",
             )
-    db_property = crud_property.update_property(db, property_id, property)
-    return db_property
+    return crud_property.update_property(db, db_property, property, area=area)
 
 
 @router.delete("/{property_id}", response_model=PropertyOut)
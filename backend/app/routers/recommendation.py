@@ -2,16 +2,21 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
+from app.core.profiling import ProfiledRoute
 from app.core.recommendation_config import (
     CRITERIA_ORDER,
     PROPERTY_TYPE_MAPPING,
     STRICT_PROPERTY_TYPE_MAPPING,
 )
-from app.core.utils import get_current_user
-from app.db.session import get_db
+from app.core.utils import get_current_user_async
+from app.core.workers import run_cpu_bound
+from app.db.async_session import get_async_read_db
 from app.models.criterion import Criterion
+from app.models.pairwise_comparison import PairwiseComparison
 from app.models.area import Area
 from app.models.preference_profile import PreferenceProfile
 from app.models.property import Property, PropertyStatus
@@ -20,45 +25,47 @@ from app.schemas.recommendation import RecommendationItem, RecommendationsRespon
 from app.services.ahp import CR_THRESHOLD, compute_ahp
 from app.services.topsis import topsis_rank
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 # Accept both /recommendations and /recommendations/ without redirect
 @router.get("", response_model=RecommendationsResponse)
 @router.get("/", response_model=RecommendationsResponse, include_in_schema=False)
-def get_recommendations(
+async def get_recommendations(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    user = get_current_user(request, db)
+    user = await get_current_user_async(request, db)
 
-    profile = (
-        db.query(PreferenceProfile).filter(PreferenceProfile.user_id == user.id).first()
+    result = await db.execute(
+        select(PreferenceProfile).where(PreferenceProfile.user_id == user.id)
     )
+    profile = result.scalars().first()
     if profile is None:
         raise HTTPException(
             status_code=404,
             detail="Preference profile not found. Create it via PUT /preference-profiles/me",
         )
 
-    from app.models.pairwise_comparison import PairwiseComparison
-
-    pcs = (
-        db.query(PairwiseComparison)
+    result = await db.execute(
+        select(PairwiseComparison)
         .options(
             joinedload(PairwiseComparison.criterion_a),
             joinedload(PairwiseComparison.criterion_b),
         )
-        .filter(PairwiseComparison.profile_id == profile.id)
-        .all()
+        .where(PairwiseComparison.profile_id == profile.id)
     )
+    pcs = result.scalars().all()
     if not pcs:
         raise HTTPException(
             status_code=409,
             detail="Pairwise comparisons not set. Submit them via POST /preference-profiles/me/pairwise-comparisons",
         )
 
-    criteria = db.query(Criterion).filter(Criterion.is_active).all()  # noqa: E712
+    result = await db.execute(
+        select(Criterion).where(Criterion.is_active)  # noqa: E712
+    )
+    criteria = result.scalars().all()
     key_to_criterion = {c.key: c for c in criteria}
 
     missing_required = [k for k in CRITERIA_ORDER if k not in key_to_criterion]
@@ -93,13 +100,13 @@ def get_recommendations(
 
     weights = [ahp.weights[k] for k in criteria_keys]
 
-    rows = (
-        db.query(Property, Area)
+    result = await db.execute(
+        select(Property, Area)
         .options(joinedload(Property.area))
         .outerjoin(Area, Area.id == Property.area_id)
-        .filter(Property.status == PropertyStatus.AVAILABLE)
-        .all()
+        .where(Property.status == PropertyStatus.AVAILABLE)
     )
+    rows = result.all()
 
     if not rows:
         return RecommendationsResponse(
@@ -155,8 +162,12 @@ def get_recommendations(
             },
         )
 
-    ranked = topsis_rank(
-        decision_matrix=decision_matrix, weights=weights, is_benefit=is_benefit
+    # CPU-bound: keep it off the event loop
+    ranked = await run_cpu_bound(
+        topsis_rank,
+        decision_matrix=decision_matrix,
+        weights=weights,
+        is_benefit=is_benefit,
     )
 
     items = [
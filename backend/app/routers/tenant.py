@@ -1,15 +1,23 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.utils import get_current_user, is_admin
+from app.core.bulk import BULK_REQUEST_BODY, bulk_format, iter_record_chunks
+from app.core.export import export_format, export_response
+from app.core.profiling import ProfiledRoute
+from app.core.utils import get_current_user, get_current_user_async, is_admin
 from app.crud import tenant as crud_tenant
-from app.db.session import get_db
+from app.db.async_session import get_async_db, get_async_read_db
+from app.db.session import REPLICA_KEY, get_db
 from app.models.contract import Contract, ContractStatus
+from app.models.role import UserRole
+from app.models.tenant import Tenant
+from app.schemas.bulk import BulkImportResult
 from app.schemas.tenant import TenantCreate, TenantOut, TenantUpdate
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/", response_model=TenantOut)
@@ -27,6 +35,50 @@ def create_tenant(
     return crud_tenant.create_tenant(db, tenant, owner_id, created_by_id=user.id)
 
 
+@router.post("/bulk", response_model=BulkImportResult, openapi_extra=BULK_REQUEST_BODY)
+async def bulk_import_tenants(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import tenants from a streamed CSV (header row) or NDJSON body.
+    Same rules as POST /tenants/; returns a per-row error report.
+    """
+    user = await get_current_user_async(request, db)
+    bulk_format(request)
+    return await crud_tenant.import_tenants(
+        db,
+        iter_record_chunks(request),
+        user_id=user.id,
+        admin=user.role == UserRole.ADMIN,
+    )
+
+
+@router.get("/export")
+async def export_tenants(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    format: str = Query(default="csv", description="csv or ndjson"),
+    owner_id: int | None = Query(
+        default=None, description="Admin-only filter by owner id"
+    ),
+):
+    """Stream the caller's tenants (admin: all) as CSV or NDJSON."""
+    user = await get_current_user_async(request, db)
+    fmt = export_format(format)
+
+    if user.role != UserRole.ADMIN:
+        if owner_id is not None:
+            raise HTTPException(status_code=403, detail="owner_id filter is admin-only")
+        owner_id = user.id
+
+    return export_response(
+        crud_tenant.export_statement(owner_id=owner_id),
+        fmt,
+        filename="tenants",
+        replica=db.sync_session.info.get(REPLICA_KEY),
+    )
+
+
 @router.get("/", response_model=List[TenantOut])
 def list_tenants(
     request: Request,
@@ -50,19 +102,24 @@ def list_tenants(
     return crud_tenant.list_tenants(db, owner_id=user.id, skip=skip, limit=limit)
 
 
-@router.get("/{tenant_id}", response_model=TenantOut)
-def get_tenant(request: Request, tenant_id: int, db: Session = Depends(get_db)):
-    user = get_current_user(request, db)
+def _get_authorized_tenant(
+    db: Session, tenant_id: int, user, *, detail: str = "Not authorized"
+) -> Tenant:
+    # the owner check needs no query: admin comes from the loaded user
     t = crud_tenant.get_tenant(db, tenant_id)
     if not t:
         raise HTTPException(status_code=404, detail="Tenant not found")
+    if user.role != UserRole.ADMIN and t.owner_id != user.id:
+        raise HTTPException(status_code=403, detail=detail)
+    return t
 
-    if (not is_admin(request, db)) and t.owner_id != user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to view this tenant"
-        )
 
-    return t
+@router.get("/{tenant_id}", response_model=TenantOut)
+def get_tenant(request: Request, tenant_id: int, db: Session = Depends(get_db)):
+    user = get_current_user(request, db)
+    return _get_authorized_tenant(
+        db, tenant_id, user, detail="Not authorized to view this tenant"
+    )
 
 
 @router.put("/{tenant_id}", response_model=TenantOut)
@@ -73,13 +130,7 @@ def update_tenant(
     db: Session = Depends(get_db),
 ):
     user = get_current_user(request, db)
-
-    db_tenant = crud_tenant.get_tenant(db, tenant_id)
-    if not db_tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    if (not is_admin(request, db)) and db_tenant.owner_id != user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    _get_authorized_tenant(db, tenant_id, user)
 
     updated = crud_tenant.update_tenant(db, tenant_id, tenant, updated_by_id=user.id)
     if not updated:
@@ -90,14 +141,9 @@ def update_tenant(
 @router.delete("/{tenant_id}", response_model=TenantOut)
 def delete_tenant(request: Request, tenant_id: int, db: Session = Depends(get_db)):
     user = get_current_user(request, db)
-    t = crud_tenant.get_tenant(db, tenant_id)
-    if not t:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    if (not is_admin(request, db)) and t.owner_id != user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to delete this tenant"
-        )
+    _get_authorized_tenant(
+        db, tenant_id, user, detail="Not authorized to delete this tenant"
+    )
 
     # UC-06 A2: prevent deletion when tenant participates in an ACTIVE contract.
     active_contract_exists = (
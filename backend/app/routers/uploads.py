@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import PurePosixPath
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import RedirectResponse
+from sqlalchemy.orm import Session
+
+from app.core.downloads import file_download, strong_etag
+from app.core.profiling import ProfiledRoute
+from app.core.upload_access import can_read_upload
+from app.core.uploads import get_storage
+from app.core.utils import get_current_user_payload
+from app.db.session import get_db
+
+router = APIRouter(route_class=ProfiledRoute)
+
+_MEDIA_TYPES = {".pdf": "application/pdf", ".png": "image/png"}
+
+
+@router.get("/{key:path}")
+@router.head("/{key:path}", operation_id="head_upload")
+def get_upload(
+    request: Request,
+    key: str,
+    db: Session = Depends(get_db),
+):
+    """
+    Stored upload by key (the `pdf_url` of a contract), for users who may read
+    the contract it belongs to. Replaces the former public static mount:
+    - authorization cached briefly per (user, file): repeat fetches and 304
+      revalidations do not touch the database
+    - same serving path as GET /contracts/{id}/pdf: zero-copy file response
+      (or proxy offload), ETag / Range, `Cache-Control: private`
+    - with S3 storage: 307 to a short-lived presigned bucket URL
+    """
+    username = get_current_user_payload(request)["sub"]
+
+    key = key.lstrip("/")
+    parts = PurePosixPath(key).parts
+    if not parts or any(p in {".", ".."} for p in parts) or "\\" in key:
+        raise HTTPException(status_code=404, detail="File not found")
+    # 404 rather than 403: do not confirm that someone else's file exists
+    if not can_read_upload(db, username, key):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    media_type = _MEDIA_TYPES.get(
+        PurePosixPath(key).suffix.lower(), "application/octet-stream"
+    )
+    storage = get_storage()
+    url = storage.presigned_url(key, media_type=media_type)
+    if url is not None:
+        return RedirectResponse(
+            url, status_code=307, headers={"Cache-Control": "private, no-store"}
+        )
+
+    abs_path = storage.local_path(key)
+    if not abs_path.is_file():
+        raise HTTPException(status_code=404, detail="File not found")
+    return file_download(
+        request,
+        abs_path,
+        rel_path=key,
+        etag=strong_etag(key),
+        media_type=media_type,
+    )
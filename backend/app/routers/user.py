@@ -4,13 +4,14 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
+from app.core.profiling import ProfiledRoute
 from app.core.utils import get_current_user, is_admin, require_admin
 from app.crud import user as crud_user
 from app.db.session import get_db
 from app.models.role import UserRole
 from app.schemas.user import UserCreate, UserOut, UserUpdate
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/", response_model=UserOut)
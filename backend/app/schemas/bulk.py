@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class BulkRowError(BaseModel):
+    # 1-based data row (CSV header and blank lines are not counted)
+    row: int
+    errors: list[str]
+
+
+class BulkImportResult(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: list[BulkRowError]
+    # True when more rows failed than are listed in `errors`
+    errors_truncated: bool = False
@@ -61,9 +61,17 @@ class ContractOut(BaseModel):
     status: ContractStatus
     pdf_file: Optional[str] = None
     pdf_url: Optional[str] = None
+    # from PDF ingestion; None until it has run
+    pdf_pages: Optional[int] = None
+    pdf_thumbnail_url: Optional[str] = None
 
     terminated_at: datetime | None = None
     created_at: datetime | None = None
     updated_at: datetime | None = None
     created_by_id: int | None = None
     updated_by_id: int | None = None
+
+
+class ContractSearchHit(ContractOut):
+    # matching passage of the PDF text, matched terms in [brackets]
+    snippet: Optional[str] = None
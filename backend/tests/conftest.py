@@ -56,6 +56,8 @@ def reset_db(alembic_cfg: Config):
 
     This replaces Base.metadata.create_all() usage in individual tests.
     """
+    from app.core.upload_access import invalidate_upload_access_cache
+    from app.crud.area import invalidate_area_cache
     from app.db.session import engine
     from tests.utils import seed_locked_criteria_for_tests
 
@@ -78,5 +80,7 @@ def reset_db(alembic_cfg: Config):
                 conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{t}"')
 
     command.upgrade(alembic_cfg, "head")
+    invalidate_area_cache()
+    invalidate_upload_access_cache()
     seed_locked_criteria_for_tests()
     yield
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import inspect
+
+import anyio
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import workers
+from app.db.async_session import async_database_url
+from app.main import app
+from app.services.topsis import topsis_rank
+from tests.utils import create_property, register_and_login
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("sqlite:///./rentpro_dev.db", "sqlite+aiosqlite:///./rentpro_dev.db"),
+        (
+            "postgresql+psycopg2://u:p@db:5432/rentpro",
+            "postgresql+asyncpg://u:p@db:5432/rentpro",
+        ),
+        ("postgresql://u:p@db/rentpro", "postgresql+asyncpg://u:p@db/rentpro"),
+    ],
+)
+def test_async_database_url(url: str, expected: str) -> None:
+    assert async_database_url(url) == expected
+
+
+def test_async_database_url_rejects_unknown_backend() -> None:
+    with pytest.raises(RuntimeError):
+        async_database_url("mysql://u:p@db/rentpro")
+
+
+def test_hot_read_endpoints_are_async() -> None:
+    from app.routers import area, property, recommendation
+
+    for endpoint in (
+        property.search_properties,
+        property.get_property,
+        area.list_areas,
+        recommendation.get_recommendations,
+    ):
+        assert inspect.iscoroutinefunction(endpoint), endpoint.__name__
+
+
+def test_async_property_detail_and_search() -> None:
+    _, headers = register_and_login(
+        client, "owner_async", "pw", "owner_async@example.com", is_owner=True
+    )
+    prop = create_property(client, headers)
+
+    resp = client.get(f"/properties/{prop['id']}")
+    assert resp.status_code == 200
+    assert resp.json()["area"]["id"] == prop["area"]["id"]
+
+    resp = client.get("/properties/search")
+    assert resp.status_code == 200
+    assert resp.json()["meta"]["total"] == 1
+
+
+@pytest.mark.parametrize("cpu_workers", [0, 1])
+def test_run_cpu_bound(monkeypatch, cpu_workers: int) -> None:
+    monkeypatch.setattr(workers, "CPU_WORKERS", cpu_workers)
+    kwargs = dict(
+        decision_matrix=[[1000.0, 50.0], [800.0, 40.0]],
+        weights=[0.5, 0.5],
+        is_benefit=[False, True],
+    )
+    try:
+        ranked = anyio.run(lambda: workers.run_cpu_bound(topsis_rank, **kwargs))
+    finally:
+        workers.shutdown_cpu_workers()
+    assert ranked == topsis_rank(**kwargs)
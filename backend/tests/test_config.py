@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.config import env_bool, env_float, env_int
+
+
+def test_env_helpers_default_when_unset_or_blank(monkeypatch) -> None:
+    monkeypatch.delenv("RENTPRO_TEST_SETTING", raising=False)
+    assert env_int("RENTPRO_TEST_SETTING", 3, minimum=1) == 3
+    monkeypatch.setenv("RENTPRO_TEST_SETTING", "  ")
+    assert env_float("RENTPRO_TEST_SETTING", 1.5) == 1.5
+    assert env_bool("RENTPRO_TEST_SETTING", True) is True
+
+
+def test_env_helpers_parse_values(monkeypatch) -> None:
+    monkeypatch.setenv("RENTPRO_TEST_SETTING", " 0 ")
+    assert env_int("RENTPRO_TEST_SETTING", 3, minimum=0) == 0
+    assert env_float("RENTPRO_TEST_SETTING", 1.5, minimum=0) == 0.0
+    assert env_bool("RENTPRO_TEST_SETTING", True) is False
+    monkeypatch.setenv("RENTPRO_TEST_SETTING", "Yes")
+    assert env_bool("RENTPRO_TEST_SETTING", False) is True
+
+
+@pytest.mark.parametrize(
+    "raw, read",
+    [
+        ("ten", lambda: env_int("RENTPRO_TEST_SETTING", 1)),
+        ("0", lambda: env_int("RENTPRO_TEST_SETTING", 1, minimum=1)),
+        ("fast", lambda: env_float("RENTPRO_TEST_SETTING", 1.0)),
+        ("-0.5", lambda: env_float("RENTPRO_TEST_SETTING", 1.0, minimum=0)),
+        ("maybe", lambda: env_bool("RENTPRO_TEST_SETTING", True)),
+    ],
+)
+def test_env_helpers_reject_bad_values(monkeypatch, raw: str, read) -> None:
+    monkeypatch.setenv("RENTPRO_TEST_SETTING", raw)
+    with pytest.raises(RuntimeError, match="RENTPRO_TEST_SETTING"):
+        read()
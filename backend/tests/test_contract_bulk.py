@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.contract import Contract, ContractStatus
+from app.models.property import Property, PropertyStatus
+from tests.utils import create_property, register_and_login
+
+client = TestClient(app)
+
+CSV_HEADERS = {"Content-Type": "text/csv"}
+NDJSON_HEADERS = {"Content-Type": "application/x-ndjson"}
+
+
+def _ndjson(rows: list[dict]) -> str:
+    return "".join(json.dumps(r) + "\n" for r in rows)
+
+
+def test_bulk_tenant_import_checks_afm_uniqueness() -> None:
+    _, headers = register_and_login(
+        client, "bt_owner", "pw", "bt_owner@example.com", is_owner=True
+    )
+    resp = client.post(
+        "/tenants/",
+        json={"name": "Existing", "afm": "111111111"},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+
+    body = (
+        "name,afm,phone,email\n"
+        "Alice,222222222,,alice@example.com\n"
+        "Bob,111111111,,\n"
+        "Carol,333333333,,\n"
+        "Carol again,333333333,,\n"
+        "Dave,12,,\n"
+    )
+    resp = client.post(
+        "/tenants/bulk", content=body, headers={**headers, **CSV_HEADERS}
+    )
+    assert resp.status_code == 200, resp.text
+    result = resp.json()
+    assert (result["received"], result["inserted"], result["failed"]) == (5, 2, 3)
+    assert [e["row"] for e in result["errors"]] == [2, 4, 5]
+    assert result["errors"][2]["errors"][0].startswith("afm:")
+
+    names = {t["name"] for t in client.get("/tenants/", headers=headers).json()}
+    assert names == {"Existing", "Alice", "Carol"}
+
+
+def test_bulk_contract_import_enforces_one_active_per_property() -> None:
+    _, headers = register_and_login(
+        client, "bc_owner", "pw", "bc_owner@example.com", is_owner=True
+    )
+    _, other_headers = register_and_login(
+        client, "bc_other", "pw", "bc_other@example.com", is_owner=True
+    )
+    p1 = create_property(client, headers, title="P1")["id"]
+    p2 = create_property(client, headers, title="P2")["id"]
+    foreign = create_property(client, other_headers, title="Foreign")["id"]
+    for afm in ("444444444", "555555555"):
+        resp = client.post(
+            "/tenants/", json={"name": f"T{afm}", "afm": afm}, headers=headers
+        )
+        assert resp.status_code == 200, resp.text
+
+    today = date.today()
+    current = {
+        "start_date": (today - timedelta(days=30)).isoformat(),
+        "end_date": (today + timedelta(days=300)).isoformat(),
+        "rent_amount": 500,
+    }
+    past = {
+        "start_date": (today - timedelta(days=400)).isoformat(),
+        "end_date": (today - timedelta(days=40)).isoformat(),
+        "rent_amount": 450,
+    }
+    rows = [
+        {"property_id": p1, "tenant_afm": "444444444", **current},
+        {"property_id": p1, "tenant_afm": "555555555", **current},
+        {"property_id": p1, "tenant_afm": "555555555", **past},
+        {"property_id": p2, "tenant_afm": "999999999", **current},
+        {"property_id": foreign, "tenant_afm": "444444444", **current},
+    ]
+    resp = client.post(
+        "/contracts/bulk",
+        content=_ndjson(rows),
+        headers={**headers, **NDJSON_HEADERS},
+    )
+    assert resp.status_code == 200, resp.text
+    result = resp.json()
+    assert (result["received"], result["inserted"], result["failed"]) == (5, 2, 3)
+    errors = {e["row"]: e["errors"][0] for e in result["errors"]}
+    assert "ACTIVE" in errors[2]
+    assert errors[4].startswith("tenant_afm:")
+    assert set(errors) == {2, 4, 5}
+
+    contracts = client.get("/contracts/", headers=headers).json()
+    statuses = sorted(c["status"] for c in contracts if c["property_id"] == p1)
+    assert statuses == ["ACTIVE", "EXPIRED"]
+
+    assert client.get(f"/properties/{p1}", headers=headers).json()["status"] == "RENTED"
+    assert (
+        client.get(f"/properties/{p2}", headers=headers).json()["status"] == "AVAILABLE"
+    )
+
+
+def test_bulk_contract_import_does_not_touch_other_owners_properties() -> None:
+    _, headers = register_and_login(
+        client, "bc_owner2", "pw", "bc_owner2@example.com", is_owner=True
+    )
+    other, other_headers = register_and_login(
+        client, "bc_other2", "pw", "bc_other2@example.com", is_owner=True
+    )
+    foreign = create_property(client, other_headers, title="Foreign 2")["id"]
+    resp = client.post(
+        "/tenants/", json={"name": "Theirs", "afm": "616161616"}, headers=other_headers
+    )
+    their_tenant = resp.json()["id"]
+    resp = client.post(
+        "/tenants/", json={"name": "Mine", "afm": "717171717"}, headers=headers
+    )
+    my_tenant = resp.json()["id"]
+
+    today = date.today()
+    db = SessionLocal()
+    try:
+        overdue = Contract(
+            property_id=foreign,
+            tenant_id=their_tenant,
+            start_date=today - timedelta(days=60),
+            end_date=today - timedelta(days=1),
+            rent_amount=400.0,
+            status=ContractStatus.ACTIVE,
+        )
+        db.add(overdue)
+        db.query(Property).filter(Property.id == foreign).update(
+            {Property.status: PropertyStatus.RENTED}
+        )
+        db.commit()
+        overdue_id = overdue.id
+    finally:
+        db.close()
+
+    current = {
+        "start_date": today.isoformat(),
+        "end_date": (today + timedelta(days=300)).isoformat(),
+        "rent_amount": 500,
+    }
+    rows = [
+        {"property_id": foreign, "tenant_id": my_tenant, **current},
+        {"property_id": foreign, "tenant_id": their_tenant, **current},
+    ]
+    resp = client.post(
+        "/contracts/bulk", content=_ndjson(rows), headers={**headers, **NDJSON_HEADERS}
+    )
+    assert resp.status_code == 200, resp.text
+    result = resp.json()
+    assert (result["inserted"], result["failed"]) == (0, 2)
+    assert all("Not authorized" in e["errors"][0] for e in result["errors"])
+
+    db = SessionLocal()
+    try:
+        assert db.get(Contract, overdue_id).status == ContractStatus.ACTIVE
+        assert db.get(Property, foreign).status == PropertyStatus.RENTED
+    finally:
+        db.close()
@@ -5,10 +5,13 @@ from fastapi.testclient import TestClient
 
 from app.db.session import SessionLocal
 from app.main import app
+from app.models.contract import Contract, ContractStatus
 from app.models.property import Property, PropertyStatus
 from app.models.tenant import Tenant
 from tests.utils import (
+    assert_max_queries,
     create_property,
+    db_query_count,
     login_headers,
     make_admin,
     register_and_login,
@@ -301,6 +304,74 @@ def test_gap3_auto_expire_on_list_sets_expired_and_frees_property():
     assert _get_property_status_db(prop["id"]) == "AVAILABLE"
 
 
+def _seed_overdue_rented(owner_headers, tenant_id: int, n: int) -> list[int]:
+    ids = [
+        create_property(client, owner_headers, title=f"Overdue {i}")["id"]
+        for i in range(n)
+    ]
+    db = SessionLocal()
+    try:
+        for pid in ids:
+            db.add(
+                Contract(
+                    property_id=pid,
+                    tenant_id=tenant_id,
+                    start_date=date.today() - timedelta(days=30),
+                    end_date=date.today() - timedelta(days=1),
+                    rent_amount=500.0,
+                    status=ContractStatus.ACTIVE,
+                )
+            )
+        db.query(Property).filter(Property.id.in_(ids)).update(
+            {Property.status: PropertyStatus.RENTED}
+        )
+        db.commit()
+    finally:
+        db.close()
+    return ids
+
+
+def test_gap3_auto_expire_is_set_based_and_owner_scoped():
+    owner, owner_headers = register_and_login(
+        client, "uc05_owner_q", "pw", "uc05_owner_q@example.com", is_owner=True
+    )
+    other, other_headers = register_and_login(
+        client, "uc05_owner_r", "pw", "uc05_owner_r@example.com", is_owner=True
+    )
+    mine = _seed_overdue_rented(
+        owner_headers, _create_tenant_db(owner["id"], afm="121212121"), 6
+    )
+    theirs = _seed_overdue_rented(
+        other_headers, _create_tenant_db(other["id"], afm="131313131"), 1
+    )
+
+    small = client.get("/contracts/", params={"limit": 1}, headers=owner_headers)
+    assert small.status_code == 200, small.text
+    assert [c["status"] for c in small.json()] == ["EXPIRED"]
+    assert all(_get_property_status_db(pid) == "AVAILABLE" for pid in mine)
+    assert _get_property_status_db(theirs[0]) == "RENTED"
+
+    large = client.get("/contracts/", params={"limit": 100}, headers=owner_headers)
+    assert len(large.json()) == 6
+    # nothing left overdue: the expiry check is one SELECT, no UPDATEs
+    assert db_query_count(large) < db_query_count(small)
+    # and listing costs the same whatever the page size
+    again = client.get("/contracts/", params={"limit": 1}, headers=owner_headers)
+    assert db_query_count(large) == db_query_count(again)
+
+
+def test_gap3_auto_expire_writes_nothing_when_nothing_is_overdue():
+    _, owner_headers = register_and_login(
+        client, "uc05_owner_s", "pw", "uc05_owner_s@example.com", is_owner=True
+    )
+    with assert_max_queries(10) as statements:
+        for path in ("/contracts/", "/contracts/search"):
+            params = {"q": "μίσθωση"} if path.endswith("search") else {}
+            r = client.get(path, params=params, headers=owner_headers)
+            assert r.status_code == 200, r.text
+    assert not [s for s in statements if s.lstrip().upper().startswith("UPDATE")]
+
+
 def test_l2_contract_list_filters_running_today_and_status():
     owner, owner_headers = register_and_login(
         client, "l2_owner_a", "pw", "l2_owner_a@example.com", is_owner=True
@@ -422,3 +493,43 @@ def test_l2_pdf_url_in_list_and_pdf_inline_with_auth():
         follow_redirects=False,
     )
     assert forbidden.status_code == 403
+
+
+def test_contract_and_tenant_detail_authorize_in_the_lookup_query():
+    owner, owner_headers = register_and_login(
+        client, "uc05_owner_s", "pw", "uc05_owner_s@example.com", is_owner=True
+    )
+    _, other_headers = register_and_login(
+        client, "uc05_owner_t", "pw", "uc05_owner_t@example.com", is_owner=True
+    )
+    prop = create_property(client, owner_headers, title="UC05 Scoped")
+    tenant_id = _create_tenant_db(owner_id=owner["id"], afm="141414141")
+    c = client.post(
+        "/contracts/",
+        json={
+            "property_id": prop["id"],
+            "tenant_id": tenant_id,
+            "start_date": str(date.today()),
+            "end_date": str(date.today() + timedelta(days=30)),
+            "rent_amount": 600.0,
+        },
+        headers=owner_headers,
+    )
+    assert c.status_code == 200, c.text
+    contract_id = c.json()["id"]
+
+    # one query for the user, one for the scoped row
+    r = client.get(f"/contracts/{contract_id}", headers=owner_headers)
+    assert r.status_code == 200, r.text
+    assert db_query_count(r) == 2
+    r = client.get(f"/tenants/{tenant_id}", headers=owner_headers)
+    assert r.status_code == 200, r.text
+    assert db_query_count(r) == 2
+
+    r = client.get(f"/contracts/{contract_id}", headers=other_headers)
+    assert r.status_code == 403
+    assert db_query_count(r) == 2
+    assert client.get("/contracts/999999", headers=owner_headers).status_code == 404
+    r = client.post(f"/contracts/{contract_id}/terminate", headers=other_headers)
+    assert r.status_code == 403
+    assert client.get(f"/tenants/{tenant_id}", headers=other_headers).status_code == 403
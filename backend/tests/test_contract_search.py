@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import io
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.core import pdf_ingest
+from app.core.storage import FilesystemStorage
+from app.crud.contract import _fts5_query, search_contracts
+from app.main import app
+from tests.utils import (
+    assert_max_queries,
+    create_property,
+    make_admin,
+    register_and_login,
+)
+
+client = TestClient(app)
+
+TEXTS = {
+    b"%PDF-1.4 lease one": "Residential lease. Pets are not allowed in the apartment.",
+    b"%PDF-1.4 lease two": "Residential lease. Small pets allowed; parking space included.",
+    b"%PDF-1.4 lease three": "Μίσθωση κατοικίας. Επιτρέπονται κατοικίδια ζώα.",
+}
+
+
+@pytest.fixture(autouse=True)
+def _fake_extraction(monkeypatch):
+    monkeypatch.setattr(
+        pdf_ingest,
+        "extract_pdf_facts",
+        lambda data: {"page_count": 1, "text": TEXTS[data], "thumbnail": None},
+    )
+
+
+def _contract_with_pdf(headers: dict, tenant_id: int, content: bytes) -> int:
+    contract_id = client.post(
+        "/contracts/",
+        json={
+            "property_id": create_property(client, headers)["id"],
+            "tenant_id": tenant_id,
+            "start_date": str(date.today()),
+            "end_date": str(date.today() + timedelta(days=365)),
+            "rent_amount": 600.0,
+        },
+        headers=headers,
+    ).json()["id"]
+    resp = client.post(
+        f"/contracts/{contract_id}/upload",
+        files={"file": ("c.pdf", io.BytesIO(content), "application/pdf")},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    return contract_id
+
+
+def _owner(name: str, afm: str) -> tuple[dict, dict, int]:
+    user, headers = register_and_login(
+        client, name, "pw", f"{name}@example.com", is_owner=True
+    )
+    tenant_id = client.post(
+        "/tenants/", json={"name": f"{name} T", "afm": afm}, headers=headers
+    ).json()["id"]
+    return user, headers, tenant_id
+
+
+def _search(headers: dict, **params) -> list[dict]:
+    resp = client.get("/contracts/search", params=params, headers=headers)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_fts5_query_quotes_user_input() -> None:
+    assert _fts5_query('pets NOT "parking  space" pet* a-b "') == (
+        '"pets" "NOT" "parking space" "pet"* "a-b"'
+    )
+    assert _fts5_query('* ""') == ""
+
+
+def test_search_on_unsupported_database_is_501() -> None:
+    mysql = SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+    db = SimpleNamespace(get_bind=lambda: mysql)
+
+    with pytest.raises(HTTPException) as exc:
+        search_contracts(db, "lease")
+    assert exc.value.status_code == 501
+
+
+def test_search_is_scoped_and_answered_from_the_index(monkeypatch) -> None:
+    _, headers_a, tenant_a = _owner("search_owner_a", "202020202")
+    owner_b, headers_b, tenant_b = _owner("search_owner_b", "212121212")
+    first = _contract_with_pdf(headers_a, tenant_a, b"%PDF-1.4 lease one")
+    greek = _contract_with_pdf(headers_a, tenant_a, b"%PDF-1.4 lease three")
+    other = _contract_with_pdf(headers_b, tenant_b, b"%PDF-1.4 lease two")
+
+    # the files are never read to answer a query
+    def _no_reads(self, key):
+        raise AssertionError(f"search read {key}")
+
+    monkeypatch.setattr(FilesystemStorage, "read", _no_reads)
+
+    with assert_max_queries(6):
+        hits = _search(headers_a, q="pets")
+    assert [h["id"] for h in hits] == [first]
+    assert hits[0]["snippet"].count("[Pets]") == 1
+    assert hits[0]["pdf_pages"] == 1
+
+    assert [h["id"] for h in _search(headers_b, q="pet*")] == [other]
+    assert _search(headers_a, q="parking") == []
+    assert _search(headers_b, q='"not allowed"') == []
+    # case-insensitive, Greek included
+    assert [h["id"] for h in _search(headers_a, q="ΚΑΤΟΙΚΊΔΙΑ")] == [greek]
+
+    _, headers_admin = register_and_login(
+        client, "search_admin", "pw", "search_admin@example.com"
+    )
+    make_admin("search_admin")
+    assert {h["id"] for h in _search(headers_admin, q="pets")} == {first, other}
+    assert [
+        h["id"] for h in _search(headers_admin, q="pets", owner_id=owner_b["id"])
+    ] == [other]
+
+    resp = client.get(
+        "/contracts/search", params={"q": "pets", "owner_id": 1}, headers=headers_a
+    )
+    assert resp.status_code == 403
+    assert (
+        client.get("/contracts/search", params={"q": ""}, headers=headers_a).status_code
+        == 422
+    )
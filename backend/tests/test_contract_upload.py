@@ -1,24 +1,28 @@
 import io
 import os
 import shutil
+from datetime import date, timedelta
 
 import pytest
 
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.core.upload_gc import collect_orphans
 from app.core.uploads import get_upload_root
-from tests.utils import register_and_login
+from app.db.session import SessionLocal
+from tests.utils import create_property, login_headers, make_admin, register_and_login
 
 client = TestClient(app)
 
 
 @pytest.fixture(autouse=True)
 def clean_uploads_dir():
-    upload_dir = str(get_upload_root() / "contracts")
-    if os.path.exists(upload_dir):
-        shutil.rmtree(upload_dir)
-    os.makedirs(upload_dir, exist_ok=True)
+    for name in ("contracts", "blobs", "tmp"):
+        upload_dir = str(get_upload_root() / name)
+        if os.path.exists(upload_dir):
+            shutil.rmtree(upload_dir)
+    os.makedirs(str(get_upload_root() / "contracts"), exist_ok=True)
 
 
 def _create_tenant_for_owner(owner_headers):
@@ -83,8 +87,8 @@ def test_upload_contract_pdf():
     data = upload_resp.json()
     assert data["pdf_file"] is not None
     assert data["pdf_file"].endswith(".pdf")
-    # optional: ensure it is stored under contracts/ folder (relative path)
-    assert "contracts/" in data["pdf_file"].replace("\\", "/")
+    # stored content-addressed (relative path)
+    assert data["pdf_file"].startswith("blobs/sha256/")
 
     # PDF retrieval is served inline via FileResponse (no redirect)
     pdf_resp = client.get(f"/contracts/{contract_id}/pdf", headers=owner_headers)
@@ -249,3 +253,323 @@ def test_get_contract_pdf_forbidden_for_other_owner():
     )
     pdf_resp = client.get(f"/contracts/{contract_id}/pdf", headers=owner_b_headers)
     assert pdf_resp.status_code == 403
+
+
+def test_contract_pdf_supports_ranges_and_revalidation():
+    _, owner_headers = register_and_login(
+        client, "owner_rangepdf", "pw", "owner_rangepdf@example.com", is_owner=True
+    )
+    property_id = create_property(client, owner_headers)["id"]
+    tenant_id = _create_tenant_for_owner(owner_headers)
+    contract_resp = client.post(
+        "/contracts/",
+        json={
+            "property_id": property_id,
+            "tenant_id": tenant_id,
+            "start_date": str(date.today()),
+            "end_date": str(date.today() + timedelta(days=365)),
+            "rent_amount": 900.0,
+        },
+        headers=owner_headers,
+    )
+    contract_id = contract_resp.json()["id"]
+
+    pdf_content = b"%PDF-1.4 " + bytes(range(256)) * 40
+    up = client.post(
+        f"/contracts/{contract_id}/upload",
+        files={"file": ("scan.pdf", io.BytesIO(pdf_content), "application/pdf")},
+        headers=owner_headers,
+    )
+    assert up.status_code == 200, up.text
+    url = f"/contracts/{contract_id}/pdf"
+
+    full = client.get(url, headers=owner_headers)
+    assert full.status_code == 200
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["cache-control"] == "private, no-cache"
+    etag = full.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    part = client.get(url, headers={**owner_headers, "Range": "bytes=100-199"})
+    assert part.status_code == 206
+    assert part.content == pdf_content[100:200]
+    assert part.headers["content-range"] == f"bytes 100-199/{len(pdf_content)}"
+
+    # stale If-Range -> whole file
+    stale = client.get(
+        url, headers={**owner_headers, "Range": "bytes=0-9", "If-Range": '"old"'}
+    )
+    assert stale.status_code == 200
+    assert stale.content == pdf_content
+
+    again = client.get(url, headers={**owner_headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    since = client.get(
+        url,
+        headers={**owner_headers, "If-Modified-Since": full.headers["last-modified"]},
+    )
+    assert since.status_code == 304
+
+    head = client.head(url, headers=owner_headers)
+    assert head.status_code == 200
+    assert head.headers["content-length"] == str(len(pdf_content))
+
+
+def test_contract_pdf_offloaded_to_proxy(monkeypatch):
+    from app.core import downloads
+
+    _, owner_headers = register_and_login(
+        client, "owner_xaccel", "pw", "owner_xaccel@example.com", is_owner=True
+    )
+    _, other_headers = register_and_login(
+        client, "other_xaccel", "pw", "other_xaccel@example.com", is_owner=True
+    )
+    property_id = create_property(client, owner_headers)["id"]
+    tenant_id = _create_tenant_for_owner(owner_headers)
+    contract_id = client.post(
+        "/contracts/",
+        json={
+            "property_id": property_id,
+            "tenant_id": tenant_id,
+            "start_date": str(date.today()),
+            "end_date": str(date.today() + timedelta(days=365)),
+            "rent_amount": 900.0,
+        },
+        headers=owner_headers,
+    ).json()["id"]
+    up = client.post(
+        f"/contracts/{contract_id}/upload",
+        files={"file": ("c.pdf", io.BytesIO(b"%PDF-1.4 offload"), "application/pdf")},
+        headers=owner_headers,
+    )
+    pdf_file = up.json()["pdf_file"]
+
+    monkeypatch.setattr(downloads, "FILE_OFFLOAD", "x-accel")
+    resp = client.get(f"/contracts/{contract_id}/pdf", headers=owner_headers)
+    assert resp.status_code == 200
+    assert resp.content == b""
+    assert resp.headers["x-accel-redirect"] == f"/_protected_uploads/{pdf_file}"
+    assert resp.headers["content-type"] == "application/pdf"
+    assert resp.headers["content-disposition"].startswith("inline")
+
+    # the proxy only gets the header after the ownership check
+    denied = client.get(f"/contracts/{contract_id}/pdf", headers=other_headers)
+    assert denied.status_code == 403
+    assert "x-accel-redirect" not in denied.headers
+
+    monkeypatch.setattr(downloads, "FILE_OFFLOAD", "x-sendfile")
+    resp = client.get(f"/contracts/{contract_id}/pdf", headers=owner_headers)
+    assert resp.headers["x-sendfile"] == str(get_upload_root() / pdf_file)
+
+
+def _contract_with_pdf(owner_headers, property_id, tenant_id, content):
+    contract_id = client.post(
+        "/contracts/",
+        json={
+            "property_id": property_id,
+            "tenant_id": tenant_id,
+            "start_date": str(date.today()),
+            "end_date": str(date.today() + timedelta(days=365)),
+            "rent_amount": 900.0,
+        },
+        headers=owner_headers,
+    ).json()["id"]
+    up = client.post(
+        f"/contracts/{contract_id}/upload",
+        files={"file": ("c.pdf", io.BytesIO(content), "application/pdf")},
+        headers=owner_headers,
+    )
+    assert up.status_code == 200, up.text
+    return contract_id, up.json()["pdf_file"]
+
+
+def test_identical_uploads_share_one_blob():
+    import hashlib
+
+    _, owner_headers = register_and_login(
+        client, "owner_dedup", "pw", "owner_dedup@example.com", is_owner=True
+    )
+    tenant_id = _create_tenant_for_owner(owner_headers)
+    content = b"%PDF-1.4 same bytes"
+    digest = hashlib.sha256(content).hexdigest()
+
+    first_id, first = _contract_with_pdf(
+        owner_headers, create_property(client, owner_headers)["id"], tenant_id, content
+    )
+    _, second = _contract_with_pdf(
+        owner_headers, create_property(client, owner_headers)["id"], tenant_id, content
+    )
+
+    assert first == second == f"blobs/sha256/{digest[:2]}/{digest}.pdf"
+    blobs = [p for p in (get_upload_root() / "blobs").rglob("*") if p.is_file()]
+    assert len(blobs) == 1
+    assert not any((get_upload_root() / "tmp").iterdir())
+
+    resp = client.get(f"/contracts/{first_id}/pdf", headers=owner_headers)
+    assert resp.headers["etag"] == f'"{digest}"'
+
+
+def test_gc_removes_only_unreferenced_blobs():
+    _, owner_headers = register_and_login(
+        client, "owner_gc", "pw", "owner_gc@example.com", is_owner=True
+    )
+    tenant_id = _create_tenant_for_owner(owner_headers)
+    property_id = create_property(client, owner_headers)["id"]
+    contract_id, old = _contract_with_pdf(
+        owner_headers, property_id, tenant_id, b"%PDF-1.4 first version"
+    )
+    # an admin replaces the PDF: the first blob is now unreferenced
+    register_and_login(client, "admin_gc", "pw", "admin_gc@example.com")
+    make_admin("admin_gc")
+    admin_headers = login_headers(client, "admin_gc", "pw")
+    resp = client.post(
+        f"/contracts/{contract_id}/upload",
+        files={"file": ("c.pdf", io.BytesIO(b"%PDF-1.4 second"), "application/pdf")},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200, resp.text
+    new = resp.json()["pdf_file"]
+    root = get_upload_root()
+
+    db = SessionLocal()
+    try:
+        # still inside the grace period
+        assert collect_orphans(db) == []
+        assert collect_orphans(db, grace_seconds=0, dry_run=True) == [old]
+        assert (root / old).exists()
+
+        assert collect_orphans(db, grace_seconds=0) == [old]
+    finally:
+        db.close()
+    assert not (root / old).exists()
+    assert (root / new).exists()
+
+
+def test_concurrent_uploads_write_off_the_event_loop(monkeypatch):
+    import asyncio
+    import hashlib
+    import threading
+
+    from starlette.datastructures import Headers, UploadFile
+
+    from app.core import uploads
+
+    monkeypatch.setattr(uploads, "UPLOAD_FSYNC", "full")
+    writer_threads: set[int] = set()
+    fsyncs: list[int] = []
+    real_write, real_fsync = uploads._BlobWriter.write, os.fsync
+
+    def tracked_write(self, data):
+        writer_threads.add(threading.get_ident())
+        real_write(self, data)
+
+    def tracked_fsync(fd):
+        fsyncs.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(uploads._BlobWriter, "write", tracked_write)
+    monkeypatch.setattr(uploads.os, "fsync", tracked_fsync)
+
+    bodies = [b"%PDF-1.4 " + bytes([i]) * (3 * 1024 * 1024) for i in range(8)]
+
+    async def scenario():
+        def upload(body):
+            return UploadFile(
+                io.BytesIO(body),
+                filename="c.pdf",
+                headers=Headers({"content-type": "application/pdf"}),
+            )
+
+        rels = await asyncio.gather(
+            *(uploads.save_pdf_upload(upload(b)) for b in bodies)
+        )
+        return rels, threading.get_ident()
+
+    rels, loop_thread = asyncio.run(scenario())
+
+    assert rels == [
+        uploads.blob_rel_path(hashlib.sha256(b).hexdigest()) for b in bodies
+    ]
+    for rel, body in zip(rels, bodies):
+        assert (get_upload_root() / rel).read_bytes() == body
+    assert writer_threads and loop_thread not in writer_threads
+    # file + directory per new blob
+    assert len(fsyncs) == 2 * len(bodies)
+
+
+def test_uploads_url_requires_contract_access():
+    from tests.utils import assert_max_queries
+
+    _, owner_headers = register_and_login(
+        client, "owner_uploads", "pw", "owner_uploads@example.com", is_owner=True
+    )
+    _, other_headers = register_and_login(
+        client, "other_uploads", "pw", "other_uploads@example.com", is_owner=True
+    )
+    _, admin_headers = register_and_login(
+        client, "admin_uploads", "pw", "admin_uploads@example.com"
+    )
+    make_admin("admin_uploads")
+    contract_id = client.post(
+        "/contracts/",
+        json={
+            "property_id": create_property(client, owner_headers)["id"],
+            "tenant_id": _create_tenant_for_owner(owner_headers),
+            "start_date": str(date.today()),
+            "end_date": str(date.today() + timedelta(days=365)),
+            "rent_amount": 900.0,
+        },
+        headers=owner_headers,
+    ).json()["id"]
+    content = b"%PDF-1.4 behind auth"
+    up = client.post(
+        f"/contracts/{contract_id}/upload",
+        files={"file": ("c.pdf", io.BytesIO(content), "application/pdf")},
+        headers=owner_headers,
+    )
+    url = up.json()["pdf_url"]
+    assert url.startswith("/uploads/blobs/")
+
+    assert client.get(url).status_code == 401
+    # not found rather than forbidden: the blob's existence is not revealed
+    assert client.get(url, headers=other_headers).status_code == 404
+    for path in ("/uploads/tmp/x.tmp", "/uploads/../rentpro.db"):
+        assert client.get(path, headers=owner_headers).status_code == 404
+
+    resp = client.get(url, headers=owner_headers)
+    assert resp.status_code == 200
+    assert resp.content == content
+    assert resp.headers["content-type"] == "application/pdf"
+    assert resp.headers["cache-control"] == "private, no-cache"
+    # the decision is cached: repeat fetches and revalidations skip the DB
+    with assert_max_queries(0):
+        again = client.get(
+            url, headers={**owner_headers, "If-None-Match": resp.headers["etag"]}
+        )
+    assert again.status_code == 304
+    assert client.get(url, headers=admin_headers).status_code == 200
+
+    # deleting the contract revokes access right away in this worker
+    client.post(f"/contracts/{contract_id}/terminate", headers=owner_headers)
+    assert (
+        client.delete(f"/contracts/{contract_id}", headers=owner_headers).status_code
+        == 200
+    )
+    assert client.get(url, headers=owner_headers).status_code == 404
+
+
+def test_get_and_head_file_routes_have_distinct_operation_ids():
+    paths = app.openapi()["paths"]
+    for path in (
+        "/contracts/{contract_id}/pdf",
+        "/contracts/{contract_id}/thumbnail",
+        "/uploads/{key}",
+    ):
+        assert set(paths[path]) == {"get", "head"}
+        assert paths[path]["get"]["operationId"] != paths[path]["head"]["operationId"]
+
+    ids = [op["operationId"] for ops in paths.values() for op in ops.values()]
+    assert len(ids) == len(set(ids))
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+
+import anyio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db import session as db_session
+from app.db.session import TimedQueuePool, pool_settings
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_health_db_reports_pool_usage() -> None:
+    resp = client.get("/health/db")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["status"] == "ok"
+    assert body["pool_class"] == "TimedQueuePool"
+    assert body["pool"]["size"] >= 1
+    assert body["pool"]["checkouts"] >= 1
+    assert "checkout_wait_ms_max" in body["pool"]
+
+
+def test_pool_settings_from_env(monkeypatch) -> None:
+    monkeypatch.setenv("RENTPRO_DB_POOL_SIZE", "20")
+    monkeypatch.setenv("RENTPRO_DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("RENTPRO_DB_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("RENTPRO_DB_POOL_RECYCLE", "1800")
+    monkeypatch.setenv("RENTPRO_DB_POOL_PRE_PING", "0")
+
+    settings = pool_settings()
+    assert settings["pool_size"] == 20
+    assert settings["max_overflow"] == 0
+    assert settings["pool_timeout"] == 2.5
+    assert settings["pool_recycle"] == 1800
+    assert settings["pool_pre_ping"] is False
+
+    monkeypatch.setenv("RENTPRO_DB_POOL_SIZE", "zero")
+    with pytest.raises(RuntimeError):
+        pool_settings()
+
+
+def test_pool_checkout_timeout_is_counted(tmp_path, monkeypatch) -> None:
+    stats = db_session.PoolWaitStats()
+    monkeypatch.setattr(db_session, "pool_wait_stats", stats)
+    eng = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        held = eng.connect()
+        with pytest.raises(PoolTimeoutError):
+            eng.connect()
+        held.close()
+    finally:
+        eng.dispose()
+
+    assert stats.checkouts == 1
+    assert stats.timeouts == 1
+    assert stats.wait_ms_max >= 40.0
+
+
+def test_sqlite_connections_use_wal_and_pragmas() -> None:
+    if not db_session.SQLITE_PERFORMANCE:
+        pytest.skip("SQLite performance profile disabled")
+    for eng in (db_session.engine, db_session.writer_engine):
+        with eng.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+
+
+def test_writes_go_through_the_single_writer_connection() -> None:
+    if db_session.writer_engine is None:
+        pytest.skip("no dedicated writer engine")
+    from app.models.area import Area
+
+    writer_statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        writer_statements.append(statement)
+
+    event.listen(db_session.writer_engine, "before_cursor_execute", _capture)
+    db = db_session.SessionLocal()
+    try:
+        assert db.get_bind() is db_session.engine
+        db.add(Area(code="W1", name="Writer", area_score=5.0))
+        db.flush()
+        # reads after a write stay on the writer and see the pending row
+        assert db.query(Area).filter_by(code="W1").one().name == "Writer"
+        db.commit()
+    finally:
+        db.close()
+        event.remove(db_session.writer_engine, "before_cursor_execute", _capture)
+
+    assert any(s.startswith("INSERT INTO areas") for s in writer_statements)
+    assert any(s.startswith("SELECT") for s in writer_statements)
+
+
+def test_concurrent_writers_do_not_hit_database_is_locked() -> None:
+    from app.models.area import Area
+
+    errors: list[Exception] = []
+
+    def worker(n: int) -> None:
+        for i in range(10):
+            db = db_session.SessionLocal()
+            try:
+                db.add(Area(code=f"C{n}-{i}", name="Concurrent", area_score=1.0))
+                db.commit()
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    db = db_session.SessionLocal()
+    try:
+        assert db.query(Area).filter(Area.name == "Concurrent").count() == 80
+    finally:
+        db.close()
+
+
+def test_sync_and_async_writers_share_one_write_slot() -> None:
+    from app.db.async_session import AsyncSessionLocal, async_writer_engine
+    from app.models.area import Area
+
+    if async_writer_engine is None:
+        pytest.skip("no dedicated writer engine")
+
+    async def async_write() -> None:
+        async with AsyncSessionLocal() as adb:
+            adb.add(Area(code="AW1", name="Async writer", area_score=1.0))
+            await adb.commit()
+
+    db = db_session.SessionLocal()
+    try:
+        db.add(Area(code="SW1", name="Sync writer", area_score=1.0))
+        db.flush()
+        assert db_session.writer_slot.locked()
+
+        async_statements: list[str] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            async_statements.append(statement)
+
+        event.listen(async_writer_engine.sync_engine, "before_cursor_execute", _capture)
+        done = threading.Event()
+        thread = threading.Thread(target=lambda: (anyio.run(async_write), done.set()))
+        thread.start()
+        # the async writer queues behind the open sync write transaction
+        # (waiting for the slot, not inside SQLite's busy handler)
+        assert not done.wait(0.5)
+        assert async_statements == []
+        db.commit()
+    finally:
+        db.close()
+    thread.join(10)
+    event.remove(async_writer_engine.sync_engine, "before_cursor_execute", _capture)
+    assert done.is_set()
+    assert any(s.startswith("INSERT INTO areas") for s in async_statements)
+    assert not db_session.writer_slot.locked()
+
+    db = db_session.SessionLocal()
+    try:
+        codes = {a.code for a in db.query(Area).filter(Area.code.in_(["SW1", "AW1"]))}
+        assert codes == {"SW1", "AW1"}
+    finally:
+        db.close()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.contract import Contract, ContractStatus
+from app.models.property import Property, PropertyStatus
+from tests.utils import create_property, register_and_login
+
+client = TestClient(app)
+
+
+def _seed_rented_and_overdue(headers: dict) -> tuple[int, int]:
+    rented = create_property(client, headers, title="Rented")["id"]
+    overdue = create_property(client, headers, title="Overdue")["id"]
+    resp = client.post(
+        "/tenants/", json={"name": "Export Tenant", "afm": "123123123"}, headers=headers
+    )
+    assert resp.status_code == 200, resp.text
+    tenant_id = resp.json()["id"]
+
+    today = date.today()
+    db = SessionLocal()
+    try:
+        db.add_all(
+            [
+                Contract(
+                    property_id=rented,
+                    tenant_id=tenant_id,
+                    start_date=today - timedelta(days=10),
+                    end_date=today + timedelta(days=10),
+                    rent_amount=500,
+                    status=ContractStatus.ACTIVE,
+                ),
+                # overdue but still ACTIVE in the DB, property still RENTED
+                Contract(
+                    property_id=overdue,
+                    tenant_id=tenant_id,
+                    start_date=today - timedelta(days=100),
+                    end_date=today - timedelta(days=1),
+                    rent_amount=400,
+                    status=ContractStatus.ACTIVE,
+                ),
+            ]
+        )
+        db.query(Property).filter(Property.id.in_([rented, overdue])).update(
+            {Property.status: PropertyStatus.RENTED}
+        )
+        db.commit()
+    finally:
+        db.close()
+    return rented, overdue
+
+
+def test_export_properties_csv_computes_status_without_writing() -> None:
+    _, headers = register_and_login(
+        client, "exp_owner", "pw", "exp_owner@example.com", is_owner=True
+    )
+    _, other_headers = register_and_login(
+        client, "exp_other", "pw", "exp_other@example.com", is_owner=True
+    )
+    create_property(client, other_headers, title="Not mine")
+    rented, overdue = _seed_rented_and_overdue(headers)
+
+    resp = client.get("/properties/export", headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="properties.csv"' in resp.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["title"] for r in rows] == ["Rented", "Overdue"]
+    assert {r["id"]: r["status"] for r in rows} == {
+        str(rented): "RENTED",
+        str(overdue): "AVAILABLE",
+    }
+
+    db = SessionLocal()
+    try:
+        assert db.get(Property, overdue).status == PropertyStatus.RENTED
+        statuses = {c.status for c in db.query(Contract).all()}
+        assert statuses == {ContractStatus.ACTIVE}
+    finally:
+        db.close()
+
+
+def test_export_contracts_and_tenants_ndjson() -> None:
+    _, headers = register_and_login(
+        client, "exp_owner2", "pw", "exp_owner2@example.com", is_owner=True
+    )
+    rented, overdue = _seed_rented_and_overdue(headers)
+
+    resp = client.get("/contracts/export", params={"format": "ndjson"}, headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    items = [json.loads(line) for line in resp.text.splitlines()]
+    assert {i["property_id"]: i["status"] for i in items} == {
+        rented: "ACTIVE",
+        overdue: "EXPIRED",
+    }
+    assert items[0]["end_date"] == (date.today() + timedelta(days=10)).isoformat()
+
+    resp = client.get("/tenants/export?format=ndjson", headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert [json.loads(line)["afm"] for line in resp.text.splitlines()] == ["123123123"]
+
+
+def test_export_rejects_unknown_format_and_non_owners() -> None:
+    _, headers = register_and_login(
+        client, "exp_owner3", "pw", "exp_owner3@example.com", is_owner=True
+    )
+    _, tenant_headers = register_and_login(
+        client, "exp_tenant", "pw", "exp_tenant@example.com"
+    )
+
+    resp = client.get("/properties/export?format=xlsx", headers=headers)
+    assert resp.status_code == 400
+    resp = client.get("/properties/export", headers=tenant_headers)
+    assert resp.status_code == 403
+    resp = client.get("/contracts/export?owner_id=1", headers=headers)
+    assert resp.status_code == 403
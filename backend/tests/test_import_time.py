@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.config import env_float
+from app.core.importtime import DEFERRED_MODULES, measure_import, parse_importtime
+
+# Cold import budget of the app in ms. Wall-clock, so opt-in (a dedicated,
+# quiet runner): unset skips the check; the deferral check always runs.
+IMPORT_BUDGET_MS = env_float("RENTPRO_IMPORT_BUDGET_MS", 0.0, minimum=0) or None
+
+
+@pytest.fixture(scope="module")
+def app_import():
+    return measure_import("app.main", repeat=2 if IMPORT_BUDGET_MS else 1)
+
+
+def test_parse_importtime() -> None:
+    profile = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     jose.jwt\n"
+        "import time:       300 |        420 |   jose\n"
+        "import time:        80 |        500 | app.core.jwt\n",
+        "app.core.jwt",
+    )
+    assert profile.total_us == 500
+    assert [t.depth for t in profile.timings] == [2, 1, 0]
+    assert profile.loaded("jose") and not profile.loaded("jo")
+    assert [t.module for t in profile.slowest(2)] == ["app.core.jwt", "jose"]
+
+
+def test_app_import_defers_optional_dependencies(app_import) -> None:
+    assert [m for m in DEFERRED_MODULES if app_import.loaded(m)] == []
+
+
+@pytest.mark.skipif(
+    IMPORT_BUDGET_MS is None, reason="set RENTPRO_IMPORT_BUDGET_MS to enforce"
+)
+def test_app_import_within_budget(app_import) -> None:
+    slowest = ", ".join(
+        f"{t.module} {t.cumulative_us / 1000:.0f}ms"
+        for t in app_import.slowest(8, prefix="app.")
+    )
+    assert app_import.total_us / 1000 <= IMPORT_BUDGET_MS, slowest
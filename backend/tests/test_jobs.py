@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import jobs
+from app.core.jobs import Cron, Interval, Job, JobRunner, job_lock
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.contract import Contract, ContractStatus
+from app.models.property import Property, PropertyStatus
+from tests.utils import create_property, register_and_login
+
+client = TestClient(app)
+
+
+def test_cron_next_after() -> None:
+    now = datetime(2026, 3, 14, 10, 7, 30, tzinfo=timezone.utc)  # Saturday
+
+    assert Cron("*/15 * * * *").next_after(now) == now.replace(minute=15, second=0)
+    assert Cron("15 3 * * *").next_after(now) == datetime(
+        2026, 3, 15, 3, 15, tzinfo=timezone.utc
+    )
+    assert Cron("0 9 1 * *").next_after(now) == datetime(
+        2026, 4, 1, 9, 0, tzinfo=timezone.utc
+    )
+    # Sunday as 0 and as 7
+    sunday = datetime(2026, 3, 15, 0, 0, tzinfo=timezone.utc)
+    assert Cron("0 0 * * 0").next_after(now) == sunday
+    assert Cron("0 0 * * 7").next_after(now) == sunday
+
+    with pytest.raises(ValueError):
+        Cron("61 * * * *")
+    with pytest.raises(ValueError):
+        Cron("* * *")
+
+
+def test_job_lock_is_exclusive_and_expires() -> None:
+    with job_lock("demo", owner="a") as first:
+        assert first
+        with job_lock("demo", owner="b") as second:
+            assert not second
+    with job_lock("demo", owner="b") as again:
+        assert again
+
+    # a lease left behind by a dead worker is taken over once it has expired
+    with job_lock("stale", owner="dead", ttl_seconds=-1) as taken:
+        assert taken
+        with job_lock("stale", owner="alive") as took_over:
+            assert took_over
+
+
+def test_runner_is_single_flight_and_reports_outcomes(monkeypatch) -> None:
+    observed: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        jobs,
+        "_observer",
+        lambda job, outcome, duration_ms: observed.append((job, outcome)),
+    )
+    started, release = threading.Event(), threading.Event()
+
+    def slow(db) -> None:
+        started.set()
+        release.wait(5)
+
+    def broken(db) -> None:
+        raise RuntimeError("boom")
+
+    runner = JobRunner(
+        [Job("slow", slow, Interval(3600)), Job("broken", broken, Interval(3600))]
+    )
+
+    async def scenario() -> list[str]:
+        first = asyncio.create_task(runner.run_once("slow"))
+        await asyncio.to_thread(started.wait, 5)
+        second = await runner.run_once("slow")
+        release.set()
+        return [await first, second, await runner.run_once("broken")]
+
+    assert asyncio.run(scenario()) == ["ok", "running", "failed"]
+    assert observed == [("slow", "running"), ("slow", "ok"), ("broken", "failed")]
+
+
+def test_runner_skips_job_locked_by_another_worker() -> None:
+    calls: list[int] = []
+    runner = JobRunner([Job("locked", lambda db: calls.append(1), Interval(3600))])
+
+    with job_lock("locked", owner="other-worker"):
+        assert asyncio.run(runner.run_once("locked")) == "locked"
+    assert asyncio.run(runner.run_once("locked")) == "ok"
+    assert calls == [1]
+
+
+def test_background_mode_moves_status_sync_to_the_job(monkeypatch) -> None:
+    monkeypatch.setattr(jobs, "STATUS_SYNC_MODE", "background")
+    _, headers = register_and_login(
+        client, "job_owner", "pw", "job_owner@example.com", is_owner=True
+    )
+    prop_id = create_property(client, headers, title="Job P1")["id"]
+    resp = client.post(
+        "/tenants/", json={"name": "Job T", "afm": "151515151"}, headers=headers
+    )
+    tenant_id = resp.json()["id"]
+    db = SessionLocal()
+    try:
+        db.add(
+            Contract(
+                property_id=prop_id,
+                tenant_id=tenant_id,
+                start_date=date.today() - timedelta(days=30),
+                end_date=date.today() - timedelta(days=1),
+                rent_amount=500.0,
+                status=ContractStatus.ACTIVE,
+            )
+        )
+        db.query(Property).filter(Property.id == prop_id).update(
+            {Property.status: PropertyStatus.RENTED}
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    # reads no longer write
+    assert client.get(f"/properties/{prop_id}", headers=headers).json()["status"] == (
+        "RENTED"
+    )
+    listed = client.get("/contracts/", headers=headers).json()
+    assert [c["status"] for c in listed] == ["ACTIVE"]
+
+    runner = JobRunner(jobs.default_jobs())
+    assert asyncio.run(runner.run_once("status_sync")) == "ok"
+
+    assert client.get(f"/properties/{prop_id}", headers=headers).json()["status"] == (
+        "AVAILABLE"
+    )
+    listed = client.get("/contracts/", headers=headers).json()
+    assert [c["status"] for c in listed] == ["EXPIRED"]
+
+    snap = client.get("/metrics").json()
+    assert snap["jobs"]["status_sync ok"]["runs"] >= 1
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.core.observability import OVERFLOW_ROUTE, InMemoryMetrics
+from app.core.prometheus import MultiprocessStore, _MmapedDict, _read_all_values, render
+from app.main import app
+from tests.utils import register_and_login
+
+client = TestClient(app)
+
+
+def test_metrics_group_requests_by_route_template() -> None:
+    for pid in (123, 124, 125):
+        resp = client.get(f"/properties/{pid}")
+        assert resp.status_code == 404
+
+    snap = client.get("/metrics").json()
+    assert "/properties/123" not in snap["by_path"]
+    assert snap["by_path"]["/properties/{property_id}"] >= 3
+
+    series = snap["routes"]["GET /properties/{property_id}"]
+    assert series["method"] == "GET"
+    assert series["count"] >= 3
+    assert sum(series["buckets"]) == series["count"]
+    assert series["p50_ms"] is not None
+    assert series["p50_ms"] <= series["p95_ms"] <= series["p99_ms"]
+
+
+def test_metrics_unauthenticated_requests_still_use_template() -> None:
+    resp = client.get("/contracts/42")
+    assert resp.status_code == 401
+
+    snap = client.get("/metrics").json()
+    assert "GET /contracts/{contract_id}" in snap["routes"]
+
+
+def test_histogram_percentiles_interpolate_within_buckets() -> None:
+    m = InMemoryMetrics(buckets_ms=(10.0, 100.0), max_series=10)
+    for _ in range(90):
+        m.observe(path="/x", status_code=200, method="GET", duration_ms=5.0)
+    for _ in range(10):
+        m.observe(path="/x", status_code=200, method="GET", duration_ms=50.0)
+
+    series = m.snapshot()["routes"]["GET /x"]
+    assert series["count"] == 100
+    assert series["buckets"] == [90, 10, 0]
+    assert series["p50_ms"] <= 10.0
+    assert 10.0 < series["p95_ms"] <= 100.0
+    assert series["max_ms"] == 50.0
+
+
+def test_cardinality_cap_folds_new_series_into_overflow() -> None:
+    m = InMemoryMetrics(max_series=2)
+    for i in range(5):
+        m.observe(path=f"/r{i}", status_code=200, method="GET", duration_ms=1.0)
+
+    snap = m.snapshot()
+    assert set(snap["routes"]) == {"GET /r0", "GET /r1", f"GET {OVERFLOW_ROUTE}"}
+    assert snap["routes"][f"GET {OVERFLOW_ROUTE}"]["count"] == 3
+    assert snap["series_overflowed"] == 3
+    assert snap["requests_total"] == 5
+
+
+def test_observations_from_many_threads_are_merged() -> None:
+    m = InMemoryMetrics()
+
+    def worker() -> None:
+        for _ in range(1000):
+            m.observe(path="/x", status_code=200, method="GET", duration_ms=1.0)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    snap = m.snapshot()
+    assert snap["requests_total"] == 8000
+    assert snap["by_status"] == {"200": 8000}
+    assert snap["routes"]["GET /x"]["count"] == 8000
+
+
+def test_metrics_prometheus_exposition_format() -> None:
+    client.get("/properties/999")
+    app.state.metrics.observe_cache("test_cache", hit=True)
+    app.state.metrics.observe_cache("test_cache", hit=False)
+
+    resp = client.get("/metrics", params={"format": "prometheus"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    body = resp.text
+    assert "# TYPE rentpro_http_request_duration_seconds histogram" in body
+    assert (
+        'rentpro_http_request_duration_seconds_bucket{le="+Inf",method="GET",'
+        'route="/properties/{property_id}"}'
+    ) in body
+    assert "# TYPE rentpro_http_requests_total counter" in body
+    assert "rentpro_db_pool_size" in body
+    assert 'rentpro_cache_hit_ratio{cache="test_cache"} 0.5' in body
+
+
+def test_metrics_accept_header_selects_prometheus() -> None:
+    resp = client.get("/metrics", headers={"Accept": "text/plain;version=0.0.4"})
+    assert resp.headers["content-type"].startswith("text/plain")
+
+    resp = client.get("/metrics")
+    assert resp.headers["content-type"].startswith("application/json")
+
+
+def test_multiprocess_store_sums_counters_across_workers(tmp_path) -> None:
+    # a process that has exited (portable, unlike guessing an unused pid)
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    dead_pid = proc.pid
+
+    live, dead = InMemoryMetrics(), InMemoryMetrics()
+    live.add_gauge_collector(lambda: {"rentpro_db_pool_size": 5})
+    dead.add_gauge_collector(lambda: {"rentpro_db_pool_size": 7})
+    for m, n in ((live, 3), (dead, 2)):
+        for _ in range(n):
+            m.observe(path="/x", status_code=200, method="GET", duration_ms=3.0)
+
+    live_store = MultiprocessStore(tmp_path, pid=os.getpid())
+    dead_store = MultiprocessStore(tmp_path, pid=dead_pid)
+    try:
+        live_store.flush(live)
+        dead_store.flush(dead)
+        # re-flushing writes absolute totals, never double counts
+        live_store.flush(live)
+
+        counters, gauges = live_store.aggregate()
+    finally:
+        live_store.close()
+        dead_store.close()
+
+    base = (("method", "GET"), ("route", "/x"))
+    assert counters[("rentpro_http_requests_total", base)] == 5
+    assert counters[("rentpro_http_responses_total", (("status", "200"),))] == 5
+
+    pool = {k: v for k, v in gauges.items() if k[0] == "rentpro_db_pool_size"}
+    assert pool == {("rentpro_db_pool_size", (("pid", str(os.getpid())),)): 5}
+
+    text = render([counters, gauges])
+    assert 'rentpro_http_request_duration_seconds_count{method="GET",route="/x"} 5' in (
+        text
+    )
+
+
+def test_mmaped_dict_grows_and_reopens(tmp_path) -> None:
+    path = tmp_path / "counter_1.db"
+    d = _MmapedDict(path)
+    try:
+        # ~100 bytes per entry: forces several resizes past the initial 64KB
+        for i in range(2000):
+            d.write_value(f"metric_{i:04d}_" + "x" * 80, float(i))
+    finally:
+        d.close()
+    assert path.stat().st_size > 1 << 16
+
+    data = path.read_bytes()
+    used = int.from_bytes(data[:4], sys.byteorder)
+    values = {k: v for k, v, _ in _read_all_values(data, used)}
+    assert len(values) == 2000
+    assert values["metric_1999_" + "x" * 80] == 1999.0
+
+
+def test_metrics_upload_keys_collapse_into_one_route() -> None:
+    _, headers = register_and_login(
+        client, "metrics_uploads", "pw", "metrics_uploads@example.com", is_owner=True
+    )
+    for key in ("blobs/ab/cdef.pdf", "blobs/12/12/12.pdf", "contracts/a.pdf"):
+        assert client.get(f"/uploads/{key}", headers=headers).status_code == 404
+        assert client.get(f"/uploads/{key}").status_code == 401
+
+    snap = client.get("/metrics").json()
+    assert not [p for p in snap["by_path"] if p.startswith("/uploads/blobs")]
+    assert snap["routes"]["GET /uploads/{key}"]["count"] >= 6
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import io
+import zlib
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import pdf_ingest
+from app.core.pdf_ingest import PdfParseError, extract_pdf_facts, ingest_pending
+from app.core.storage import StorageError
+from app.core.upload_gc import collect_orphans
+from app.core.uploads import get_upload_root
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.contract import Contract
+from app.models.pdf_document import PdfDocument, PdfDocumentStatus
+from app.routers import contract as contract_router
+from tests.utils import assert_max_queries, create_property, register_and_login
+
+client = TestClient(app)
+
+PNG = b"\x89PNG\r\n\x1a\nthumb"
+
+
+def _pdf(pages: list[bytes]) -> bytes:
+    """Minimal PDF: one (compressed) content stream per page."""
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages)))
+    objs.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    font = 3 + 2 * len(pages)
+    for i, content in enumerate(pages):
+        objs.append(
+            f"<< /Type /Page /Parent 2 0 R /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> >>".encode()
+        )
+        data = zlib.compress(content)
+        objs.append(
+            f"<< /Length {len(data)} /Filter /FlateDecode >>\nstream\n".encode()
+            + data
+            + b"\nendstream"
+        )
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for n, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{n} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{off:010d} 00000 n \n".encode() for off in offsets)
+    trailer = f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\n"
+    return out + f"{trailer}startxref\n{xref}\n%%EOF\n".encode()
+
+
+CONTRACT_PDF = _pdf(
+    [
+        b"BT /F1 12 Tf 14 TL 72 720 Td (Lease agreement) Tj T* (Rent: 850 EUR \\(monthly\\)) Tj ET",
+        b"BT /F1 12 Tf 72 720 Td [(Sig) 20 (ned)] TJ 0 -14 Td <54656e616e74> Tj ET",
+    ]
+)
+
+
+def test_extract_pdf_facts_without_poppler(monkeypatch) -> None:
+    monkeypatch.setattr(pdf_ingest.shutil, "which", lambda name: None)
+
+    facts = extract_pdf_facts(CONTRACT_PDF)
+
+    assert facts["page_count"] == 2
+    assert facts["text"].splitlines() == [
+        "Lease agreement",
+        "Rent: 850 EUR (monthly)",
+        "Signed",
+        "Tenant",
+    ]
+    assert facts["thumbnail"] is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"%PDF-1.4 not really a pdf",
+        CONTRACT_PDF[:200],
+        CONTRACT_PDF.replace(b"/Kids [3 0 R 5 0 R]", b"/Kids [9 0 R]"),
+    ],
+)
+def test_extract_pdf_facts_rejects_unreadable_pdfs(data: bytes) -> None:
+    with pytest.raises(PdfParseError, match="unreadable PDF"):
+        extract_pdf_facts(data)
+
+
+def _contract(headers: dict, tenant_id: int) -> int:
+    return client.post(
+        "/contracts/",
+        json={
+            "property_id": create_property(client, headers)["id"],
+            "tenant_id": tenant_id,
+            "start_date": str(date.today()),
+            "end_date": str(date.today() + timedelta(days=365)),
+            "rent_amount": 850.0,
+        },
+        headers=headers,
+    ).json()["id"]
+
+
+def _upload(contract_id: int, headers: dict, content: bytes) -> dict:
+    resp = client.post(
+        f"/contracts/{contract_id}/upload",
+        files={"file": ("c.pdf", io.BytesIO(content), "application/pdf")},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_upload_is_ingested_and_listed_with_preview(monkeypatch) -> None:
+    monkeypatch.setattr(
+        pdf_ingest,
+        "extract_pdf_facts",
+        lambda data: {"page_count": 2, "text": "Lease agreement", "thumbnail": PNG},
+    )
+    _, headers = register_and_login(
+        client, "ingest_owner", "pw", "ingest_owner@example.com", is_owner=True
+    )
+    tenant_id = client.post(
+        "/tenants/", json={"name": "Ingest T", "afm": "181818181"}, headers=headers
+    ).json()["id"]
+    contract_id = _contract(headers, tenant_id)
+    _contract(headers, tenant_id)
+
+    # ingestion runs after the response
+    assert _upload(contract_id, headers, CONTRACT_PDF)["pdf_pages"] is None
+
+    with assert_max_queries(4):
+        listed = client.get("/contracts/", headers=headers).json()
+    by_id = {c["id"]: c for c in listed}
+    assert by_id[contract_id]["pdf_pages"] == 2
+    assert by_id[contract_id]["pdf_thumbnail_url"] == (
+        f"/contracts/{contract_id}/thumbnail"
+    )
+    assert [c["pdf_pages"] for c in listed if c["id"] != contract_id] == [None]
+
+    detail = client.get(f"/contracts/{contract_id}", headers=headers).json()
+    assert detail["pdf_pages"] == 2
+
+    thumb = client.get(f"/contracts/{contract_id}/thumbnail", headers=headers)
+    assert thumb.status_code == 200
+    assert thumb.headers["content-type"] == "image/png"
+    assert thumb.content == PNG
+
+
+def test_pending_pdfs_are_caught_up_and_collected(monkeypatch) -> None:
+    monkeypatch.setattr(pdf_ingest.shutil, "which", lambda name: None)
+    monkeypatch.setattr(contract_router, "PDF_INGEST_ENABLED", False)
+    _, headers = register_and_login(
+        client, "ingest_owner2", "pw", "ingest_owner2@example.com", is_owner=True
+    )
+    tenant_id = client.post(
+        "/tenants/", json={"name": "Ingest T2", "afm": "191919191"}, headers=headers
+    ).json()["id"]
+    contract_id = _contract(headers, tenant_id)
+    pdf_file = _upload(contract_id, headers, CONTRACT_PDF)["pdf_file"]
+
+    db = SessionLocal()
+    try:
+        assert db.get(PdfDocument, pdf_file) is None
+        assert ingest_pending(db) == 1
+        doc = db.get(PdfDocument, pdf_file)
+        assert doc.status == PdfDocumentStatus.READY
+        assert doc.page_count == 2
+        assert "Rent: 850 EUR (monthly)" in doc.text
+        assert ingest_pending(db) == 0
+
+        # once no contract points at the blob, GC drops its document too
+        db.query(Contract).filter(Contract.id == contract_id).update(
+            {Contract.pdf_file: None}
+        )
+        db.commit()
+        assert pdf_file in collect_orphans(db, grace_seconds=0)
+        db.expire_all()
+        assert db.get(PdfDocument, pdf_file) is None
+    finally:
+        db.close()
+    assert not (get_upload_root() / pdf_file).exists()
+
+
+def test_transient_failures_are_retried_and_bad_pdfs_fail_once(monkeypatch) -> None:
+    monkeypatch.setattr(pdf_ingest.shutil, "which", lambda name: None)
+    monkeypatch.setattr(contract_router, "PDF_INGEST_ENABLED", False)
+    _, headers = register_and_login(
+        client, "ingest_owner3", "pw", "ingest_owner3@example.com", is_owner=True
+    )
+    tenant_id = client.post(
+        "/tenants/", json={"name": "Ingest T3", "afm": "181818181"}, headers=headers
+    ).json()["id"]
+    good = _upload(_contract(headers, tenant_id), headers, CONTRACT_PDF)["pdf_file"]
+    bad = _upload(
+        _contract(headers, tenant_id),
+        headers,
+        b"%PDF-1.4\n1 0 obj\n<< /Type /ObjStm /First 5 >>\nstream\n"
+        b"ab cd\nendstream\nendobj\n%%EOF\n",
+    )["pdf_file"]
+
+    class _Unavailable:
+        def read(self, key: str) -> bytes:
+            raise StorageError("storage unavailable")
+
+    db = SessionLocal()
+    try:
+        with monkeypatch.context() as m:
+            m.setattr(pdf_ingest, "get_storage", lambda: _Unavailable())
+            assert ingest_pending(db) == 0
+        assert db.get(PdfDocument, good) is None
+        assert db.get(PdfDocument, bad) is None
+
+        assert ingest_pending(db) == 2
+        assert db.get(PdfDocument, good).status == PdfDocumentStatus.READY
+        failed = db.get(PdfDocument, bad)
+        assert failed.status == PdfDocumentStatus.FAILED
+        assert "unreadable PDF" in failed.error
+        assert ingest_pending(db) == 0
+    finally:
+        db.close()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import profiling
+from app.main import app
+from tests.utils import login_headers, make_admin, register_and_login
+
+client = TestClient(app)
+
+
+def _busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_sample_stacks_returns_collapsed_stacks() -> None:
+    stop = threading.Event()
+    t = threading.Thread(target=_busy_loop, args=(stop,), name="busy-worker")
+    t.start()
+    try:
+        stacks = profiling.sample_stacks(0.2, interval=0.005)
+    finally:
+        stop.set()
+        t.join()
+
+    text = profiling.render_collapsed(stacks)
+    busy = [line for line in text.splitlines() if line.startswith("busy-worker;")]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) >= 1
+    assert "_busy_loop (" in stack
+
+
+def test_profiling_is_disabled_by_default() -> None:
+    assert profiling.PROFILING_ENABLED is False
+
+    register_and_login(client, "prof_admin", "pw", "prof_admin@example.com")
+    make_admin("prof_admin")
+    headers = login_headers(client, "prof_admin", "pw")
+
+    resp = client.get("/admin/profiling/sample?seconds=0.1", headers=headers)
+    assert resp.status_code == 404
+
+    # ?profile=1 is just an ignored query param
+    resp = client.get("/areas/?profile=1", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/json")
+
+
+def _profiled_app(monkeypatch, *, authorized: bool) -> TestClient:
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+
+    router = APIRouter(route_class=profiling.ProfiledRoute)
+
+    @router.get("/work")
+    def work(n: int = 2000):
+        time.sleep(0.01)
+        return {"total": sum(i * i for i in range(n))}
+
+    mini = FastAPI()
+    mini.include_router(router)
+    mini.add_middleware(
+        profiling.ProfilingMiddleware, authorize=lambda request: authorized
+    )
+    return TestClient(mini)
+
+
+def test_profile_query_param_returns_cprofile_report(monkeypatch) -> None:
+    c = _profiled_app(monkeypatch, authorized=True)
+
+    assert c.get("/work").json() == {"total": sum(i * i for i in range(2000))}
+
+    resp = c.get("/work?profile=1")
+    assert resp.status_code == 200
+    assert resp.headers["X-Profiled-Status"] == "200"
+    assert resp.headers["content-type"].startswith("text/plain")
+    # the sync handler ran in the threadpool and is still in the report
+    assert "(work)" in resp.text
+    assert "function calls" in resp.text
+
+    # (work) itself may fall out of the top lines by internal time
+    resp = c.get("/work?profile=1&profile_sort=tottime")
+    assert "Ordered by: internal time" in resp.text
+
+
+def test_profile_query_param_ignored_for_non_admins(monkeypatch) -> None:
+    c = _profiled_app(monkeypatch, authorized=False)
+
+    resp = c.get("/work?profile=1")
+    assert resp.status_code == 200
+    assert "X-Profiled-Status" not in resp.headers
+    assert "total" in resp.json()
+
+
+def test_sample_endpoint_returns_flamegraph_file() -> None:
+    from app.core.utils import require_admin
+    from app.routers.profiling import router as profiling_router
+
+    mini = FastAPI()
+    mini.include_router(profiling_router, prefix="/admin/profiling")
+    mini.dependency_overrides[require_admin] = lambda: {"sub": "admin"}
+
+    resp = TestClient(mini).get(
+        "/admin/profiling/sample", params={"seconds": 0.05, "include_idle": True}
+    )
+    assert resp.status_code == 200
+    assert "profile.collapsed" in resp.headers["content-disposition"]
+    for line in resp.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack
+        assert int(count) >= 1
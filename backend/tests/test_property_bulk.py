@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+
+import anyio
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core import bulk
+from app.db.async_session import AsyncSessionLocal
+from app.main import app
+from app.models.tenant import Tenant
+from tests.utils import (
+    assert_max_queries,
+    login_headers,
+    make_admin,
+    register_and_login,
+)
+
+client = TestClient(app)
+
+CSV_HEADERS = {"Content-Type": "text/csv"}
+NDJSON_HEADERS = {"Content-Type": "application/x-ndjson"}
+
+
+def _owner(username: str = "bulk_owner"):
+    return register_and_login(
+        client, username, "pw", f"{username}@example.com", is_owner=True
+    )
+
+
+def test_bulk_csv_import_reports_errors_per_row() -> None:
+    _, headers = _owner()
+    body = (
+        "title,description,address,type,size,price,area_id,area_code\n"
+        "Flat 1,Nice,Street 1,apartment,50,500,11,\n"
+        'Flat 2,"Two\n""lines""",Street 2,STUDIO,30,400,,NEA_SMYRNI\n'
+        "Flat 3,Bad type,Street 3,CASTLE,30,400,11,\n"
+        "Flat 4,Bad area,Street 4,STUDIO,30,400,,NOWHERE\n"
+        "Flat 5,Bad price,Street 5,STUDIO,30,-1,11,\n"
+    )
+    resp = client.post(
+        "/properties/bulk", content=body, headers={**headers, **CSV_HEADERS}
+    )
+    assert resp.status_code == 200, resp.text
+    result = resp.json()
+    assert (result["received"], result["inserted"], result["failed"]) == (5, 2, 3)
+    assert [e["row"] for e in result["errors"]] == [3, 4, 5]
+    assert "area_code" in result["errors"][1]["errors"][0]
+    assert result["errors"][2]["errors"][0].startswith("price:")
+
+    items = client.get("/properties/", headers=headers).json()
+    by_title = {p["title"]: p for p in items}
+    assert set(by_title) == {"Flat 1", "Flat 2"}
+    assert by_title["Flat 2"]["description"] == 'Two\n"lines"'
+    assert by_title["Flat 2"]["area"]["id"] == 12
+
+
+def test_bulk_ndjson_import_by_admin_checks_owners() -> None:
+    owner, _ = _owner("bulk_owner2")
+    tenant, _ = register_and_login(client, "bulk_tenant", "pw", "bt@example.com")
+    register_and_login(client, "bulk_admin", "pw", "ba@example.com")
+    make_admin("bulk_admin")
+    admin_headers = login_headers(client, "bulk_admin", "pw")
+
+    row = {
+        "title": "T",
+        "description": "D",
+        "address": "A",
+        "type": "STUDIO",
+        "size": 20,
+        "price": 300,
+        "area_id": 11,
+    }
+    lines = [
+        json.dumps({**row, "owner_id": owner["id"]}),
+        "",
+        json.dumps({**row, "owner_id": tenant["id"]}),
+        json.dumps(row),
+        "{not json",
+    ]
+    resp = client.post(
+        "/properties/bulk",
+        content="\n".join(lines),
+        headers={**admin_headers, **NDJSON_HEADERS},
+    )
+    result = resp.json()
+    assert (result["inserted"], result["failed"]) == (1, 3)
+    errors = {e["row"]: e["errors"][0] for e in result["errors"]}
+    assert "role OWNER" in errors[2]
+    assert "required for admins" in errors[3]
+    assert errors[4].startswith("invalid JSON")
+
+
+def test_bulk_import_inserts_one_statement_per_chunk(monkeypatch) -> None:
+    monkeypatch.setattr(bulk, "BULK_CHUNK_ROWS", 2)
+    _, headers = _owner()
+    rows = [
+        json.dumps(
+            {
+                "title": f"P{i}",
+                "description": "",
+                "address": "A",
+                "type": "STUDIO",
+                "size": 20,
+                "price": 300,
+                "area_code": "ATHENS",
+            }
+        )
+        for i in range(5)
+    ]
+    with assert_max_queries(20) as statements:
+        resp = client.post(
+            "/properties/bulk",
+            content="\n".join(rows),
+            headers={**headers, **NDJSON_HEADERS},
+        )
+    assert resp.json()["inserted"] == 5
+    assert sum(s.startswith("INSERT INTO properties") for s in statements) == 3
+
+
+def test_insert_chunk_reports_only_rows_the_database_rejects() -> None:
+    owner, _ = _owner("bulk_conflict_owner")
+    rows = [
+        (i, {"owner_id": owner["id"], "name": f"T{i}", "afm": afm})
+        for i, afm in enumerate(["111", "222", "111", "333", "444"], start=1)
+    ]
+
+    async def run() -> bulk.BulkReport:
+        report = bulk.BulkReport()
+        async with AsyncSessionLocal() as db:
+            inserted = await bulk.insert_chunk(db, Tenant, rows, report)
+        assert [row for row, _ in inserted] == [1, 2, 4, 5]
+        async with AsyncSessionLocal() as db:
+            stored = await db.scalars(
+                select(Tenant.afm).where(Tenant.owner_id == owner["id"])
+            )
+            assert sorted(stored) == ["111", "222", "333", "444"]
+        return report
+
+    report = anyio.run(run)
+    assert report.inserted == 4
+    assert [e.row for e in report.errors] == [3]
+    assert report.errors[0].errors == ["database rejected row: IntegrityError"]
+
+
+def test_bulk_import_rejects_unknown_media_type_and_tenants() -> None:
+    _, owner_headers = _owner()
+    resp = client.post(
+        "/properties/bulk",
+        content="{}",
+        headers={**owner_headers, "Content-Type": "application/json"},
+    )
+    assert resp.status_code == 415
+
+    _, tenant_headers = register_and_login(client, "bulk_t2", "pw", "bt2@example.com")
+    resp = client.post(
+        "/properties/bulk", content="", headers={**tenant_headers, **CSV_HEADERS}
+    )
+    assert resp.status_code == 403
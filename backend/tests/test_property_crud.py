@@ -10,6 +10,8 @@ from app.db.session import SessionLocal
 from app.main import app
 from app.models.contract import Contract, ContractStatus
 from tests.utils import (
+    assert_max_queries,
+    create_property,
     make_admin,
     register_and_login,
     set_property_status,
@@ -687,3 +689,32 @@ def test_create_property_rejects_blank_strings_after_strip(owner_headers):
         headers=owner_headers,
     )
     assert resp.status_code == HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_create_and_update_property_do_not_reload_after_write(owner_headers):
+    # warm the area cache
+    create_property(client, owner_headers, area_id=11)
+    create_property(client, owner_headers, area_id=12)
+
+    # user lookup + INSERT; area comes from the cache, no reload after commit
+    with assert_max_queries(2) as statements:
+        created = create_property(client, owner_headers, area_id=11)
+    assert created["area"]["id"] == 11
+    assert sum(s.startswith("INSERT") for s in statements) == 1
+
+    # property + user lookups, one UPDATE; new area from the cache
+    with assert_max_queries(3) as statements:
+        resp = client.put(
+            f"/properties/{created['id']}",
+            json={"price": 999.0, "area_id": 12},
+            headers=owner_headers,
+        )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["price"] == 999.0
+    assert body["area"]["id"] == 12
+    assert sum(s.startswith("UPDATE") for s in statements) == 1
+
+    # the write really reached the database
+    stored = client.get(f"/properties/{created['id']}").json()
+    assert (stored["price"], stored["area"]["id"]) == (999.0, 12)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.db import instrumentation
+from app.main import app
+from tests.utils import (
+    assert_max_queries,
+    create_property,
+    db_query_count,
+    register_and_login,
+)
+
+client = TestClient(app)
+
+
+def test_response_reports_db_queries_and_server_timing() -> None:
+    resp = client.get("/areas/")
+    assert resp.status_code == 200
+
+    assert db_query_count(resp) >= 1
+    timing = resp.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert f'desc="{db_query_count(resp)} queries"' in timing
+    assert "app;dur=" in timing
+
+
+def test_endpoints_without_db_report_zero_queries() -> None:
+    resp = client.get("/health")
+    assert db_query_count(resp) == 0
+
+
+def test_db_queries_are_recorded_in_metrics() -> None:
+    client.get("/areas/")
+    series = client.get("/metrics").json()["routes"]["GET /areas/"]
+    assert series["db_queries"] >= series["count"]
+    assert series["db_ms"] > 0
+
+
+def test_slow_query_log(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_MS", 0.0001)
+    with caplog.at_level(logging.WARNING, logger="rentpro.sql"):
+        client.get("/areas/")
+    assert any("slow query" in r.getMessage() for r in caplog.records)
+
+
+def test_assert_max_queries_helper() -> None:
+    _, headers = register_and_login(
+        client, "owner_q", "pw", "owner_q@example.com", is_owner=True
+    )
+    create_property(client, headers)
+
+    with assert_max_queries(5) as statements:
+        resp = client.get("/properties/search")
+    assert resp.status_code == 200
+    assert len(statements) == db_query_count(resp)
+
+    try:
+        with assert_max_queries(0):
+            client.get("/areas/")
+    except AssertionError as e:
+        assert "expected at most 0 queries" in str(e)
+    else:
+        raise AssertionError("assert_max_queries did not fail")
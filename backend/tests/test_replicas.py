@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+
+import anyio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import async_session
+from app.db.replicas import PRIMARY_COOKIE, ReadYourWritesMiddleware, RoundRobin
+from app.db.session import REPLICA_KEY, Base, SessionLocal
+from app.main import app
+from app.models.area import Area
+
+client = TestClient(app)
+
+
+def _make_replica(tmp_path):
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        conn.execute(
+            Area.__table__.insert(),
+            [{"code": "REPLICA", "name": "From replica", "area_score": 1.0}],
+        )
+    sync_engine.dispose()
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+
+
+def test_public_reads_go_to_replicas_round_robin(tmp_path, monkeypatch) -> None:
+    replica = _make_replica(tmp_path)
+    monkeypatch.setattr(async_session, "_replicas", RoundRobin([replica]))
+    try:
+        names = [a["name"] for a in client.get("/areas/").json()]
+        assert names == ["From replica"]
+
+        # inside the read-your-writes window the primary answers
+        client.cookies.set(PRIMARY_COOKIE, str(time.time() + 30))
+        try:
+            names = [a["name"] for a in client.get("/areas/").json()]
+        finally:
+            client.cookies.clear()
+        assert "From replica" not in names
+        assert len(names) > 1
+    finally:
+        anyio.run(replica.dispose)
+
+
+def test_session_that_writes_is_pinned_to_primary(tmp_path) -> None:
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    db = SessionLocal()
+    try:
+        db.info[REPLICA_KEY] = replica
+        assert db.get_bind() is replica
+
+        db.add(Area(code="PIN", name="Pinned", area_score=2.0))
+        db.flush()
+        assert REPLICA_KEY not in db.info
+        db.commit()
+        assert db.get_bind() is not replica
+        assert db.query(Area).filter_by(code="PIN").count() == 1
+    finally:
+        db.close()
+        replica.dispose()
+
+
+def test_read_your_writes_cookie_set_after_commit() -> None:
+    mini = FastAPI()
+    mini.add_middleware(ReadYourWritesMiddleware)
+
+    @mini.post("/write")
+    def write():
+        db = SessionLocal()
+        try:
+            db.add(Area(code="RYW", name="Read your writes", area_score=3.0))
+            db.commit()
+        finally:
+            db.close()
+        return {}
+
+    @mini.get("/read")
+    def read():
+        db = SessionLocal()
+        try:
+            db.query(Area).count()
+        finally:
+            db.close()
+        return {}
+
+    mini_client = TestClient(mini)
+    assert PRIMARY_COOKIE not in mini_client.get("/read").cookies
+
+    resp = mini_client.post("/write")
+    until = float(resp.cookies[PRIMARY_COOKIE])
+    assert time.time() < until <= time.time() + 60
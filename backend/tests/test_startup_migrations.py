@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+
+from app.core import migrations
+from app.core.migrations import is_at_head, prepare_database, script_heads
+from app.db.session import engine
+
+
+def test_script_heads_match_alembic(alembic_cfg) -> None:
+    assert script_heads() == set(ScriptDirectory.from_config(alembic_cfg).get_heads())
+
+
+def test_startup_skips_upgrade_when_at_head(monkeypatch) -> None:
+    upgrades = []
+    monkeypatch.setattr(migrations, "run_migrations", lambda: upgrades.append(1))
+    monkeypatch.setattr(migrations, "seed_reference_data", lambda: None)
+
+    assert is_at_head(engine)
+    assert prepare_database(engine, mode="auto") is False
+    assert prepare_database(engine, mode="always") is True
+    assert upgrades == [1]
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE alembic_version SET version_num = 'bb5a2e3cbaae'"))
+    assert not is_at_head(engine)
+    assert prepare_database(engine, mode="off") is False
+    assert prepare_database(engine, mode="auto") is True
+    assert upgrades == [1, 1]
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE alembic_version"))
+    assert not is_at_head(engine)
+
+
+def test_current_database_starts_without_loading_alembic() -> None:
+    code = (
+        "import sys\n"
+        "from app.core.migrations import prepare_database\n"
+        "from app.db.session import engine\n"
+        "assert prepare_database(engine) is False\n"
+        "assert not [m for m in sys.modules if m.split('.')[0] == 'alembic']\n"
+    )
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=backend_dir,
+        env={**os.environ, "RENTPRO_MIGRATE_ON_STARTUP": "auto"},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
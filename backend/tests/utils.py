@@ -1,3 +1,6 @@
+from contextlib import contextmanager
+
+
 def make_admin(username):
     from app.db.session import SessionLocal
     from app.models.user import User, UserRole
@@ -157,3 +160,43 @@ def create_property(client, headers, **overrides):
     resp = client.post("/properties/", json=payload, headers=headers)
     assert resp.status_code == 200, resp.text
     return resp.json()
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """
+    Fail if more than `max_queries` SQL statements run inside the block.
+
+    Counts every statement on the app engines (whatever thread issues it), so
+    it works around TestClient calls. Yields the list of captured statements.
+    """
+    from sqlalchemy import event
+
+    from app.db.session import all_engines
+
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = all_engines()
+    for eng in engines:
+        event.listen(eng, "before_cursor_execute", _capture)
+    try:
+        yield statements
+    finally:
+        for eng in engines:
+            event.remove(eng, "before_cursor_execute", _capture)
+
+    assert (
+        len(statements) <= max_queries
+    ), f"expected at most {max_queries} queries, got {len(statements)}:\n" + "\n".join(
+        statements
+    )
+
+
+def db_query_count(resp) -> int:
+    """
+    Statements executed while serving `resp` (from the X-DB-Queries header).
+    """
+    return int(resp.headers["X-DB-Queries"])